@@ -1,25 +1,86 @@
+import time
+startup_t0 = time.perf_counter()  # The startup report measures from here
+import argparse
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 import numpy as np
 import ast
-import seaborn as sns
-from matplotlib.ticker import FuncFormatter
-from matplotlib.patches import Patch
+import queue
+import threading
+from concurrent.futures import Future
+from bamboo_engine import (ANNUAL_EMISSION_INCREASE, SEQUESTRATION_RATE, COST_PLANTING_BAMBOO,
+                           DEFAULT_PERCENT_LAND, DEFAULT_GDP_PERCENTAGE, LAND_PERCENT_RANGE, GDP_PERCENT_RANGE,
+                           EQUILIBRIUM_HORIZON, compute_offsets, equilibrium_years, time_series,
+                           sweep_constraints, monte_carlo, budget_schedule, plan_budget, plan_offsets,
+                           growth_scenarios, emission_peaks, GROWTH_SCENARIOS)
+from bamboo_harvest import sequestration_kernel
+from bamboo_data import load_countries
+from bamboo_summary import (RESULT_COLUMNS, constraints_text, formula_legend, plot_details, band_heading,
+                            result_columns, sort_orders, format_result_row)
+from bamboo_timing import StageTimer, append_trace
+from bamboo_cache import LRUCache, input_key
+from bamboo_store import ScenarioStore, scenario_key
+# matplotlib and bamboo_charts are imported by ensure_figure() when the first chart is drawn
+
+# Command line options (each also has an environment variable for shortcuts and builds)
+arg_parser = argparse.ArgumentParser(description="Bamboo CO2 Offset Calculator")
+arg_parser.add_argument("--startup-report", action="store_true",
+                        help="print the time to each startup stage (BAMBOO_STARTUP_REPORT=1)")
+arg_parser.add_argument("--trace", metavar="FILE", default=os.environ.get("BAMBOO_TRACE"),
+                        help="append per-stage timings of every run to a JSONL file (BAMBOO_TRACE)")
+arg_parser.add_argument("--store", metavar="FILE", default=os.environ.get("BAMBOO_STORE"),
+                        help="keep every run's results in a SQLite file and reuse them in later sessions "
+                             "(BAMBOO_STORE)")
+cli_args, _ = arg_parser.parse_known_args()
+
+# Startup report: time to each stage and which heavy modules had been imported by then
+startup_report_enabled = cli_args.startup_report or bool(os.environ.get("BAMBOO_STARTUP_REPORT"))
+startup_marks = []  # (stage, seconds since startup_t0, heavy modules loaded)
+startup_reported = False
+STARTUP_MODULES = ("numpy", "matplotlib", "matplotlib.pyplot", "matplotlib.backends.backend_tkagg",
+                   "seaborn", "pandas", "scipy")
 
 # Initialize main window
 root = tk.Tk()
 root.title("🌿 Bamboo CO2 Offset Calculator By AJ")
 root.geometry("2500x1750")
 
-# Matplotlib figure and axis
-fig, ax = plt.subplots(figsize=(10, 6))
-canvas = None
-
-# Constants
-REFERENCE_YEARS_OFFSET = 75  # Fixed constant for reference period (2025-2099)
-ANNUAL_EMISSION_INCREASE = 0.01  # 1% annual increase in emissions
+# Matplotlib figure and axis, created with the first chart so the window opens first
+charts = None  # The bamboo_charts module once loaded
+fig = ax = canvas = None
+bar_chart = None  # Keeps its artists; slider updates are blitted
+BAR_SCROLL_STEP = 5  # Countries moved per mouse wheel notch in a paged bar chart
+sweep_colorbar = None  # Colorbar of the constraint sweep heatmap, removed on redraw
+loaded_table = None  # CountryTable from the last loaded dataset file
+
+# Background compute: one worker thread, newest request wins. The thread is a daemon (a
+# ThreadPoolExecutor's is joined at exit), so closing the window never waits for a run.
+compute_requests = queue.Queue()  # (future, inputs, generation, timer) for the worker
+compute_generation = 0  # Bumped on every request; older results are dropped
+pending_compute = None  # Future of the most recent request
+slider_after_id = None  # Pending debounced slider recompute
+COMPUTE_POLL_MS = 15  # How often the Tk loop checks for a finished compute
+SLIDER_DEBOUNCE_MS = 50  # Quiet time after a slider move before recomputing
+trace_path = cli_args.trace  # JSONL file that receives every run's stage timings, if set
+
+# Finished engine runs by input hash, so switching views or returning to earlier settings skips the math
+result_cache = LRUCache(max_bytes=256 * 2**20)
+parse_cache = LRUCache(max_bytes=32 * 2**20)  # Text box contents -> parsed value
+scenario_store = ScenarioStore(cli_args.store) if cli_args.store else None  # Persists across sessions
+
+# Results table: rows are formatted and inserted a page at a time as the user scrolls
+RESULTS_PAGE_ROWS = 100
+results_state = {
+    "columns": None,  # Raw column arrays of the last run (bamboo_summary.result_columns)
+    "orders": None,   # Ascending argsort of every column, computed on the worker thread
+    "order": None,    # Row order currently shown
+    "loaded": 0,      # Rows of that order inserted so far
+    "sort": (None, False),  # (column key or None for input order, descending)
+    "filling": False,  # A lazy fill is already scheduled
+    "headings": dict(RESULT_COLUMNS),  # Column key -> heading text (without the sort arrow)
+}
 
 # Default data
 default_countries = ["Jamaica", "Madagascar", "Vietnam"]
@@ -27,373 +88,543 @@ default_land_area = [4244, 228531, 127932]  # in sq mi
 default_emissions = [6083040, 4099000, 327905620]  # in tons CO2/yr
 default_gdp_per_country = [15_000_000_000, 14_000_000_000, 700_000_000_000]  # GDP in USD
 default_years_offset = [2025, 2099]  # Default years for CO2 offset
-default_percent_land = 10.0  # Default percent of land available (%)
-default_gdp_percentage = 0.3  # Default percent of GDP available (%)
-
-# Sequestration rate: 25 tons CO2 per acre per year (converted to square miles)
-sequestration_rate = 16000  # tons CO2/sq mi/yr
-
-# Cost to plant bamboo (USD per square mile)
-cost_planting_bamboo = 768000  # USD per square mile
+default_percent_land = DEFAULT_PERCENT_LAND  # Default percent of land available (%)
+default_gdp_percentage = DEFAULT_GDP_PERCENTAGE  # Default percent of GDP available (%)
+default_maturity_years = 0  # Years for new stands to reach the full rate (0 = full rate at once)
+default_rotation_years = 0  # Years between harvests (0 = never harvested, sequestration is permanent)
+default_gdp_growth = 0.0  # Annual GDP growth the planting budget follows (%/yr)
+default_ramp_years = 0  # Years to ramp spending up to the full GDP share (0 = full share at once)
+default_growth_scenarios = GROWTH_SCENARIOS  # Emission growth rates compared by the growth scenario chart
+default_uncertainty = {}  # Monte Carlo distributions for the time series bands (none: bands are opt-in)
+uncertainty_samples = 20_000  # Monte Carlo samples drawn per Analyze
+live_uncertainty_samples = 1_000  # Samples for slider-driven redraws, which must keep up with the slider
+
+# Model constants live in bamboo_engine; the GUI only displays them
+sequestration_rate = SEQUESTRATION_RATE  # tons CO2/sq mi/yr
+cost_planting_bamboo = COST_PLANTING_BAMBOO  # USD per square mile
 
 # Plot type variable
 plot_type = tk.StringVar(value="bar")  # Default to bar plot
 
-def format_large_num(x):
-    """Convert large numbers to readable format (e.g., 1M, 1K)"""
-    if x >= 1e6:
-        return f"{x/1e6:,.1f}M"
-    elif x >= 1e3:
-        return f"{x/1e3:,.0f}K"
-    return f"{x:,.0f}"
+def mark_startup(stage):
+    """Record a startup stage for the startup report"""
+    if startup_report_enabled:
+        loaded = [name for name in STARTUP_MODULES if name in sys.modules]
+        startup_marks.append((stage, time.perf_counter() - startup_t0, loaded))
+
+def show_startup_report():
+    """Print the startup timings (or show them in a dialog when there is no console)"""
+    lines = ["Startup report (ms since launch):"]
+    previous = []
+    for stage, seconds, loaded in startup_marks:
+        new = [name for name in loaded if name not in previous]
+        lines.append(f"  {seconds * 1000:8.1f}  {stage}" + (f"  [+{', '.join(new)}]" if new else ""))
+        previous = loaded
+    lines.append("Run with python -X importtime for a per-module breakdown.")
+    if sys.stdout is not None:
+        print("\n".join(lines))
+    else:
+        messagebox.showinfo("Startup Report", "\n".join(lines))
+
+def ensure_figure():
+    """Import matplotlib and create the figure and canvas on first use"""
+    global charts, fig, ax, canvas, bar_chart
+    if fig is not None:
+        return
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    import bamboo_charts
+    mark_startup("matplotlib loaded")
+
+    charts = bamboo_charts
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    bar_chart = charts.BarChart(ax, animated=True, page_size=charts.BAR_PAGE_SIZE)
+    canvas = FigureCanvasTkAgg(fig, master=left_panel)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    canvas.mpl_connect("scroll_event", on_chart_scroll)
 
 def parse_input_data(data_str):
+    # Unchanged boxes are not parsed again (callers never modify the returned value)
+    value = parse_cache.get(data_str)
+    if value is not None:
+        return value
     try:
-        return ast.literal_eval(data_str)
+        value = ast.literal_eval(data_str)
     except Exception as e:
         messagebox.showerror("Data Error", f"Invalid data format:\n{e}")
         return []
-
-def calculate_equilibrium_year(initial_emission, reduction_rate):
-    """Calculate the year when CO2 production equals consumption"""
-    # With 1% annual growth and linear reduction
-    # We need to solve: initial_emission * (1 + 0.01)^years - reduction_rate * years = 0
-    # This is a non-linear equation, so we'll solve it iteratively
-    
-    year = 0
-    current_emission = initial_emission
-    total_reduction = 0
-    
-    while current_emission > total_reduction and year < 200:  # Set a reasonable upper limit
-        year += 1
-        current_emission *= (1 + ANNUAL_EMISSION_INCREASE)  # 1% annual increase
-        total_reduction += reduction_rate
-        
-        if current_emission <= total_reduction:
-            return year + 2025  # Add to base year
-    
-    return "Beyond 2225"  # If equilibrium is not reached within 200 years
-
-def compute_and_plot():
-    global canvas
-
+    parse_cache.put(data_str, value)
+    return value
+
+def dataset_in_use():
+    """True while the loaded dataset's text boxes have not been edited by hand"""
+    return loaded_table is not None and not any(
+        widget.edit_modified() for widget in (country_input, land_input, emission_input, gdp_input))
+
+def load_data():
+    """Load a CSV/JSON country table and show it in the input boxes"""
+    global loaded_table
+    file_path = filedialog.askopenfilename(filetypes=[("Country tables", "*.csv *.json"),
+                                                      ("CSV files", "*.csv"), ("JSON files", "*.json")])
+    if not file_path:
+        return
     try:
-        # Parse input data
+        table = load_countries(file_path)
+    except Exception as e:
+        messagebox.showerror("Data Error", f"Could not load dataset:\n{e}")
+        return
+
+    for widget, values in ((country_input, table.countries), (land_input, table.land_area),
+                           (emission_input, table.emissions), (gdp_input, table.gdp)):
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, str(values.tolist()))
+        widget.edit_modified(False)  # Typed edits flip this back and switch to parsing
+    loaded_table = table
+    compute_and_plot()
+
+def read_inputs(live=False):
+    """Collect and validate everything the engine needs (Tk main thread only)"""
+    # Use the typed columns of a loaded dataset directly; parse the boxes otherwise
+    if dataset_in_use():
+        countries = loaded_table.countries.tolist()
+        land_area = loaded_table.land_area
+        emissions = loaded_table.emissions
+        gdp = loaded_table.gdp
+        growth = loaded_table.growth
+    else:
         countries = parse_input_data(country_input.get("1.0", tk.END).strip())
         land_area = np.array(parse_input_data(land_input.get("1.0", tk.END).strip()))
         emissions = np.array(parse_input_data(emission_input.get("1.0", tk.END).strip()))
-        years_offset = parse_input_data(years_input.get("1.0", tk.END).strip())
         gdp = np.array(parse_input_data(gdp_input.get("1.0", tk.END).strip()))
-        
-        # Get user input for percent land and GDP
-        percent_land_available = float(percent_land_input.get())
-        gdp_percent_available = float(gdp_percent_input.get())
-
-        if not (len(countries) == len(land_area) == len(emissions) == len(gdp)):
-            messagebox.showerror("Data Error", "All input lists must have the same length.")
-            return
-
-        if len(years_offset) != 2:
-            messagebox.showerror("Data Error", "Year offset must contain exactly two values (start and end years).")
-            return
-
-        start_year, end_year = years_offset
-        n_years_offset = end_year - start_year
-        if n_years_offset <= 0:
-            messagebox.showerror("Data Error", "End year must be greater than start year.")
-            return
-            
-        # Calculations
-        bamboo_area_needed = emissions / sequestration_rate
-        # Use reference years (REFERENCE_YEARS_OFFSET) for bamboo area calculations
-        bamboo_area_needed_annually = bamboo_area_needed / REFERENCE_YEARS_OFFSET
-        percent_land = (bamboo_area_needed / land_area) * 100
-        planting_cost = bamboo_area_needed_annually * cost_planting_bamboo
-
-        # Calculate GDP Percentage
-        gdp_percentage = (planting_cost / gdp) * 100
-        
-        # Calculate land availability and cost constraints
-        available_land = land_area * (percent_land_available / 100)
-        affordable_cost = gdp * (gdp_percent_available / 100)
-        affordable_bamboo_area = affordable_cost / cost_planting_bamboo
-        
-        # Calculate reduction rates based on available land and budget
-        land_constrained_reduction = available_land * sequestration_rate
-        budget_constrained_reduction = affordable_bamboo_area * sequestration_rate * REFERENCE_YEARS_OFFSET
-        
-        # Use the minimum constraint (either land or budget)
-        actual_reduction_rates = np.minimum(land_constrained_reduction, budget_constrained_reduction) / REFERENCE_YEARS_OFFSET
-        
-        # Calculate equilibrium years
-        equilibrium_years = [calculate_equilibrium_year(emission, reduction) 
-                            for emission, reduction in zip(emissions, actual_reduction_rates)]
-
-        # Clear previous plot
-        ax.clear()
+        growth = ANNUAL_EMISSION_INCREASE
+    years_offset = parse_input_data(years_input.get("1.0", tk.END).strip())
+    uncertainty_text = uncertainty_input.get("1.0", tk.END).strip()
+    uncertainty = parse_input_data(uncertainty_text) if uncertainty_text else {}
+    scenarios_text = scenarios_input.get("1.0", tk.END).strip()
+    scenarios = parse_input_data(scenarios_text) if scenarios_text else default_growth_scenarios
+
+    # Get user input for percent land and GDP
+    percent_land_available = float(percent_land_input.get())
+    gdp_percent_available = float(gdp_percent_input.get())
+    maturity_years = int(maturity_input.get())
+    rotation_years = int(rotation_input.get())
+    gdp_growth = float(gdp_growth_input.get()) / 100
+    ramp_years = int(ramp_input.get())
+
+    if not (len(countries) == len(land_area) == len(emissions) == len(gdp)):
+        messagebox.showerror("Data Error", "All input lists must have the same length.")
+        return None
+
+    if not isinstance(scenarios, dict) or not scenarios:
+        messagebox.showerror("Data Error", "Growth scenarios must be a non-empty dict of name: annual rate.")
+        return None
+
+    if len(years_offset) != 2:
+        messagebox.showerror("Data Error", "Year offset must contain exactly two values (start and end years).")
+        return None
+
+    start_year, end_year = years_offset
+    n_years_offset = end_year - start_year
+    if n_years_offset <= 0:
+        messagebox.showerror("Data Error", "End year must be greater than start year.")
+        return None
+
+    inputs = {
+        "countries": countries, "land_area": land_area, "emissions": emissions, "gdp": gdp,
+        "growth": growth, "start_year": start_year, "end_year": end_year,
+        "percent_land_available": percent_land_available,
+        "gdp_percent_available": gdp_percent_available, "maturity_years": maturity_years,
+        "rotation_years": rotation_years, "gdp_growth": gdp_growth, "ramp_years": ramp_years,
+        "uncertainty": uncertainty, "growth_scenarios": scenarios, "plot_type": plot_type.get(),
+    }
+    # Everything the outputs depend on; input_key adds the model constants
+    inputs["samples"] = live_uncertainty_samples if live else uncertainty_samples
+    inputs["key"] = input_key(**inputs)
+    inputs["cached"] = False
+    return inputs
+
+def run_engine(inputs, generation, timer):
+    """Run all model math for one request (worker thread, no Tk calls)"""
+    timer.lap("queue")
+    land_area, emissions, gdp = inputs["land_area"], inputs["emissions"], inputs["gdp"]
+    growth = inputs["growth"]
+    start_year, end_year = inputs["start_year"], inputs["end_year"]
+    percent_land_available = inputs["percent_land_available"]
+    gdp_percent_available = inputs["gdp_percent_available"]
+    # Cohort model: each year's planting ramps up with stand age and may be harvested into product pools
+    maturity_years, rotation_years = inputs["maturity_years"], inputs["rotation_years"]
+    n_years = max(EQUILIBRIUM_HORIZON, end_year - start_year + 1)
+    kernel = sequestration_kernel(n_years, maturity_years, rotation_years)
+    # Budget schedule: the GDP share follows GDP growth and a ramp-up instead of staying constant
+    plan = None
+    if inputs["gdp_growth"] or inputs["ramp_years"]:
+        with timer.stage("budget"):
+            budget = budget_schedule(gdp, gdp_percent_available, n_years, inputs["gdp_growth"],
+                                     inputs["ramp_years"])
+            plan = plan_budget(land_area, emissions, budget, percent_land_available,
+                               annual_emission_increase=growth, kernel=kernel)
+    # The store keys scenarios without a kernel or schedule, so it only holds the original constant model
+    use_store = scenario_store is not None and kernel is None and plan is None
+
+    # Results of a scenario run in an earlier session come from the store
+    stored = None
+    if use_store:
+        with timer.stage("store"):
+            stored = scenario_store.load(scenario_key(inputs["countries"], land_area, emissions, gdp,
+                                                      percent_land_available, gdp_percent_available, growth))
+    if stored is not None:
+        result = stored[1]
+    else:
+        with timer.stage("math"):
+            result = compute_offsets(land_area, emissions, gdp,
+                                     percent_land_available, gdp_percent_available,
+                                     annual_emission_increase=growth, with_equilibrium=False)
+        with timer.stage("equilibrium"):
+            if plan is not None:
+                # Table and bar chart show the schedule's means over the chart years, like its equilibrium
+                result = plan_offsets(result, plan, end_year - start_year + 1)
+            else:
+                result = result._replace(equilibrium_years=equilibrium_years(
+                    emissions, result.actual_reduction_rates, growth, kernel=kernel))
+        if use_store:
+            with timer.stage("store"):
+                scenario_store.save(inputs["countries"], land_area, emissions, gdp, percent_land_available,
+                                    gdp_percent_available, growth, result)
+    outputs = {"result": result, "series": None, "bands": None, "sweep": None, "scenarios": None,
+               "peaks": None}
+
+    # Stop early once a newer request has been queued
+    if generation != compute_generation:
+        return None
+    if inputs["plot_type"] == "sweep":
+        # Equilibrium years over the whole land % x GDP % slider domain, which the sliders do not change
+        with timer.stage("sweep"):
+            sweep_key = input_key("sweep", land_area, emissions, gdp, growth, maturity_years, rotation_years)
+            outputs["sweep"] = result_cache.get(sweep_key)
+            if outputs["sweep"] is None:
+                outputs["sweep"] = sweep_constraints(land_area, emissions, gdp, annual_emission_increase=growth,
+                                                     kernel=kernel)
+                result_cache.put(sweep_key, outputs["sweep"])
+    elif inputs["plot_type"] == "time":
+        with timer.stage("time series"):
+            rates = (result.actual_reduction_rates if plan is None
+                     else plan.reduction_rates[:end_year - start_year + 1])
+            outputs["series"] = time_series(emissions, rates, start_year, end_year, growth, kernel=kernel)
+        # Closed-form peak and rebound, for constant planting at the full rate from year 0
+        if kernel is None and plan is None:
+            outputs["peaks"] = emission_peaks(emissions, rates, growth, start_year, end_year - start_year - 1)
+        # Percentile bands from the uncertain constants, if any were given (constant budget only)
+        uncertainty = dict(inputs["uncertainty"])
+        if uncertainty and plan is None:
+            if generation != compute_generation:
+                return None
+            # Growth is only sampled when asked for; a distribution is then centred on a dataset's own rates
+            uncertainty.setdefault("annual_emission_increase", growth)
+            growth_centre = growth if np.ndim(growth) else None
+            with timer.stage("monte carlo"):
+                outputs["bands"] = monte_carlo(land_area, emissions, gdp, start_year, end_year,
+                                               percent_land_available, gdp_percent_available,
+                                               n_samples=inputs["samples"], kernel=kernel,
+                                               growth_centre=growth_centre, **uncertainty)
+
+    elif inputs["plot_type"] == "growth":
+        # Every named growth scenario in one (scenarios, years, countries) pass
+        with timer.stage("growth scenarios"):
+            rates = result.actual_reduction_rates if plan is None else plan.reduction_rates
+            outputs["scenarios"] = growth_scenarios(emissions, rates, start_year, end_year,
+                                                    inputs["growth_scenarios"], kernel=kernel)
+
+    # Results table columns and every column's sort order, so sorting in the UI is a lookup
+    with timer.stage("table"):
+        outputs["table"] = result_columns(inputs["countries"], emissions, result, outputs["bands"],
+                                          outputs["scenarios"])
+        outputs["orders"] = sort_orders(outputs["table"])
+    result_cache.put(inputs["key"], outputs)
+    return outputs
+
+def compute_worker():
+    """Run queued engine requests one at a time (daemon thread)"""
+    while True:
+        future, inputs, generation, timer = compute_requests.get()
+        if not future.set_running_or_notify_cancel():
+            continue  # Superseded before it started
+        try:
+            future.set_result(run_engine(inputs, generation, timer))
+        except BaseException as e:
+            future.set_exception(e)
+
+threading.Thread(target=compute_worker, name="bamboo-compute", daemon=True).start()
+
+def compute_and_plot(live=False):
+    """Start an engine run on the worker thread; the chart updates when it finishes
+
+    live=True (slider moves) draws uncertainty bands from fewer samples.
+    """
+    global compute_generation, pending_compute
+
+    timer = StageTimer()
+    try:
+        with timer.stage("parse"):
+            inputs = read_inputs(live)
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+        return
+    if inputs is None:
+        return
+
+    # Supersede the previous request: drop it if it has not started yet,
+    # and ignore its result if it has
+    compute_generation += 1
+    if pending_compute is not None:
+        pending_compute.cancel()
+
+    # Same inputs as an earlier run: redraw from its outputs without the worker
+    with timer.stage("cache"):
+        outputs = result_cache.get(inputs["key"])
+    if outputs is not None:
+        inputs["cached"] = True
+        try:
+            draw_results(inputs, outputs, timer)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+        return
+    pending_compute = Future()
+    compute_requests.put((pending_compute, inputs, compute_generation, timer))
+    root.after(COMPUTE_POLL_MS, poll_compute, compute_generation, pending_compute, inputs, timer)
+
+def poll_compute(generation, future, inputs, timer):
+    """Hand a finished engine run back to the Tk main thread"""
+    if generation != compute_generation:
+        return  # A newer request replaced this one
+    if not future.done():
+        root.after(COMPUTE_POLL_MS, poll_compute, generation, future, inputs, timer)
+        return
+    try:
+        outputs = future.result()
+        if outputs is not None:
+            timer.lap("handoff")  # Includes up to COMPUTE_POLL_MS of polling delay
+            draw_results(inputs, outputs, timer)
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+def schedule_recompute(_value=None):
+    """Debounce slider moves into one live recompute"""
+    global slider_after_id
+    if slider_after_id is not None:
+        root.after_cancel(slider_after_id)
+    slider_after_id = root.after(SLIDER_DEBOUNCE_MS, run_scheduled_recompute)
+
+def run_scheduled_recompute():
+    global slider_after_id
+    slider_after_id = None
+    compute_and_plot(live=True)
+
+def draw_results(inputs, outputs, timer):
+    """Redraw the chart and summary from finished engine outputs"""
+    global sweep_colorbar, startup_reported
+
+    countries, emissions, land_area = inputs["countries"], inputs["emissions"], inputs["land_area"]
+    start_year, end_year = inputs["start_year"], inputs["end_year"]
+    result, bands = outputs["result"], outputs["bands"]
+    bamboo_area_needed_annually = result.bamboo_area_needed_annually
+    planting_cost = result.planting_cost
+    gdp_percentage = result.gdp_percentage
+    available_land = result.available_land
+    affordable_bamboo_area = result.affordable_bamboo_area
+
+    if fig is None:
+        with timer.stage("load matplotlib"):
+            ensure_figure()
+
+    # Keep the heatmap country choices in sync with the input list
+    heatmap_country.config(values=["All Countries"] + list(countries))
+
+    with timer.stage("plot"):
+        # Clear previous plot (the bar chart clears the axes itself only when it must rebuild)
+        if sweep_colorbar is not None:
+            sweep_colorbar.remove()
+            sweep_colorbar = None
+        full_redraw = True
+        if inputs["plot_type"] != "bar":
+            ax.clear()
 
         # Select plot type based on radio button
-        if plot_type.get() == "bar":
-            # Original bar plot
-            plot_bar_chart(countries, land_area, bamboo_area_needed_annually, planting_cost, 
-                          percent_land, gdp_percentage, start_year, end_year, available_land, 
-                          affordable_bamboo_area)
+        if inputs["plot_type"] == "bar":
+            # Original bar plot, updated in place when only values changed
+            full_redraw = bar_chart.update(countries, land_area, bamboo_area_needed_annually, planting_cost,
+                                           gdp_percentage, start_year, end_year, available_land,
+                                           affordable_bamboo_area)
+        elif inputs["plot_type"] == "sweep":
+            # "All Countries" shows the slowest country that reaches equilibrium in each cell
+            selection = heatmap_country.get()
+            country = countries.index(selection) if selection in countries else None
+            sweep_colorbar = charts.plot_constraint_sweep(ax, countries, outputs["sweep"],
+                                                          inputs["percent_land_available"],
+                                                          inputs["gdp_percent_available"], country)
+        elif inputs["plot_type"] == "growth":
+            charts.plot_growth_scenarios(ax, countries, emissions, start_year, end_year, outputs["scenarios"])
         else:
-            # New time series plot with 1% annual emission increase
-            plot_time_series(countries, emissions, start_year, end_year, actual_reduction_rates)
-
-        # Draw canvas
-        if canvas:
-            canvas.draw()
+            # Time series under the growth actually used (and the sampled growth, with bands)
+            charts.plot_time_series(ax, countries, emissions, start_year, end_year, outputs["series"], bands,
+                                    outputs["peaks"], inputs["growth"],
+                                    inputs["uncertainty"].get("annual_emission_increase"))
+
+    # Draw canvas
+    blitted = inputs["plot_type"] == "bar" and not full_redraw and bar_chart.background is not None
+    with timer.stage("blit" if blitted else "draw"):
+        if inputs["plot_type"] == "bar":
+            bar_chart.draw(canvas, full_redraw)
         else:
-            canvas = FigureCanvasTkAgg(fig, master=left_panel)
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
             canvas.draw()
 
-        # Update data summary and calculations
-        update_summary(countries, emissions, land_area, bamboo_area_needed_annually, 
-                      planting_cost, percent_land, gdp_percentage, start_year, end_year,
-                      percent_land_available, gdp_percent_available, available_land,
-                      affordable_bamboo_area, actual_reduction_rates, equilibrium_years)
-
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
-
-def plot_bar_chart(countries, land_area, bamboo_area_needed_annually, planting_cost, 
-                  percent_land, gdp_percentage, start_year, end_year, available_land,
-                  affordable_bamboo_area):
-    """Draw the original bar chart visualization with constraints"""
-    # Plot setup
-    sns.set_style("whitegrid")
-    plt.rcParams['mathtext.fontset'] = 'cm'
-    palette = sns.color_palette("rocket", n_colors=5)  # Added more colors for new bars
-    bar_width = 0.18  # Narrower to accommodate more bars
-    x = np.arange(len(countries))
-
-    # Plot bars
-    bars_land = ax.bar(x - 2*bar_width, land_area, width=bar_width,
-                       color=palette[0], alpha=0.9, edgecolor='black',
-                       label='Actual Land Area')
-    bars_bamboo = ax.bar(x - bar_width, bamboo_area_needed_annually, width=bar_width,
-                         color=palette[1], alpha=0.9, edgecolor='black',
-                         label='Annual Bamboo Area Needed')
-    bars_cost = ax.bar(x, planting_cost, width=bar_width,
-                       color=palette[2], alpha=0.9, edgecolor='black',
-                       label='Annual Planting Cost (USD)')
-    # New bars for constraints
-    bars_available_land = ax.bar(x + bar_width, available_land / REFERENCE_YEARS_OFFSET, width=bar_width,
-                               color=palette[3], alpha=0.9, edgecolor='black',
-                               label='Available Land (Annual)')
-    bars_affordable = ax.bar(x + 2*bar_width, affordable_bamboo_area, width=bar_width,
-                           color=palette[4], alpha=0.9, edgecolor='black',
-                           label='Affordable Bamboo Area (Annual)')
-
-    # Add rotated labels BELOW each bar with explicit units
-    for i, (land, bamboo, cost, percent, gdp_pct, avail_land, afford) in enumerate(
-            zip(land_area, bamboo_area_needed_annually, planting_cost, percent_land, 
-                gdp_percentage, available_land / REFERENCE_YEARS_OFFSET, affordable_bamboo_area)):
-        
-        ax.text(x[i] - 2*bar_width, 1, 
-                f"{format_large_num(land)}\nsq mi", 
-                ha='center', va='top', fontsize=8, fontweight='bold', rotation=45, transform=ax.get_xaxis_transform())
-
-        ax.text(x[i] - bar_width, 1, 
-                f"{format_large_num(bamboo)}\nsq mi/yr", 
-                ha='center', va='top', fontsize=8, fontweight='bold', rotation=45, transform=ax.get_xaxis_transform())
-
-        ax.text(x[i], 1, 
-                f"${format_large_num(cost)}\n$/yr", 
-                ha='center', va='top', fontsize=8, fontweight='bold', rotation=45, transform=ax.get_xaxis_transform())
-                
-        ax.text(x[i] + bar_width, 1, 
-                f"{format_large_num(avail_land)}\nsq mi/yr", 
-                ha='center', va='top', fontsize=8, fontweight='bold', rotation=45, transform=ax.get_xaxis_transform())
-                
-        ax.text(x[i] + 2*bar_width, 1, 
-                f"{format_large_num(afford)}\nsq mi/yr", 
-                ha='center', va='top', fontsize=8, fontweight='bold', rotation=45, transform=ax.get_xaxis_transform())
-
-        ax.text(x[i], 0.95, 
-                f"{gdp_pct:.2f}% of GDP", 
-                ha='center', va='top', fontsize=8, fontweight='bold', color='red',
-                rotation=45, transform=ax.get_xaxis_transform())
-
-    # Aesthetics
-    ax.set_title(f"National Land vs. Bamboo Area Needed and Constraints\nOffset CO2 Emissions from {start_year} to {end_year}", 
-                 fontsize=16, pad=20, fontweight='bold')
-    ax.set_xlabel("Country", fontsize=14, labelpad=10)
-    ax.set_ylabel("Annual Area / Cost (sq mi / USD) [Log Scale]", fontsize=14, labelpad=10)
-    ax.set_xticks(x)
-    ax.set_xticklabels(countries, fontsize=12)
-    ax.set_yscale("log")
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: format_large_num(x)))
-    ax.grid(True, which="both", ls="--", alpha=0.2)
-
-    # Legend
-    legend_elements = [
-        Patch(facecolor=palette[0], label='Actual Land Area', edgecolor='black'),
-        Patch(facecolor=palette[1], label='Annual Bamboo Area Needed', edgecolor='black'),
-        Patch(facecolor=palette[2], label='Annual Planting Cost (USD)', edgecolor='black'),
-        Patch(facecolor=palette[3], label='Available Land (Annual)', edgecolor='black'),
-        Patch(facecolor=palette[4], label='Affordable Bamboo Area (Annual)', edgecolor='black'),
-    ]
-    ax.legend(handles=legend_elements, loc='lower right', fontsize=10)
-
-    # Watermark
-    ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
-            ha='center', va='center', rotation=45, transform=ax.transAxes)
-
-def plot_time_series(countries, emissions, start_year, end_year, actual_reduction_rates):
-    """Draw a time series plot showing emission reduction over time with 1% annual increase"""
-    # Plot setup
-    sns.set_style("whitegrid")
-    plt.rcParams['mathtext.fontset'] = 'cm'
-    palette = sns.color_palette("rocket", n_colors=len(countries))
-    
-    # Create year range for plot
-    years = np.arange(start_year, end_year + 1)
-    
-    # For each country, create a line that shows both emissions growth and reduction
-    for i, (country, initial_emission, reduction_rate) in enumerate(zip(countries, emissions, actual_reduction_rates)):
-        # Calculate emissions for each year with 1% annual increase and reduction
-        yearly_emissions = []
-        yearly_reductions = []
-        cumulative_reduction = 0
-        
-        for year_idx, year in enumerate(years):
-            # Calculate emission with 1% annual growth
-            years_passed = year - start_year
-            grown_emission = initial_emission * ((1 + ANNUAL_EMISSION_INCREASE) ** years_passed)
-            
-            # Calculate reduction (linear)
-            annual_reduction = reduction_rate
-            cumulative_reduction += annual_reduction
-            
-            # Net emission
-            net_emission = max(0, grown_emission - cumulative_reduction)
-            yearly_emissions.append(net_emission)
-            yearly_reductions.append(cumulative_reduction)
-        
-        # Plot emissions line
-        ax.plot(years, yearly_emissions, marker='o', markersize=4, 
-                linewidth=3, color=palette[i], label=f"{country} (Net Emissions)")
-        
-        # Plot reduction line as dashed
-        ax.plot(years, yearly_reductions, linestyle='--', linewidth=2, 
-                color=palette[i], alpha=0.7, label=f"{country} (Cumulative Reduction)")
-        
-        # Find intersection point (if any) - when emissions equal reductions
-        for y_idx in range(1, len(years)):
-            if yearly_emissions[y_idx] <= yearly_reductions[y_idx]:
-                # Mark the equilibrium point
-                eq_year = years[y_idx]
-                eq_value = yearly_emissions[y_idx]
-                ax.scatter([eq_year], [eq_value], s=100, color=palette[i], 
-                          edgecolor='black', zorder=10, marker='*')
-                ax.annotate(f"Equilibrium\n{eq_year}", 
-                           xy=(eq_year, eq_value),
-                           xytext=(10, 10),
-                           textcoords='offset points',
-                           fontsize=10,
-                           fontweight='bold',
-                           color=palette[i],
-                           arrowprops=dict(arrowstyle="->", color=palette[i]))
-                break
-    
-    # Aesthetics
-    ax.set_title(f"CO2 Emissions vs. Reduction Over Time ({start_year}-{end_year})\nWith 1% Annual Emission Growth", 
-                fontsize=16, pad=20, fontweight='bold')
-    ax.set_xlabel("Year", fontsize=14, labelpad=10)
-    ax.set_ylabel("CO2 (tons/year)", fontsize=14, labelpad=10)
-    ax.set_yscale("log")  # Log scale for better visualization
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: format_large_num(x)))
-    ax.grid(True, which="both", ls="--", alpha=0.2)
-    
-    # Add annotations for starting points
-    for i, (country, emission) in enumerate(zip(countries, emissions)):
-        # Annotate starting point
-        ax.annotate(f"{country}: {format_large_num(emission)} tons",
-                   xy=(start_year, emission),
-                   xytext=(5, 5),
-                   textcoords='offset points',
-                   fontsize=10,
-                   fontweight='bold',
-                   color=palette[i])
-    
-    # Legend with smaller font and better position
-    ax.legend(loc='upper right', fontsize=9, ncol=2)
-    
-    # Watermark
-    ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
-            ha='center', va='center', rotation=45, transform=ax.transAxes)
-
-def update_summary(countries, emissions, land_area, bamboo_area_needed_annually, 
-                  planting_cost, percent_land, gdp_percentage, start_year, end_year,
-                  percent_land_available, gdp_percent_available, available_land,
-                  affordable_bamboo_area, actual_reduction_rates, equilibrium_years):
-    """Update the text summary panel with calculation details"""
-    summary_text = f"Calculation Overview:\n\n"
-    summary_text += f"Initial Data:\n"
-    for i in range(len(countries)):
-        summary_text += f"• {countries[i]}: {emissions[i]:,.0f} tons CO2/yr\n"
-    
-    summary_text += f"\nConstraints:\n"
-    summary_text += f"• Available Land: {percent_land_available:.1f}% of total land\n"
-    summary_text += f"• Available GDP: {gdp_percent_available:.2f}% of GDP\n"
-    
-    summary_text += f"\nConversion (Bamboo Absorption):\n"
-    summary_text += f"• 25 tons CO2/acre/yr * 640 acres/sq mi = 16,000 tons CO2/sq mi/yr\n"
-    
-    summary_text += f"\nGeneral Formulas:\n"
-    summary_text += f"• Bamboo Area = CO2 Emissions / 16,000 tons CO2/sq mi/yr\n"
-    summary_text += f"• Bamboo Area Annually = Bamboo Area / {REFERENCE_YEARS_OFFSET} years (fixed reference period)\n"
-    summary_text += f"• Land % = Bamboo Area / Land Area * 100\n"
-    summary_text += f"• Annual Planting Cost = Bamboo Area Annually * ${cost_planting_bamboo:,.0f} per sq mi\n"
-    summary_text += f"• GDP % = Annual Planting Cost / GDP * 100\n"
-    summary_text += f"• Annual Emission Growth: 1% compound growth\n"
-    
-    if plot_type.get() == "time":
-        summary_text += f"\nTime Series Plot Details:\n"
-        summary_text += f"• Shows emissions vs. reductions from {start_year} to {end_year}\n"
-        summary_text += f"• Emissions grow at 1% annually\n"
-        summary_text += f"• Reductions are constrained by available land and GDP\n"
-        summary_text += f"• Stars on plot indicate equilibrium points (when production = consumption)\n"
-    
-    summary_text += f"\nDetailed Calculations for Each Country:\n"
-
-    for i in range(len(countries)):
-        bamboo_area = bamboo_area_needed_annually[i]
-        cost = planting_cost[i]
-        percent_of_land = percent_land[i]
-        gdp_pct = gdp_percentage[i]
-        avail_land = available_land[i] / REFERENCE_YEARS_OFFSET
-        afford_area = affordable_bamboo_area[i]
-        reduction_rate = actual_reduction_rates[i]
-        eq_year = equilibrium_years[i]
-        
-        constrained_by = "land" if avail_land < afford_area else "budget"
-        
-        summary_text += f"\n{countries[i]}:\n"
-        summary_text += f"  • Annual Bamboo Area Needed (Ideal): {format_large_num(bamboo_area)} sq mi/yr\n"
-        summary_text += f"  • Available Annual Land: {format_large_num(avail_land)} sq mi/yr\n"
-        summary_text += f"  • Affordable Annual Area: {format_large_num(afford_area)} sq mi/yr\n"
-        summary_text += f"  • Constrained by: {constrained_by.upper()}\n"
-        summary_text += f"  • Annual Planting Cost: ${format_large_num(cost)}\n"
-        summary_text += f"  • Percent of Total Land Required: {percent_of_land:.2f}%\n"
-        summary_text += f"  • GDP Percentage Required: {gdp_pct:.2f}%\n"
-        summary_text += f"  • Actual CO2 Reduction Rate: {format_large_num(reduction_rate)} tons/yr\n"
-        summary_text += f"  • Equilibrium Year (consumption = production): {eq_year}\n"
-
-    summary_label.config(text=summary_text)
+    update_bar_nav()
+
+    # Update data summary and calculations
+    with timer.stage("summary"):
+        update_summary(inputs, outputs)
+        # Make the summary update part of the measured time, not the next idle pass
+        summary_label.update_idletasks()
+
+    report_timing(inputs, timer)
+
+    if startup_report_enabled and not startup_reported:
+        startup_reported = True
+        mark_startup("first chart drawn")
+        show_startup_report()
+
+def report_timing(inputs, timer):
+    """Show a finished run's stage times in the status bar and append them to the trace"""
+    global trace_path
+    cached = ", cached" if inputs["cached"] else ""
+    status = f"Last run ({inputs['plot_type']}, {len(inputs['countries'])} countries{cached}): {timer.format()}"
+    if trace_path:
+        try:
+            append_trace(trace_path, timer.record(plot_type=inputs["plot_type"], cached=inputs["cached"],
+                                                  countries=len(inputs["countries"]),
+                                                  generation=compute_generation))
+        except OSError as e:
+            trace_path = None  # Stop retrying for the rest of the session
+            status += f"  (trace disabled: {e})"
+    status_bar.config(text=status)
+
+def update_summary(inputs, outputs):
+    """Update the run header and the per-country results table"""
+    header = constraints_text(inputs["percent_land_available"], inputs["gdp_percent_available"],
+                              inputs["maturity_years"], inputs["rotation_years"],
+                              inputs["gdp_growth"], inputs["ramp_years"])
+    details = plot_details(inputs["plot_type"], inputs["start_year"], inputs["end_year"], outputs["bands"],
+                           outputs["peaks"], inputs["growth"], inputs["uncertainty"].get("annual_emission_increase"))
+    if details:
+        header += "\n" + details
+    summary_label.config(text=header)
+    show_results_table(outputs["table"], outputs["orders"], outputs["bands"])
+
+def show_results_table(columns, orders, bands=None):
+    """Show a new run in the results table, keeping the sort and scroll position"""
+    previous = results_state["columns"]
+    same_rows = previous is not None and np.array_equal(previous["country"], columns["country"])
+    keep_rows = results_state["loaded"] if same_rows else 0
+    first = results_table.yview()[0] if same_rows else 0.0
+    results_state.update(columns=columns, orders=orders)
+
+    # The bands column only appears when Monte Carlo bands were computed
+    shown = [key for key, _ in RESULT_COLUMNS if key in columns]
+    results_table.config(displaycolumns=shown)
+    if bands is not None:
+        results_state["headings"]["equilibrium_bands"] = band_heading(bands)
+    if results_state["sort"][0] not in columns:
+        results_state["sort"] = (None, False)
+    apply_results_sort(keep_rows, first)
+
+def apply_results_sort(rows=0, first=0.0):
+    """Reorder the table from the precomputed argsort and refill it from the top"""
+    key, descending = results_state["sort"]
+    columns = results_state["columns"]
+    order = np.arange(len(columns["country"])) if key is None else results_state["orders"][key]
+    results_state["order"] = order[::-1] if descending else order
+
+    results_table.delete(*results_table.get_children())
+    results_state["loaded"] = 0
+    fill_results_table(max(rows, RESULTS_PAGE_ROWS))
+    if first:
+        results_table.yview_moveto(first)
+
+    for column, heading in results_state["headings"].items():
+        arrow = (" ▼" if descending else " ▲") if column == key else ""
+        results_table.heading(column, text=heading + arrow)
+
+def fill_results_table(count=RESULTS_PAGE_ROWS):
+    """Format and insert the next rows of the current order"""
+    results_state["filling"] = False
+    columns, order = results_state["columns"], results_state["order"]
+    start = results_state["loaded"]
+    stop = min(len(order), start + count)
+    for i in order[start:stop]:
+        results_table.insert("", tk.END, iid=str(i), values=format_result_row(columns, i))
+    results_state["loaded"] = stop
+    more = " (scroll for more)" if stop < len(order) else ""
+    results_count_label.config(text=f"Showing {stop:,} of {len(order):,} countries{more}")
+
+def on_results_scroll(first, last):
+    """Scrollbar update; loads the next page once the view nears the last loaded row"""
+    results_yscroll.set(first, last)
+    order = results_state["order"]
+    if (order is not None and float(last) > 0.9 and results_state["loaded"] < len(order)
+            and not results_state["filling"]):
+        results_state["filling"] = True
+        root.after_idle(fill_results_table)
+
+def sort_results(key):
+    """Heading click: sort by that column, or flip the direction if it is already sorted"""
+    if results_state["columns"] is None:
+        return
+    current, descending = results_state["sort"]
+    results_state["sort"] = (key, not descending if key == current else False)
+    apply_results_sort()
+
+def scroll_bar_chart(step):
+    """Move a paged bar chart by step countries; only the view changes, nothing is recomputed"""
+    if bar_chart is None or not bar_chart.is_attached():
+        return
+    if bar_chart.set_window(bar_chart.start + step):
+        bar_chart.draw(canvas)
+        update_bar_nav()
+
+def on_chart_scroll(event):
+    # Wheel up scrolls towards the first country
+    scroll_bar_chart(-BAR_SCROLL_STEP if event.step > 0 else BAR_SCROLL_STEP)
+
+def update_bar_nav():
+    """Show the page buttons only while a bar chart too wide for one page is on screen"""
+    if bar_chart is not None and bar_chart.is_attached() and bar_chart.paged():
+        bar_nav_label.config(text=bar_chart.view_text())
+        first, stop = bar_chart.view()
+        bar_prev_button.config(state=tk.NORMAL if first > 0 else tk.DISABLED)
+        bar_next_button.config(state=tk.NORMAL if stop < len(bar_chart.countries) else tk.DISABLED)
+        if not bar_nav_frame.winfo_ismapped():
+            bar_nav_frame.pack(side=tk.TOP, fill=tk.X, before=canvas.get_tk_widget())
+    else:
+        bar_nav_frame.pack_forget()
 
 def save_plot():
+    if fig is None:
+        messagebox.showinfo("Save Plot", "Nothing to save yet: run Analyze first.")
+        return
     file_path = filedialog.asksaveasfilename(defaultextension=".png",
                                              filetypes=[("PNG files", "*.png")])
     if file_path:
-        fig.savefig(file_path)
+        with bar_chart.static():
+            fig.savefig(file_path)
         messagebox.showinfo("Saved", f"Plot saved to:\n{file_path}")
 
 def exit_app():
+    global compute_generation
+    compute_generation += 1  # A run in progress stops at its next check; the daemon worker never blocks exit
+    if pending_compute is not None:
+        pending_compute.cancel()
+    if scenario_store is not None:
+        scenario_store.close()
     root.destroy()
 
 # Layout
@@ -430,39 +661,100 @@ years_input = tk.Text(control_frame, height=2, font=("Courier", 14), wrap=tk.NON
 years_input.insert(tk.END, str(default_years_offset))
 years_input.pack(fill=tk.X, padx=10)
 
+tk.Label(control_frame, text="Enter Uncertainty Distributions (e.g. {'sequestration_rate': ('normal', 16000, 1600)}, empty for none):", font=("Arial", 16)).pack(anchor="w", padx=10)
+uncertainty_input = tk.Text(control_frame, height=2, font=("Courier", 14), wrap=tk.NONE)
+if default_uncertainty:
+    uncertainty_input.insert(tk.END, str(default_uncertainty))
+uncertainty_input.pack(fill=tk.X, padx=10)
+
+tk.Label(control_frame, text="Enter Emission Growth Scenarios (as Python dict of name: rate):", font=("Arial", 16)).pack(anchor="w", padx=10)
+scenarios_input = tk.Text(control_frame, height=2, font=("Courier", 14), wrap=tk.NONE)
+scenarios_input.insert(tk.END, str(default_growth_scenarios))
+scenarios_input.pack(fill=tk.X, padx=10)
+
 # New sliders for percent_land and gdp_percentage
 constraint_frame = tk.Frame(control_frame)
 constraint_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
 
 # Percent land available slider
 tk.Label(constraint_frame, text="Available Land (% of total):", font=("Arial", 16)).grid(row=0, column=0, sticky="w")
-percent_land_input = tk.Scale(constraint_frame, from_=0.1, to=30.0, resolution=0.1, orient=tk.HORIZONTAL, 
+percent_land_input = tk.Scale(constraint_frame, from_=LAND_PERCENT_RANGE[0], to=LAND_PERCENT_RANGE[1],
+                             resolution=LAND_PERCENT_RANGE[2], orient=tk.HORIZONTAL,
                              length=300, font=("Arial", 12))
 percent_land_input.set(default_percent_land)
+percent_land_input.config(command=schedule_recompute)  # After set() so startup does not recompute twice
 percent_land_input.grid(row=0, column=1, padx=10)
 
 # GDP percentage slider
 tk.Label(constraint_frame, text="Available GDP (%):", font=("Arial", 16)).grid(row=1, column=0, sticky="w")
-gdp_percent_input = tk.Scale(constraint_frame, from_=0.01, to=5.0, resolution=0.01, orient=tk.HORIZONTAL, 
+gdp_percent_input = tk.Scale(constraint_frame, from_=GDP_PERCENT_RANGE[0], to=GDP_PERCENT_RANGE[1],
+                            resolution=GDP_PERCENT_RANGE[2], orient=tk.HORIZONTAL,
                             length=300, font=("Arial", 12))
 gdp_percent_input.set(default_gdp_percentage)
+gdp_percent_input.config(command=schedule_recompute)
 gdp_percent_input.grid(row=1, column=1, padx=10)
 
+# Stand maturity slider: 0 counts new planting at the full rate immediately (original model)
+tk.Label(constraint_frame, text="Stand Maturity (years):", font=("Arial", 16)).grid(row=2, column=0, sticky="w")
+maturity_input = tk.Scale(constraint_frame, from_=0, to=20, resolution=1, orient=tk.HORIZONTAL,
+                          length=300, font=("Arial", 12))
+maturity_input.set(default_maturity_years)
+maturity_input.config(command=schedule_recompute)
+maturity_input.grid(row=2, column=1, padx=10)
+
+# Harvest rotation slider: 0 keeps all sequestered carbon in the stand (original model)
+tk.Label(constraint_frame, text="Harvest Rotation (years):", font=("Arial", 16)).grid(row=3, column=0, sticky="w")
+rotation_input = tk.Scale(constraint_frame, from_=0, to=20, resolution=1, orient=tk.HORIZONTAL,
+                          length=300, font=("Arial", 12))
+rotation_input.set(default_rotation_years)
+rotation_input.config(command=schedule_recompute)
+rotation_input.grid(row=3, column=1, padx=10)
+
+# GDP growth slider: the planting budget is a share of a GDP growing at this rate (0 = constant budget)
+tk.Label(constraint_frame, text="GDP Growth (%/yr):", font=("Arial", 16)).grid(row=4, column=0, sticky="w")
+gdp_growth_input = tk.Scale(constraint_frame, from_=-5, to=10, resolution=0.1, orient=tk.HORIZONTAL,
+                            length=300, font=("Arial", 12))
+gdp_growth_input.set(default_gdp_growth)
+gdp_growth_input.config(command=schedule_recompute)
+gdp_growth_input.grid(row=4, column=1, padx=10)
+
+# Budget ramp-up slider: spending rises linearly to the full GDP share over this many years
+tk.Label(constraint_frame, text="Budget Ramp-up (years):", font=("Arial", 16)).grid(row=5, column=0, sticky="w")
+ramp_input = tk.Scale(constraint_frame, from_=0, to=30, resolution=1, orient=tk.HORIZONTAL,
+                      length=300, font=("Arial", 12))
+ramp_input.set(default_ramp_years)
+ramp_input.config(command=schedule_recompute)
+ramp_input.grid(row=5, column=1, padx=10)
+
 # Plot type selection
 plot_type_frame = tk.Frame(control_frame)
 plot_type_frame.pack(anchor="w", padx=10, pady=(10, 0))
 tk.Label(plot_type_frame, text="Select Plot Type:", font=("Arial", 16)).pack(side=tk.LEFT)
-tk.Radiobutton(plot_type_frame, text="Bar Chart (Constraints)", variable=plot_type, value="bar", font=("Arial", 14)).pack(side=tk.LEFT, padx=(20, 10))
-tk.Radiobutton(plot_type_frame, text="Time Series (Equilibrium Years)", variable=plot_type, value="time", font=("Arial", 14)).pack(side=tk.LEFT, padx=10)
+tk.Radiobutton(plot_type_frame, text="Bar Chart (Constraints)", variable=plot_type, value="bar", command=compute_and_plot, font=("Arial", 14)).pack(side=tk.LEFT, padx=(20, 10))
+tk.Radiobutton(plot_type_frame, text="Time Series (Equilibrium Years)", variable=plot_type, value="time", command=compute_and_plot, font=("Arial", 14)).pack(side=tk.LEFT, padx=10)
+tk.Radiobutton(plot_type_frame, text="Growth Scenarios", variable=plot_type, value="growth", command=compute_and_plot, font=("Arial", 14)).pack(side=tk.LEFT, padx=10)
+tk.Radiobutton(plot_type_frame, text="Constraint Sweep (Heatmap)", variable=plot_type, value="sweep", command=compute_and_plot, font=("Arial", 14)).pack(side=tk.LEFT, padx=10)
+
+# Country shown by the constraint sweep heatmap
+heatmap_country = ttk.Combobox(plot_type_frame, values=["All Countries"] + default_countries,
+                               state="readonly", width=18, font=("Arial", 14))
+heatmap_country.set("All Countries")
+heatmap_country.bind("<<ComboboxSelected>>", lambda _event: compute_and_plot())  # A cache hit: redraw only
+heatmap_country.pack(side=tk.LEFT, padx=10)
 
 # Buttons
 btn_frame = tk.Frame(control_frame)
 btn_frame.pack(pady=10)
 
 tk.Button(btn_frame, text="🔍 Analyze", command=compute_and_plot, font=("Arial", 16), bg="#007acc", fg="white").pack(side=tk.LEFT, padx=10)
+tk.Button(btn_frame, text="📂 Load Data", command=load_data, font=("Arial", 16), bg="#6f42c1", fg="white").pack(side=tk.LEFT, padx=10)
 tk.Button(btn_frame, text="💾 Save Plot", command=save_plot, font=("Arial", 16), bg="#28a745", fg="white").pack(side=tk.LEFT, padx=10)
 tk.Button(btn_frame, text="❌ Exit", command=exit_app, font=("Arial", 16), bg="#cc0000", fg="white").pack(side=tk.LEFT, padx=10)
 
+# Status bar with the stage timings of the last run (packed before the main panels so it keeps its space)
+status_bar = tk.Label(root, text="", anchor="w", bg="#e6f0ff", font=("Courier", 12), padx=10)
+status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
 # Main Panels
 main_frame = tk.Frame(root)
 main_frame.pack(fill=tk.BOTH, expand=True)
@@ -470,6 +762,17 @@ main_frame.pack(fill=tk.BOTH, expand=True)
 left_panel = tk.Frame(main_frame)
 left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
+# Page buttons for bar charts with more countries than fit on one page (the mouse wheel scrolls too)
+bar_nav_frame = tk.Frame(left_panel)
+bar_prev_button = tk.Button(bar_nav_frame, text="◀ Previous", font=("Arial", 12),
+                            command=lambda: scroll_bar_chart(-charts.BAR_PAGE_SIZE))
+bar_prev_button.pack(side=tk.LEFT, padx=10)
+bar_nav_label = tk.Label(bar_nav_frame, text="", font=("Arial", 12))
+bar_nav_label.pack(side=tk.LEFT, expand=True)
+bar_next_button = tk.Button(bar_nav_frame, text="Next ▶", font=("Arial", 12),
+                            command=lambda: scroll_bar_chart(charts.BAR_PAGE_SIZE))
+bar_next_button.pack(side=tk.RIGHT, padx=10)
+
 right_panel = tk.Frame(main_frame, bg="#f0f6ff", width=820, padx=30)
 right_panel.pack(side=tk.RIGHT, fill=tk.Y)
 right_panel.pack_propagate(0)
@@ -478,8 +781,37 @@ tk.Label(right_panel, text="📊 Calculation Steps", font=("Helvetica", 24, "bol
 summary_label = tk.Label(right_panel, text="", bg="#f0f6ff", justify="left", font=("Courier", 14), anchor="nw")
 summary_label.pack(pady=(0, 10), fill=tk.X)
 
-# Initialize with default values
+# Formula legend: does not depend on the inputs, so it is built once
+legend_label = tk.Label(right_panel, text=formula_legend(cost_planting_bamboo), bg="#f0f6ff",
+                        justify="left", font=("Courier", 12), anchor="nw")
+legend_label.pack(side=tk.BOTTOM, pady=(10, 5), fill=tk.X)
+
+# Per-country results table: click a heading to sort, rows load as you scroll
+results_count_label = tk.Label(right_panel, text="", bg="#f0f6ff", anchor="w", font=("Arial", 12))
+results_count_label.pack(fill=tk.X)
+table_frame = tk.Frame(right_panel)
+table_frame.pack(fill=tk.BOTH, expand=True)
+results_table = ttk.Treeview(table_frame, columns=[key for key, _ in RESULT_COLUMNS], show="headings",
+                             selectmode="browse")
+for key, heading in RESULT_COLUMNS:
+    results_table.heading(key, text=heading, command=lambda key=key: sort_results(key))
+    results_table.column(key, width=150 if key in ("country", "equilibrium_bands", "equilibrium_scenarios") else 110,
+                         anchor="w" if key == "country" else "e", stretch=False)
+results_yscroll = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=results_table.yview)
+results_xscroll = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=results_table.xview)
+results_table.configure(yscrollcommand=on_results_scroll, xscrollcommand=results_xscroll.set)
+results_yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+results_xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+results_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+# Show the window before anything heavy is imported
+mark_startup("widgets built")
+root.update()
+mark_startup("window shown")
+
+# Initialize with default values; matplotlib loads here while the engine runs
 compute_and_plot()
+ensure_figure()
 
 # Ensure full shutdown when window is closed
 root.protocol("WM_DELETE_WINDOW", exit_app)
@@ -0,0 +1,334 @@
+"""Benchmark suite for the Bamboo CO2 offset calculator.
+
+Times the core area/cost/GDP math, equilibrium solving, time series
+generation, the parallel scenario runner, summary text, the results table
+and chart rendering on synthetic inputs from the default 3 countries up to
+1M rows.
+
+    python bamboo_bench.py                          # all benchmarks, all sizes
+    python bamboo_bench.py -b offsets equilibrium --sizes 3 1000000
+    python bamboo_bench.py --json bench.json        # machine-readable results
+    python bamboo_bench.py --compare bench.json     # flag slowdowns against a saved run
+
+Every case reports per-call latency percentiles over several timed runs
+(fast calls are repeated within a run, like timeit), throughput (rows per
+second at the median latency) and peak memory of one extra run traced with
+tracemalloc. Traced memory covers this process only, so the scenario
+runner's worker processes are not included. Sizes above a
+benchmark's limit are skipped (a 1M-country bar chart is not meaningful).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from bamboo_engine import (compute_offsets, equilibrium_years, time_series, growth_scenarios, age_kernel,
+                           convolve_years)
+from bamboo_runner import run_scenarios
+from bamboo_harvest import harvest_kernels, carbon_pools
+from bamboo_raster import RASTER_CHUNK_CELLS, create_rasters, open_rasters, available_land
+from bamboo_summary import build_summary, result_columns, sort_orders, format_result_row
+
+DEFAULT_SIZES = (3, 100, 1_000, 100_000, 1_000_000)
+DEFAULT_REPEAT = 5
+MIN_REPEAT = 3  # Fewer runs than this make the percentiles meaningless
+CASE_TIME_BUDGET = 10.0  # Seconds per case before stopping at MIN_REPEAT runs
+MIN_SAMPLE_TIME = 0.005  # Fast cases repeat the call within a sample until it lasts this long
+REGRESSION_THRESHOLD = 1.2  # --compare flags cases whose p50 grew by more than this factor
+
+# The desktop app's default countries, used as-is for size 3
+DEFAULT_COUNTRIES = (["Jamaica", "Madagascar", "Vietnam"], [4244, 228531, 127932],
+                     [6083040, 4099000, 327905620], [15e9, 14e9, 700e9])
+
+
+def synthetic_countries(n, seed=0):
+    """n countries of plausible land (sq mi), emissions (tons/yr) and GDP (USD)"""
+    if n == 3:
+        names, land_area, emissions, gdp = DEFAULT_COUNTRIES
+        return names, np.array(land_area, float), np.array(emissions, float), np.array(gdp, float)
+    rng = np.random.default_rng(seed)
+    names = [f"Country {i}" for i in range(n)]
+    land_area = rng.lognormal(np.log(1e5), 1.5, n)
+    emissions = rng.lognormal(np.log(5e7), 2.0, n)
+    gdp = rng.lognormal(np.log(1e11), 1.5, n)
+    return names, land_area, emissions, gdp
+
+
+# Each setup takes a size and returns a zero-argument callable to time
+
+
+def setup_offsets(n):
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    return lambda: compute_offsets(land_area, emissions, gdp)
+
+
+def setup_equilibrium(n):
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    rates = compute_offsets(land_area, emissions, gdp).actual_reduction_rates
+    return lambda: equilibrium_years(emissions, rates)
+
+
+def setup_time_series(n):
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    rates = compute_offsets(land_area, emissions, gdp).actual_reduction_rates
+    return lambda: time_series(emissions, rates, 2025, 2099)
+
+
+def setup_cohort(n, n_years=500):
+    # Multi-century planting schedule convolved with the stand-age kernel (FFT path)
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    rates = compute_offsets(land_area, emissions, gdp).actual_reduction_rates
+    schedule = rates * np.linspace(0.5, 1.5, n_years)[:, None]
+    kernel = age_kernel(n_years)
+    return lambda: convolve_years(schedule, kernel)
+
+
+def setup_harvest(n, n_years=75):
+    # Harvest stream and stand/product stocks for the time series window
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    rates = compute_offsets(land_area, emissions, gdp).actual_reduction_rates
+    kernels = harvest_kernels(n_years, kernel=age_kernel(n_years))
+    return lambda: carbon_pools(rates, n_years, kernels)
+
+
+def setup_growth(n):
+    # The default low/medium/high growth scenarios as one (scenarios, years, countries) tensor
+    _, land_area, emissions, gdp = synthetic_countries(n)
+    rates = compute_offsets(land_area, emissions, gdp).actual_reduction_rates
+    return lambda: growth_scenarios(emissions, rates, 2025, 2099)
+
+
+def setup_rasters(n, side=100):
+    # Available land summed from an on-disk raster set of n side x side float32 grids
+    names = synthetic_countries(n)[0]
+    folder = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    path = os.path.join(folder.name, "land")
+    rasters = create_rasters(path, names, [(side, side)] * n)
+    rng = np.random.default_rng(0)
+    for start in range(0, len(rasters.data), RASTER_CHUNK_CELLS):
+        chunk = rasters.data[start:start + RASTER_CHUNK_CELLS]
+        chunk[:] = rng.uniform(-0.5, 1.0, len(chunk))  # Negative cells stand in for no-data
+    rasters.flush()
+    del rasters
+    rasters = open_rasters(path)
+
+    def run():
+        folder  # Keep the temporary files alive as long as the benchmark
+        return available_land(rasters, names)
+    return run
+
+
+def setup_scenarios(n):
+    # n country-scenario rows: the 3 default countries under n / 3 constraint settings
+    _, land_area, emissions, gdp = synthetic_countries(3)
+    rng = np.random.default_rng(0)
+    n_scenarios = max(1, n // 3)
+    percent_land = rng.uniform(0.1, 30.0, n_scenarios)
+    gdp_percent = rng.uniform(0.01, 5.0, n_scenarios)
+    return lambda: run_scenarios(land_area, emissions, gdp, percent_land, gdp_percent)
+
+
+def setup_summary(n):
+    names, land_area, emissions, gdp = synthetic_countries(n)
+    result = compute_offsets(land_area, emissions, gdp)
+    return lambda: build_summary(names, emissions, land_area, result.bamboo_area_needed_annually,
+                                 result.planting_cost, result.percent_land, result.gdp_percentage,
+                                 2025, 2099, 10.0, 0.3, result.available_land,
+                                 result.affordable_bamboo_area, result.actual_reduction_rates,
+                                 result.equilibrium_years)
+
+
+def setup_results_table(n, page_rows=100):
+    # What one Analyze costs the results table: columns, every sort order, first page of rows
+    names, land_area, emissions, gdp = synthetic_countries(n)
+    result = compute_offsets(land_area, emissions, gdp)
+
+    def build():
+        columns = result_columns(names, emissions, result)
+        orders = sort_orders(columns)
+        return [format_result_row(columns, i) for i in orders["equilibrium"][:page_rows]]
+    return build
+
+
+def _agg_axes():
+    # Imported here so the numeric benchmarks never load matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 6))
+    return FigureCanvasAgg(fig), fig.add_subplot()
+
+
+def setup_render_bar(n):
+    from bamboo_charts import BarChart
+    names, land_area, emissions, gdp = synthetic_countries(n)
+    result = compute_offsets(land_area, emissions, gdp)
+    canvas, ax = _agg_axes()
+
+    def render():
+        # A fresh BarChart rebuilds every artist, like the first Analyze
+        BarChart(ax).update(names, land_area, result.bamboo_area_needed_annually, result.planting_cost,
+                            result.gdp_percentage, 2025, 2099, result.available_land,
+                            result.affordable_bamboo_area)
+        canvas.draw()
+    return render
+
+
+def setup_render_time(n):
+    from bamboo_charts import plot_time_series
+    names, land_area, emissions, gdp = synthetic_countries(n)
+    result = compute_offsets(land_area, emissions, gdp)
+    series = time_series(emissions, result.actual_reduction_rates, 2025, 2099)
+    canvas, ax = _agg_axes()
+
+    def render():
+        ax.clear()
+        plot_time_series(ax, names, emissions, 2025, 2099, series)
+        canvas.draw()
+    return render
+
+
+# name -> (setup, largest size worth running)
+BENCHMARKS = {
+    "offsets": (setup_offsets, 1_000_000),
+    "equilibrium": (setup_equilibrium, 1_000_000),
+    "time_series": (setup_time_series, 100_000),  # 75 years x 1M countries x 3 matrices is ~1.8 GB
+    "cohort": (setup_cohort, 10_000),  # 500 years x 100k countries would need ~1 GB of FFT buffers
+    "harvest": (setup_harvest, 100_000),
+    "growth": (setup_growth, 100_000),  # 3 scenarios x 75 years x 100k countries is ~0.5 GB of matrices
+    "rasters": (setup_rasters, 1_000),  # 10k cells per country; 1,000 countries is a 40 MB file
+    "scenarios": (setup_scenarios, 1_000_000),
+    "summary": (setup_summary, 100_000),
+    "results_table": (setup_results_table, 1_000_000),
+    "render_bar": (setup_render_bar, 1_000),  # Above 12 countries each series is one collection
+    "render_time": (setup_render_time, 100),
+}
+
+
+def run_case(name, size, repeat=DEFAULT_REPEAT, time_budget=CASE_TIME_BUDGET):
+    """Time one benchmark at one size and return its result record"""
+    setup, _ = BENCHMARKS[name]
+    func = setup(size)
+    t0 = time.perf_counter()
+    func()  # Warm-up: imports, caches, worker start-up paths
+    warmup = time.perf_counter() - t0
+    # Sub-millisecond calls are timed in batches (like timeit) to rise above timer noise
+    number = max(1, int(MIN_SAMPLE_TIME / max(warmup, 1e-7)))
+
+    # Peak memory from a separate traced run so tracing does not skew the timings
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < repeat:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        latencies.append((time.perf_counter() - t0) / number)
+        if len(latencies) >= MIN_REPEAT and time.perf_counter() - started > time_budget:
+            break
+
+    latencies = np.array(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "benchmark": name,
+        "size": size,
+        "runs": len(latencies),
+        "calls_per_run": number,
+        "latency_ms": {"min": latencies.min() * 1e3, "p50": p50 * 1e3, "p90": p90 * 1e3,
+                       "p99": p99 * 1e3, "mean": latencies.mean() * 1e3},
+        "throughput_per_s": size / p50,
+        "peak_memory_mb": peak / 2**20,
+    }
+
+
+def environment():
+    """Where the numbers came from, stored alongside them"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print p50 ratios against a saved run; return the cases slower than threshold"""
+    previous = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nAgainst {baseline['environment'].get('commit') or 'baseline'} "
+          f"({baseline['environment'].get('timestamp', '?')}):")
+    for result in results:
+        old = previous.get((result["benchmark"], result["size"]))
+        if old is None:
+            continue
+        ratio = result["latency_ms"]["p50"] / old["latency_ms"]["p50"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {result['benchmark']:<14} {result['size']:>9,}  p50 x{ratio:5.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def print_result(result):
+    latency = result["latency_ms"]
+    print(f"{result['benchmark']:<14} {result['size']:>9,} {result['runs']:>4} "
+          f"{latency['p50']:>10.3f} {latency['p90']:>10.3f} {latency['p99']:>10.3f} "
+          f"{result['throughput_per_s']:>14,.0f} {result['peak_memory_mb']:>9.1f}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Bamboo CO2 offset engine and charts.")
+    parser.add_argument("-b", "--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="rows per case (countries, or country-scenario pairs)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per case")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="p50 slowdown factor reported as a regression")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<14} {'size':>9} {'runs':>4} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+          f"{'rows/s':>14} {'peak MB':>9}")
+    results = []
+    for name in args.benchmarks:
+        for size in args.sizes:
+            if size > BENCHMARKS[name][1]:
+                continue
+            result = run_case(name, size, max(args.repeat, MIN_REPEAT))
+            print_result(result)
+            results.append(result)
+
+    report = {"environment": environment(), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nWrote {args.json}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""In-memory result cache for the Bamboo CO2 offset calculator.
+
+Engine outputs are stored under a hash of everything they depend on: the
+parsed country columns, the constraint and year settings, the view and the
+model constants. Entries are evicted least recently used once the cache
+holds more than its byte budget, so flipping between views or back to an
+earlier slider setting reuses the earlier run instead of recomputing it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from bamboo_engine import (SEQUESTRATION_RATE, COST_PLANTING_BAMBOO, REFERENCE_YEARS_OFFSET,
+                           BASE_YEAR, EQUILIBRIUM_HORIZON)
+
+# Part of every key, so a changed constant never serves results computed with the old value
+MODEL_CONSTANTS = {
+    "sequestration_rate": SEQUESTRATION_RATE,
+    "cost_planting_bamboo": COST_PLANTING_BAMBOO,
+    "reference_years_offset": REFERENCE_YEARS_OFFSET,
+    "base_year": BASE_YEAR,
+    "equilibrium_horizon": EQUILIBRIUM_HORIZON,
+}
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def _feed(digest, value):
+    """Hash value into digest, tagging each piece with its type so 1, 1.0 and "1" differ"""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f"array:{value.dtype.str}:{value.shape}:".encode())
+        if value.dtype.hasobject:
+            _feed(digest, value.tolist())
+        else:
+            digest.update(value.data)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, np.generic):
+        _feed(digest, value.item())
+    else:
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def input_key(*parts, **fields):
+    """Hex digest of the given values plus MODEL_CONSTANTS"""
+    digest = hashlib.blake2b(digest_size=16)
+    _feed(digest, parts)
+    _feed(digest, fields)
+    _feed(digest, MODEL_CONSTANTS)
+    return digest.hexdigest()
+
+
+def approx_nbytes(value):
+    """Rough memory held by a result: NumPy buffers plus a small charge per object"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return 64 + sum(approx_nbytes(k) + approx_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(approx_nbytes(item) for item in value)
+    if isinstance(value, str):
+        return 49 + len(value)
+    return 32
+
+
+class LRUCache:
+    """Byte-bounded least-recently-used cache, safe to share between threads"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (value, nbytes), oldest first
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store value, evicting the oldest entries to stay within the limits
+
+        A value larger than max_bytes on its own is not stored.
+        """
+        nbytes = approx_nbytes(value)
+        with self._lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self.entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes or (self.max_entries and len(self.entries) > self.max_entries):
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Short description for status lines, e.g. "4 entries, 1.2 MB, 75% hits" """
+        lookups = self.hits + self.misses
+        rate = f", {100 * self.hits / lookups:.0f}% hits" if lookups else ""
+        return f"{len(self.entries)} entries, {self.nbytes / 2**20:.1f} MB{rate}"
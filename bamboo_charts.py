@@ -0,0 +1,540 @@
+"""Matplotlib charts for the Bamboo CO2 offset calculator.
+
+Charts draw onto a given Axes and never import tkinter, so they can be used
+both by the desktop app and for headless rendering.
+"""
+from contextlib import contextmanager
+
+import matplotlib
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.ticker import FuncFormatter
+
+from bamboo_engine import (REFERENCE_YEARS_OFFSET, BASE_YEAR, EQUILIBRIUM_HORIZON, ANNUAL_EMISSION_INCREASE,
+                           sweep_heatmap)
+from bamboo_summary import format_large_num, growth_text, sampled_growth_text
+from bamboo_palette import rocket_cmap, rocket_palette, set_whitegrid_style
+
+# Bar series in drawing order: (legend label, unit shown under the value)
+BAR_SERIES = [
+    ("Actual Land Area", "sq mi"),
+    ("Annual Bamboo Area Needed", "sq mi/yr"),
+    ("Annual Planting Cost (USD)", "$/yr"),
+    ("Available Land (Annual)", "sq mi/yr"),
+    ("Affordable Bamboo Area (Annual)", "sq mi/yr"),
+]
+BAR_WIDTH = 0.18  # Narrow enough for five bars per country
+COLLECTION_THRESHOLD = 12  # Above this many countries each series is one collection, not one patch per bar
+LABEL_TOP_K = 10  # Large charts label every country in view if this few, else the K largest needs
+TICK_LIMIT = 60  # Large charts name every country in view up to this many, else only the labeled ones
+BAR_PAGE_SIZE = 50  # Countries per page when the desktop app pages a large chart
+LARGE_LABEL_SERIES = 1  # Large charts label only this series (area needed), plus % of GDP
+SCENARIO_LINESTYLES = ["-", "-.", ":", (0, (5, 1)), (0, (3, 1, 1, 1, 1, 1))]  # One per growth scenario, cycled
+
+
+def bar_label(value, unit):
+    """Value label drawn under a bar, with explicit units"""
+    prefix = "$" if unit == "$/yr" else ""
+    return f"{prefix}{format_large_num(value)}\n{unit}"
+
+
+def bar_verts(centers, heights, width=BAR_WIDTH):
+    """(n, 4, 2) corners of bars rising from 0, for a PolyCollection"""
+    left = np.asarray(centers, dtype=float) - width / 2
+    heights = np.asarray(heights, dtype=float)
+    verts = np.zeros((len(left), 4, 2))
+    verts[:, :2, 0] = left[:, None]
+    verts[:, 2:, 0] = left[:, None] + width
+    verts[:, 1:3, 1] = heights[:, None]
+    return verts
+
+
+def decade_limits(values):
+    """Log-axis limits snapped to whole decades around the positive values"""
+    positive = values[values > 0]
+    if not positive.size:
+        return 1.0, 10.0
+    return 10.0 ** np.floor(np.log10(positive.min())), 10.0 ** np.ceil(np.log10(positive.max()))
+
+
+class BarChart:
+    """Constraint bar chart that keeps its artists between redraws
+
+    update() only rebuilds the chart when the country list changes or the
+    axes were cleared by another plot. Otherwise it sets bar heights and label
+    text in place and reports whether the static parts (limits, title) changed
+    too. With animated=True the bars and labels are left out of normal draws
+    and are blitted over a cached background by draw().
+
+    Above COLLECTION_THRESHOLD countries each series is drawn as a single
+    PolyCollection and only the countries in view get value labels (the
+    LABEL_TOP_K largest needs when more are in view). With page_size set, a
+    large chart shows that many countries at a time and set_window() scrolls
+    through them without recomputing anything.
+    """
+
+    def __init__(self, ax, animated=False, page_size=None):
+        self.ax = ax
+        self.animated = animated
+        self.page_size = page_size
+        self.countries = None
+        self.large = False  # Drawn with one collection per series
+        self.containers = []  # BarContainer, or PolyCollection when large, per series
+        self.values = []
+        self.gdp_percentage = None
+        self.x = self.offsets = None  # Country positions and per-series bar offsets
+        self.start = 0  # First country in view
+        self.labeled = np.arange(0)  # Country indices that have value labels
+        self.value_labels = []  # One list of Text per series, one Text per labeled country
+        self.gdp_labels = []
+        self.overlays = []  # Legend and watermark, kept above the bars
+        self.ylim = None
+        self.title = None
+        self.background = None
+        self._draw_cid = None
+        self._saving = False
+
+    def is_attached(self):
+        """False once something else has cleared the axes"""
+        if not self.containers:
+            return False
+        return self.containers[0] in (self.ax.collections if self.large else self.ax.containers)
+
+    def dynamic_artists(self):
+        for container in self.containers:
+            if self.large:
+                yield container
+            else:
+                yield from container.patches
+        for labels in self.value_labels:
+            yield from labels
+        yield from self.gdp_labels
+        yield from self.overlays
+
+    def update(self, countries, land_area, bamboo_area_needed_annually, planting_cost,
+               gdp_percentage, start_year, end_year, available_land, affordable_bamboo_area):
+        """Show new values; return True when a full redraw is required"""
+        values = [np.asarray(land_area, dtype=float), np.asarray(bamboo_area_needed_annually, dtype=float),
+                  np.asarray(planting_cost, dtype=float),
+                  np.asarray(available_land, dtype=float) / REFERENCE_YEARS_OFFSET,
+                  np.asarray(affordable_bamboo_area, dtype=float)]
+        title = (f"National Land vs. Bamboo Area Needed and Constraints\n"
+                 f"Offset CO2 Emissions from {start_year} to {end_year}")
+        if list(countries) != self.countries or not self.is_attached():
+            self._build(list(countries), values, gdp_percentage, title)
+            return True
+
+        # Same countries: only heights, label text and maybe limits change
+        self.values, self.gdp_percentage = values, np.asarray(gdp_percentage, dtype=float)
+        for container, series, offset in zip(self.containers, values, self.offsets):
+            if self.large:
+                container.set_verts(bar_verts(self.x + offset, series))
+            else:
+                for rect, value in zip(container.patches, series):
+                    rect.set_height(value)
+        # A large chart labels the biggest needs in view, which may now be other countries
+        full = self._place_labels()
+        ylim = decade_limits(np.concatenate(values))
+        if ylim != self.ylim:
+            self.ax.set_ylim(ylim)
+            self.ylim = ylim
+            full = True
+        if title != self.title:
+            self.ax.set_title(title, fontsize=16, pad=20, fontweight='bold')
+            self.title = title
+            full = True
+        return full
+
+    def _build(self, countries, values, gdp_percentage, title):
+        """Create every artist from scratch"""
+        ax = self.ax
+        ax.clear()
+        self.countries = countries
+        self.values, self.gdp_percentage = values, np.asarray(gdp_percentage, dtype=float)
+        self.large = len(countries) > COLLECTION_THRESHOLD
+        self.start = 0
+        self.value_labels, self.gdp_labels = [], []  # Went with ax.clear()
+        self.background = None
+
+        # Plot setup
+        set_whitegrid_style()
+        matplotlib.rcParams['mathtext.fontset'] = 'cm'
+        palette = rocket_palette(len(BAR_SERIES))
+        self.x = x = np.arange(len(countries))
+        self.offsets = (np.arange(len(BAR_SERIES)) - len(BAR_SERIES) // 2) * BAR_WIDTH
+
+        # Plot bars: one patch per bar for a few countries, one collection per series for many
+        self.containers = []
+        for (label, _), series, offset, color in zip(BAR_SERIES, values, self.offsets, palette):
+            if self.large:
+                bars = PolyCollection(bar_verts(x + offset, series), facecolors=color, alpha=0.9,
+                                      edgecolors='black', linewidths=0.3, label=label,
+                                      animated=self.animated)
+                self.containers.append(ax.add_collection(bars, autolim=False))
+            else:
+                self.containers.append(ax.bar(x + offset, series, width=BAR_WIDTH, color=color, alpha=0.9,
+                                              edgecolor='black', label=label, animated=self.animated))
+
+        # Aesthetics
+        ax.set_title(title, fontsize=16, pad=20, fontweight='bold')
+        self.title = title
+        ax.set_ylabel("Annual Area / Cost (sq mi / USD) [Log Scale]", fontsize=14, labelpad=10)
+        ax.set_yscale("log")
+        self.labeled = None
+        self._apply_window()
+        self.ylim = decade_limits(np.concatenate(values))
+        ax.set_ylim(self.ylim)
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: format_large_num(x)))
+        ax.grid(True, which="both", ls="--", alpha=0.2)
+
+        # Legend
+        legend_elements = [Patch(facecolor=color, label=label, edgecolor='black')
+                           for (label, _), color in zip(BAR_SERIES, palette)]
+        legend = ax.legend(handles=legend_elements, loc='lower right', fontsize=10)
+
+        # Watermark
+        watermark = ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
+                            ha='center', va='center', rotation=45, transform=ax.transAxes)
+
+        # Blitted artists are drawn on top, so the overlays must be redrawn after them
+        self.overlays = [legend, watermark]
+        for overlay in self.overlays:
+            overlay.set_animated(self.animated)
+
+    def paged(self):
+        return self.large and self.page_size is not None and len(self.countries) > self.page_size
+
+    def view(self):
+        """(first, stop) indices of the countries in view"""
+        if not self.paged():
+            return 0, len(self.countries or [])
+        return self.start, self.start + self.page_size
+
+    def view_text(self):
+        """Which countries a paged chart shows, e.g. "Countries 51-100 of 200" """
+        first, stop = self.view()
+        return f"Countries {first + 1}-{stop} of {len(self.countries)}" if self.paged() else ""
+
+    def set_window(self, start):
+        """Scroll a paged chart to start at country index start; return True if the view moved"""
+        if not self.paged():
+            return False
+        start = int(np.clip(start, 0, len(self.countries) - self.page_size))
+        if start == self.start:
+            return False
+        self.start = start
+        self._apply_window()
+        return True
+
+    def _apply_window(self):
+        """Set x limits, country names and value labels for the countries in view"""
+        ax = self.ax
+        first, stop = self.view()
+        if self.large:
+            # Collections do not autoscale the axes, and a page shows only part of them
+            ax.set_xlim(first - 0.5, stop - 0.5)
+        xlabel = f"Country ({first + 1}-{stop} of {len(self.countries)})" if self.paged() else "Country"
+        ax.set_xlabel(xlabel, fontsize=14, labelpad=10)
+        self.labeled = None
+        self._place_labels()
+
+    def _labeled_countries(self):
+        """Indices of the countries in view that get value labels"""
+        first, stop = self.view()
+        if not self.large or stop - first <= LABEL_TOP_K:
+            return np.arange(first, stop)
+        needed = self.values[1][first:stop]
+        top = np.argpartition(-needed, LABEL_TOP_K - 1)[:LABEL_TOP_K]
+        return np.sort(top) + first
+
+    def _place_labels(self):
+        """Update label text in place, or recreate the labels when other countries need them
+
+        Returns True when the labeled countries (and so the tick names) changed.
+        """
+        ax = self.ax
+        labeled = self._labeled_countries()
+        if self.labeled is not None and np.array_equal(labeled, self.labeled):
+            for labels, series, (_, unit) in zip(self.value_labels, self.values, BAR_SERIES):
+                for label, value in zip(labels, series[labeled]):
+                    label.set_text(bar_label(value, unit))
+            for label, gdp_pct in zip(self.gdp_labels, self.gdp_percentage[labeled]):
+                label.set_text(f"{gdp_pct:.2f}% of GDP")
+            return False
+
+        # Rotated labels hanging from the top of the axes (five per country would not fit in a large chart)
+        for label in [label for labels in self.value_labels for label in labels] + self.gdp_labels:
+            label.remove()
+        self.labeled = labeled
+        self.value_labels = [
+            [ax.text(xi + offset, 1, bar_label(value, unit), ha='center', va='top', fontsize=8,
+                     fontweight='bold', rotation=45, transform=ax.get_xaxis_transform(),
+                     animated=self.animated)
+             for xi, value in zip(labeled, series[labeled])]
+            if not self.large or k == LARGE_LABEL_SERIES else []
+            for k, (series, offset, (_, unit)) in enumerate(zip(self.values, self.offsets, BAR_SERIES))]
+        self.gdp_labels = [
+            ax.text(xi, 0.95, f"{gdp_pct:.2f}% of GDP", ha='center', va='top', fontsize=8,
+                    fontweight='bold', color='red', rotation=45, transform=ax.get_xaxis_transform(),
+                    animated=self.animated)
+            for xi, gdp_pct in zip(labeled, self.gdp_percentage[labeled])]
+
+        # Name every country in view if they fit, otherwise only the labeled ones
+        first, stop = self.view()
+        ticks = np.arange(first, stop) if stop - first <= TICK_LIMIT else labeled
+        ax.set_xticks(ticks)
+        if self.large:
+            ax.set_xticklabels([self.countries[i] for i in ticks], fontsize=8, rotation=90)
+        else:
+            ax.set_xticklabels([self.countries[i] for i in ticks], fontsize=12)
+        return True
+
+    def draw(self, canvas, full=True):
+        """Full draw, or blit only the bars and labels over the cached background"""
+        if self._draw_cid is None:
+            self._draw_cid = canvas.mpl_connect("draw_event", self._on_draw)
+        if full or not self.animated or self.background is None:
+            canvas.draw()
+            return
+        canvas.restore_region(self.background)
+        self._draw_dynamic()
+        canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        # Every full draw (including window resizes) refreshes the background
+        if self._saving:
+            return
+        if not (self.animated and self.is_attached()):
+            self.background = None
+            return
+        self.background = event.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_dynamic()
+
+    def _draw_dynamic(self):
+        for artist in self.dynamic_artists():
+            self.ax.draw_artist(artist)
+
+    @contextmanager
+    def static(self):
+        """Temporarily include the animated artists in normal draws (for savefig)"""
+        artists = list(self.dynamic_artists()) if self.animated else []
+        for artist in artists:
+            artist.set_animated(False)
+        self._saving = True
+        try:
+            yield
+        finally:
+            self._saving = False
+            for artist in artists:
+                artist.set_animated(True)
+
+
+def plot_time_series(ax, countries, emissions, start_year, end_year, series, bands=None, peaks=None,
+                     growth=ANNUAL_EMISSION_INCREASE, growth_spec=None):
+    """Draw a time series plot showing emission reduction over time under compound emission growth
+
+    peaks (emission_peaks) adds a marker where net emissions stop falling
+    and start to rebound. growth (one rate or per-country rates) and
+    growth_spec (the distribution the bands sampled growth from, if any)
+    only label the chart; the series already include them.
+    """
+    # Plot setup
+    set_whitegrid_style()
+    matplotlib.rcParams['mathtext.fontset'] = 'cm'
+    palette = rocket_palette(len(countries))
+    
+    # Emission, reduction and net matrices (years x countries) from the engine
+    years = series.years
+
+    # For each country, draw a line that shows both emissions growth and reduction
+    for i, country in enumerate(countries):
+        # Plot emissions line
+        ax.plot(years, series.net_emissions[:, i], marker='o', markersize=4, 
+                linewidth=3, color=palette[i], label=f"{country} (Net Emissions)")
+        
+        # Plot reduction line as dashed
+        ax.plot(years, series.cumulative_reduction[:, i], linestyle='--', linewidth=2, 
+                color=palette[i], alpha=0.7, label=f"{country} (Cumulative Reduction)")
+
+        # Monte Carlo P5-P95 bands around both lines
+        if bands is not None:
+            ax.fill_between(years, bands.net_emissions[0, :, i], bands.net_emissions[-1, :, i],
+                            color=palette[i], alpha=0.2, linewidth=0,
+                            label=f"{country} (P{bands.percentiles[0]:g}-P{bands.percentiles[-1]:g})")
+            ax.fill_between(years, bands.cumulative_reduction[0, :, i], bands.cumulative_reduction[-1, :, i],
+                            color=palette[i], alpha=0.1, linewidth=0)
+        
+        # Mark the equilibrium point (if any) - when emissions equal reductions
+        y_idx = series.equilibrium_index[i]
+        if y_idx >= 0:
+            eq_year = years[y_idx]
+            eq_value = series.net_emissions[y_idx, i]
+            ax.scatter([eq_year], [eq_value], s=100, color=palette[i], 
+                      edgecolor='black', zorder=10, marker='*')
+            ax.annotate(f"Equilibrium\n{eq_year}", 
+                       xy=(eq_year, eq_value),
+                       xytext=(10, 10),
+                       textcoords='offset points',
+                       fontsize=10,
+                       fontweight='bold',
+                       color=palette[i],
+                       arrowprops=dict(arrowstyle="->", color=palette[i]))
+
+        # Rebound point from the closed-form solver (none once equilibrium came first)
+        if peaks is not None and peaks.trough_emissions[i] > 0:
+            trough_year = int(peaks.trough_years[i])
+            ax.scatter([trough_year], [peaks.trough_emissions[i]], s=70, color=palette[i],
+                       edgecolor='black', zorder=10, marker='v')
+            ax.annotate(f"Rebound\n{trough_year}",
+                       xy=(trough_year, peaks.trough_emissions[i]),
+                       xytext=(10, -25),
+                       textcoords='offset points',
+                       fontsize=10,
+                       fontweight='bold',
+                       color=palette[i],
+                       arrowprops=dict(arrowstyle="->", color=palette[i]))
+    
+    # Aesthetics
+    ax.set_title(f"CO2 Emissions vs. Reduction Over Time ({start_year}-{end_year})\n"
+                 f"Emission Growth: {growth_text(growth)}",
+                 fontsize=16, pad=20, fontweight='bold')
+    ax.set_xlabel("Year", fontsize=14, labelpad=10)
+    ax.set_ylabel("CO2 (tons/year)", fontsize=14, labelpad=10)
+    ax.set_yscale("log")  # Log scale for better visualization
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: format_large_num(x)))
+    ax.grid(True, which="both", ls="--", alpha=0.2)
+    
+    # Add annotations for starting points
+    for i, (country, emission) in enumerate(zip(countries, emissions)):
+        # Annotate starting point
+        ax.annotate(f"{country}: {format_large_num(emission)} tons",
+                   xy=(start_year, emission),
+                   xytext=(5, 5),
+                   textcoords='offset points',
+                   fontsize=10,
+                   fontweight='bold',
+                   color=palette[i])
+    
+    # Legend with smaller font and better position
+    ax.legend(loc='upper right', fontsize=9, ncol=2)
+
+    # Which growth the bands sampled, when they sampled it
+    band_note = sampled_growth_text(growth_spec, growth) if bands is not None else ""
+    if band_note:
+        ax.text(0.01, 0.01, band_note, fontsize=9, color='dimgray', ha='left', va='bottom',
+                transform=ax.transAxes)
+    
+    # Watermark
+    ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
+            ha='center', va='center', rotation=45, transform=ax.transAxes)
+
+
+def plot_growth_scenarios(ax, countries, emissions, start_year, end_year, scenarios):
+    """Draw net emissions under every growth scenario against the shared reduction lines
+
+    Countries keep their palette color and each scenario gets a line style,
+    so one pass shows every scenario. One plot call per scenario draws all
+    countries' columns at once.
+    """
+    set_whitegrid_style()
+    palette = rocket_palette(len(countries))
+    years = scenarios.years
+
+    # Reduction does not depend on emission growth: one dashed line per country
+    ax.set_prop_cycle(color=palette)
+    ax.plot(years, scenarios.cumulative_reduction, linestyle="--", linewidth=1.5, alpha=0.5)
+    for s, name in enumerate(scenarios.names):
+        ax.set_prop_cycle(color=palette)
+        ax.plot(years, scenarios.net_emissions[s], linewidth=2.5,
+                linestyle=SCENARIO_LINESTYLES[s % len(SCENARIO_LINESTYLES)])
+
+        # Equilibrium stars for every country that gets there in this scenario
+        reached = np.flatnonzero(scenarios.equilibrium_index[s] >= 0)
+        rows = scenarios.equilibrium_index[s, reached]
+        ax.scatter(years[rows], scenarios.net_emissions[s, rows, reached], s=80,
+                   c=[palette[i] for i in reached], edgecolor="black", zorder=10, marker="*")
+
+    ax.set_title(f"Net CO2 Emissions Under {len(scenarios.names)} Growth Scenarios ({start_year}-{end_year})",
+                 fontsize=16, pad=20, fontweight="bold")
+    ax.set_xlabel("Year", fontsize=14, labelpad=10)
+    ax.set_ylabel("CO2 (tons/year)", fontsize=14, labelpad=10)
+    ax.set_yscale("log")
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: format_large_num(x)))
+    ax.grid(True, which="both", ls="--", alpha=0.2)
+
+    # Legend: colors name countries, line styles name scenarios
+    handles = [Line2D([], [], color=palette[i], linewidth=3, label=country) for i, country in enumerate(countries)]
+    handles += [Line2D([], [], color="black", linewidth=2, label=name,
+                       linestyle=SCENARIO_LINESTYLES[s % len(SCENARIO_LINESTYLES)])
+                for s, name in enumerate(scenarios.names)]
+    handles.append(Line2D([], [], color="gray", linestyle="--", alpha=0.5, label="Cumulative Reduction"))
+    ax.legend(handles=handles[-len(scenarios.names) - 1:] if len(countries) > TICK_LIMIT else handles,
+              loc="upper right", fontsize=9, ncol=2)
+
+    # Watermark
+    ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
+            ha='center', va='center', rotation=45, transform=ax.transAxes)
+
+
+def plot_constraint_sweep(ax, countries, sweep, percent_land_available, gdp_percent_available, country=None):
+    """Draw an equilibrium-year heatmap over every land % / GDP % slider setting
+
+    country is a row index into countries; None shows the slowest of the
+    countries that reach equilibrium in each cell (see sweep_heatmap) and
+    outlines where all of them do. Returns the colorbar so the caller can
+    remove it on redraw.
+    """
+    years, land_bound, reaching = sweep_heatmap(sweep, country)
+    title_name = (countries[country] if country is not None
+                  else "All Countries (Slowest That Reach Equilibrium)")
+
+    cmap = rocket_cmap(reverse=True).copy()
+    cmap.set_bad("lightgray")
+    extent = (sweep.gdp_percents[0], sweep.gdp_percents[-1],
+              sweep.land_percents[0], sweep.land_percents[-1])
+    image = ax.imshow(np.ma.masked_invalid(years), origin="lower", aspect="auto",
+                      extent=extent, cmap=cmap, interpolation="nearest")
+    colorbar = ax.figure.colorbar(image, ax=ax, pad=0.02)
+    colorbar.set_label("Equilibrium Year", fontsize=12)
+
+    # Hatch the cells where land (not budget) is the binding constraint
+    gdp_grid, land_grid = np.meshgrid(sweep.gdp_percents, sweep.land_percents)
+    if land_bound.any() and not land_bound.all():
+        ax.contour(gdp_grid, land_grid, land_bound.astype(float), levels=[0.5],
+                   colors="black", linewidths=1.5)
+    if land_bound.any():
+        ax.contourf(gdp_grid, land_grid, land_bound.astype(float), levels=[0.5, 1.5],
+                    colors="none", hatches=["//"])
+
+    # Outline the cells where every country reaches equilibrium
+    everyone = reaching == len(sweep.land_bound)
+    if country is None and everyone.any() and not everyone.all():
+        ax.contour(gdp_grid, land_grid, everyone.astype(float), levels=[0.5],
+                   colors="white", linewidths=2, linestyles="dashed")
+
+    # Current slider setting
+    ax.scatter([gdp_percent_available], [percent_land_available], s=160, marker='*',
+               color='white', edgecolor='black', zorder=10)
+
+    # Aesthetics
+    ax.set_title(f"Equilibrium Year by Available Land and GDP Share\n{title_name}",
+                 fontsize=16, pad=20, fontweight='bold')
+    ax.set_xlabel("Available GDP (%)", fontsize=14, labelpad=10)
+    ax.set_ylabel("Available Land (% of total)", fontsize=14, labelpad=10)
+    legend_elements = [
+        Patch(facecolor='white', edgecolor='black', hatch='//', label='Land is the binding constraint'),
+        Patch(facecolor='white', edgecolor='black', label='Budget is the binding constraint'),
+        Patch(facecolor='lightgray', edgecolor='black',
+              label=f'Beyond {BASE_YEAR + EQUILIBRIUM_HORIZON}'),
+    ]
+    if country is None:
+        legend_elements.append(Line2D([0], [0], color='gray', linestyle='dashed', linewidth=2,
+                                      label='Edge of the cells where every country reaches it'))
+    ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
+
+    # Watermark
+    ax.text(0.1, 0.7, 'BHCC 2025', fontsize=20, color='gray', alpha=0.5,
+            ha='center', va='center', rotation=45, transform=ax.transAxes)
+    return colorbar
@@ -0,0 +1,152 @@
+"""Country dataset loading for the Bamboo CO2 offset engine.
+
+Reads CSV or JSON country tables (name, land sq mi, emissions, GDP and an
+optional growth rate) straight into typed NumPy columns. Each parsed table is
+cached in a binary .npz sidecar next to the source file, keyed by the file's
+SHA-256, so reloading an unchanged dataset skips parsing entirely.
+"""
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from collections import namedtuple
+
+import numpy as np
+
+from bamboo_engine import ANNUAL_EMISSION_INCREASE
+
+CountryTable = namedtuple("CountryTable", [
+    "countries",  # (countries,) str
+    "land_area",  # (countries,) sq mi
+    "emissions",  # (countries,) tons CO2/yr
+    "gdp",        # (countries,) USD
+    "growth",     # (countries,) annual emission growth rate
+])
+
+# Accepted header names for each column (matched case-insensitively)
+COLUMN_ALIASES = {
+    "countries": ("name", "country", "countries"),
+    "land_area": ("land_area", "land", "land_sq_mi", "land_area_sq_mi"),
+    "emissions": ("emissions", "co2", "co2_emissions", "emissions_tons"),
+    "gdp": ("gdp", "gdp_usd"),
+    "growth": ("growth", "emission_growth", "annual_emission_increase"),
+}
+
+CACHE_SUFFIX = ".npz"
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _match_columns(names):
+    """Map each CountryTable field to its position in the header"""
+    lookup = {name.strip().lower(): i for i, name in enumerate(names)}
+    positions = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        found = [lookup[alias] for alias in aliases if alias in lookup]
+        if found:
+            positions[field] = found[0]
+        elif field != "growth":
+            raise ValueError(f"Missing column for {field}: expected one of {', '.join(aliases)}")
+    return positions
+
+
+def _to_table(columns):
+    """Build a CountryTable from a dict of raw column sequences"""
+    growth = columns.get("growth")
+    if growth is None:
+        growth = np.full(len(columns["countries"]), ANNUAL_EMISSION_INCREASE)
+    else:
+        # Blank growth cells fall back to the default rate
+        growth = np.array([ANNUAL_EMISSION_INCREASE if value in ("", None) else value
+                           for value in growth], dtype=float)
+    table = CountryTable(
+        countries=np.array(columns["countries"], dtype=str),
+        land_area=np.array(columns["land_area"], dtype=float),
+        emissions=np.array(columns["emissions"], dtype=float),
+        gdp=np.array(columns["gdp"], dtype=float),
+        growth=growth,
+    )
+    if not (len(table.countries) == len(table.land_area) == len(table.emissions) == len(table.gdp)):
+        raise ValueError("All columns must have the same length.")
+    return table
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        positions = _match_columns(header)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"{path}, line {reader.line_num}: expected {len(header)} fields, "
+                                 f"found {len(row)}")
+            rows.append(row)
+    if not rows:
+        raise ValueError(f"No country rows in {path}")
+    # Transpose once, then let NumPy convert each column in a single call
+    raw = list(zip(*rows))
+    return _to_table({field: [value.strip() for value in raw[i]] for field, i in positions.items()})
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        # Column layout: {"name": [...], "land_area": [...], ...}
+        positions = _match_columns(list(data))
+        keys = list(data)
+        return _to_table({field: data[keys[i]] for field, i in positions.items()})
+    # Record layout: [{"name": ..., "land_area": ...}, ...]
+    if not data:
+        raise ValueError(f"No country rows in {path}")
+    keys = list(data[0])
+    positions = _match_columns(keys)
+    return _to_table({field: [record.get(keys[i]) for record in data] for field, i in positions.items()})
+
+
+def load_countries(path, cache=True):
+    """Load a CSV or JSON country table, using the .npz sidecar when it is current"""
+    digest = file_hash(path)
+    cache_path = path + CACHE_SUFFIX
+    if cache and os.path.exists(cache_path):
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if str(cached["source_hash"]) == digest:
+                    return CountryTable(*(cached[field] for field in CountryTable._fields))
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass  # Unreadable or stale sidecar: reparse below
+
+    if path.lower().endswith(".json"):
+        table = _read_json(path)
+    else:
+        table = _read_csv(path)
+
+    if cache:
+        # Written under a temporary name and renamed, so that other processes
+        # loading the same file never see a half-written sidecar
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(cache_path)))
+        except OSError:
+            return table  # Read-only location: still return the parsed table
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, source_hash=np.array(digest), **table._asdict())
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return table
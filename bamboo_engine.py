@@ -0,0 +1,791 @@
+"""Headless Bamboo CO2 offset engine.
+
+Pure NumPy versions of the calculations behind BambooCO2OffsetCalculator.py.
+Nothing in this module imports tkinter, matplotlib or seaborn, so batch jobs
+can call it directly without creating a window or touching a display.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Constants
+REFERENCE_YEARS_OFFSET = 75  # Fixed constant for reference period (2025-2099)
+ANNUAL_EMISSION_INCREASE = 0.01  # 1% annual increase in emissions
+BASE_YEAR = 2025  # Year the equilibrium search starts from
+EQUILIBRIUM_HORIZON = 200  # Years searched before giving up on equilibrium
+MATURITY_YEARS = 5  # Age at which a bamboo stand reaches the full sequestration rate (cohort model)
+FFT_MIN_YEARS = 64  # Longer schedules are convolved with an FFT instead of one age at a time
+
+# Sequestration rate: 25 tons CO2 per acre per year (converted to square miles)
+SEQUESTRATION_RATE = 16000  # tons CO2/sq mi/yr
+
+# Cost to plant bamboo (USD per square mile)
+COST_PLANTING_BAMBOO = 768000  # USD per square mile
+
+# Default constraints (same as the GUI sliders)
+DEFAULT_PERCENT_LAND = 10.0  # Default percent of land available (%)
+DEFAULT_GDP_PERCENTAGE = 0.3  # Default percent of GDP available (%)
+
+# Slider domains as (from, to, resolution)
+LAND_PERCENT_RANGE = (0.1, 30.0, 0.1)  # % of total land
+GDP_PERCENT_RANGE = (0.01, 5.0, 0.01)  # % of GDP
+
+# Named emission growth scenarios (low/medium/high from demo/jamaicadata.py)
+GROWTH_SCENARIOS = {
+    "Low Growth (0.1%)": 0.001,
+    "Medium Growth (0.5%)": 0.005,
+    "High Growth (1.2%)": 0.012,
+}
+
+OffsetResult = namedtuple("OffsetResult", [
+    "bamboo_area_needed",            # sq mi needed to offset one year of emissions
+    "bamboo_area_needed_annually",   # sq mi/yr over the reference period
+    "percent_land",                  # % of national land needed
+    "planting_cost",                 # USD/yr
+    "gdp_percentage",                # % of GDP needed per year
+    "available_land",                # sq mi allowed by the land constraint
+    "affordable_cost",               # USD/yr allowed by the GDP constraint
+    "affordable_bamboo_area",        # sq mi/yr allowed by the GDP constraint
+    "land_constrained_reduction",    # tons CO2 over the reference period
+    "budget_constrained_reduction",  # tons CO2 over the reference period
+    "actual_reduction_rates",        # tons CO2/yr added each year
+    "land_bound",                    # True where land (not budget) is binding
+    "equilibrium_years",             # year production = consumption (NaN if never)
+])
+
+TimeSeries = namedtuple("TimeSeries", [
+    "years",                 # (years,) calendar years
+    "emissions",             # (years, countries) emissions with compound growth
+    "cumulative_reduction",  # (years, countries) reduction reached each year
+    "net_emissions",         # (years, countries) max(0, emissions - reduction)
+    "equilibrium_index",     # (countries,) row of the first crossing, -1 if none
+])
+
+SweepResult = namedtuple("SweepResult", [
+    "land_percents",      # (land,) swept % of land available
+    "gdp_percents",       # (gdp,) swept % of GDP available
+    "equilibrium_years",  # (countries, land, gdp) equilibrium year, NaN if never
+    "land_bound",         # (countries, land, gdp) True where land is binding
+])
+
+MonteCarloResult = namedtuple("MonteCarloResult", [
+    "percentiles",           # (bands,) e.g. (5, 50, 95)
+    "years",                 # (years,) calendar years
+    "equilibrium_years",     # (bands, countries) equilibrium year, NaN if never
+    "net_emissions",         # (bands, years, countries)
+    "cumulative_reduction",  # (bands, years, countries)
+    "n_samples",
+])
+
+EmissionPeaks = namedtuple("EmissionPeaks", [
+    "falls",             # True where net emissions fall from the base year on (False: they only rise)
+    "trough_years",      # year net emissions stop falling and start to rebound, NaN if they do not
+    "trough_emissions",  # net emissions in the trough year (0 if equilibrium came first), NaN if no rebound
+])
+
+ScenarioSeries = namedtuple("ScenarioSeries", [
+    "names",                 # (scenarios,) scenario names
+    "growth_rates",          # (scenarios, countries) annual emission growth
+    "years",                 # (years,) calendar years
+    "emissions",             # (scenarios, years, countries) emissions with compound growth
+    "cumulative_reduction",  # (years, countries) reduction reached each year (same for every scenario)
+    "net_emissions",         # (scenarios, years, countries) max(0, emissions - reduction)
+    "equilibrium_index",     # (scenarios, countries) row of the first crossing, -1 if none
+    "equilibrium_years",     # (scenarios, countries) year production = consumption (NaN if never)
+])
+
+BudgetPlan = namedtuple("BudgetPlan", [
+    "budget",                # (years, countries) USD/yr available for planting
+    "planted_area",          # (years, countries) sq mi planted each year
+    "reduction_rates",       # (years, countries) tons CO2/yr added by each year's planting
+    "cumulative_reduction",  # (years, countries) tons CO2/yr removed after each year
+    "land_bound",            # (years, countries) True where land (not budget) is binding
+    "equilibrium_years",     # (countries,) year production = consumption (NaN if never)
+])
+
+
+def age_kernel(n_ages, maturity_years=MATURITY_YEARS):
+    """Fraction of the full sequestration rate reached by a stand of each age
+
+    Stands planted this year (age 0) ramp up along a smoothstep curve and
+    sequester at the full rate from maturity_years on. maturity_years=0 gives
+    all ones, the original model where planting counts in full immediately.
+    """
+    ages = np.arange(n_ages)
+    if maturity_years <= 0:
+        return np.ones(n_ages)
+    x = np.clip((ages + 0.5) / maturity_years, 0.0, 1.0)  # Middle of each year of age
+    return x * x * (3 - 2 * x)
+
+
+def cumulative_kernel(kernel, n_years):
+    """Uptake after 1..n_years years of constant planting, per unit of annual planting
+
+    For kernel=None (full rate immediately) this is 1, 2, ..., n_years. A kernel
+    shorter than n_years is extended with its last value.
+    """
+    if kernel is None:
+        return np.arange(1, n_years + 1, dtype=float)
+    kernel = np.asarray(kernel, dtype=float)[:n_years]
+    cumulative = np.cumsum(kernel)
+    if len(cumulative) < n_years:
+        extra = np.arange(1, n_years - len(cumulative) + 1)
+        cumulative = np.concatenate([cumulative, cumulative[-1] + kernel[-1] * extra])
+    return cumulative
+
+
+def convolve_years(schedule, kernel, fft_min_years=FFT_MIN_YEARS):
+    """Causal convolution over the leading (year) axis, cut to the schedule's length
+
+    out[t] = sum over a <= t of schedule[t - a] * kernel[a], for a (years, ...)
+    schedule and an (ages,) or (ages, ...) kernel broadcast against its other
+    axes. As in cumulative_kernel, a kernel shorter than the schedule is
+    extended with its last value. Short horizons add one shifted copy per age;
+    long ones multiply real FFTs, so multi-century runs cost O(years log years)
+    per country.
+    """
+    schedule = np.asarray(schedule, dtype=float)
+    kernel = np.asarray(kernel, dtype=float)
+    n = schedule.shape[0]
+    kernel = kernel[:n].reshape((-1,) + kernel.shape[1:] + (1,) * (schedule.ndim - kernel.ndim))
+    if len(kernel) < n:
+        kernel = np.concatenate([kernel, np.repeat(kernel[-1:], n - len(kernel), axis=0)])
+    if n < fft_min_years:
+        out = np.zeros(np.broadcast_shapes(schedule.shape, (n,) + kernel.shape[1:]))
+        for age in range(len(kernel)):
+            out[age:] += schedule[:n - age] * kernel[age]
+        return out
+    size = 1 << (n + len(kernel) - 2).bit_length()  # No wrap-around into the first n years
+    spectrum = np.fft.rfft(schedule, size, axis=0) * np.fft.rfft(kernel, size, axis=0)
+    return np.fft.irfft(spectrum, size, axis=0)[:n]
+
+
+def cohort_equilibrium_years(emissions, reduction_rates, kernel,
+                             annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                             base_year=BASE_YEAR, horizon=EQUILIBRIUM_HORIZON,
+                             chunk_elements=4_000_000):
+    """Discrete equilibrium years when each year's planting follows an age kernel
+
+    Same definition as equilibrium_years (first whole year t >= 1 where
+    emissions <= cumulative reduction), but the reduction after t years is
+    reduction_rate * cumulative_kernel(kernel)[t - 1] rather than reduction_rate
+    * t. The crossing is found on the yearly grid, a block of elements at a time.
+    """
+    emissions, reduction_rates, growth = np.broadcast_arrays(
+        np.asarray(emissions, dtype=float),
+        np.asarray(reduction_rates, dtype=float),
+        np.asarray(annual_emission_increase, dtype=float))
+    shape = emissions.shape
+    E, R, log_growth = emissions.ravel(), reduction_rates.ravel(), np.log1p(growth.ravel())
+    t = np.arange(1, horizon + 1)
+    capacity = cumulative_kernel(kernel, horizon)
+
+    years = np.full(E.size, np.nan)
+    block = max(1, chunk_elements // horizon)
+    for i0 in range(0, E.size, block):
+        i = slice(i0, i0 + block)
+        with np.errstate(over="ignore", invalid="ignore"):
+            hit = E[i, None] * np.exp(log_growth[i, None] * t) <= R[i, None] * capacity
+        years[i] = np.where(hit.any(axis=1), base_year + t[hit.argmax(axis=1)], np.nan)
+    return years.reshape(shape)
+
+
+def schedule_equilibrium_years(emissions, reduction_schedule,
+                               annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                               base_year=BASE_YEAR, kernel=None):
+    """Discrete equilibrium years for a (years, countries) planting schedule
+
+    Same definition as equilibrium_years (first whole year t >= 1 where
+    emissions <= cumulative reduction), with the cumulative reduction after t
+    years being the running sum (or kernel convolution) of the first t rows.
+    The schedule's length is the horizon. Growth rates shaped (scenarios, 1,
+    countries) give (scenarios, countries) years.
+    """
+    schedule = np.asarray(reduction_schedule, dtype=float)
+    cumulative = convolve_years(schedule, kernel) if kernel is not None else np.cumsum(schedule, axis=0)
+    t = np.arange(1, len(schedule) + 1).reshape((-1,) + (1,) * (schedule.ndim - 1))
+    with np.errstate(over="ignore", invalid="ignore"):
+        hit = np.asarray(emissions, dtype=float) * np.power(
+            1 + np.asarray(annual_emission_increase, dtype=float), t) <= cumulative
+    axis = -schedule.ndim  # The year axis, counted from the end so leading scenario axes pass through
+    return np.where(hit.any(axis=axis), base_year + 1 + hit.argmax(axis=axis), np.nan)
+
+
+def equilibrium_years(emissions, reduction_rates,
+                      annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                      base_year=BASE_YEAR, horizon=EQUILIBRIUM_HORIZON,
+                      discrete=True, tol=1e-9, max_iter=60, kernel=None):
+    """Find the year CO2 production equals consumption for whole arrays at once
+
+    Solves initial_emission * (1 + g)^t = reduction_rate * t for every element
+    of the broadcast inputs. With discrete=True the result matches the old
+    year-stepping loop (first whole year t >= 1 where emissions <= cumulative
+    reduction); otherwise the fractional crossing year is returned. Elements
+    that never reach equilibrium within the horizon are NaN. An age kernel
+    switches to the cohort model (see cohort_equilibrium_years), which is
+    always discrete.
+    """
+    if kernel is not None:
+        return cohort_equilibrium_years(emissions, reduction_rates, kernel, annual_emission_increase,
+                                        base_year, horizon)
+    emissions, reduction_rates, growth = np.broadcast_arrays(
+        np.asarray(emissions, dtype=float),
+        np.asarray(reduction_rates, dtype=float),
+        np.asarray(annual_emission_increase, dtype=float))
+    shape = emissions.shape
+    E = emissions.ravel()
+    R = reduction_rates.ravel()
+    log_growth = np.log1p(growth.ravel())
+
+    def gap(t):
+        # f(t) = emissions(t) - cumulative reduction(t); convex in t
+        return E * np.exp(log_growth * t) - R * t
+
+    # Analytic bracket: f(0) = E > 0 and f is convex, so the first crossing lies
+    # before the minimum of f. With g <= 0 f only decreases, so use the horizon.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_min = np.log(R / (E * log_growth)) / log_growth
+    grows = (log_growth > 0) & (R > 0) & (E > 0)
+    hi = np.where(grows, np.clip(np.nan_to_num(t_min, nan=0.0), 0, horizon), float(horizon))
+    lo = np.zeros_like(hi)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        reached = (E <= 0) | ((R > 0) & (gap(hi) <= 0))
+    crossing = np.zeros_like(hi)
+
+    # Safeguarded Newton on the still-unconverged elements only. Starting from
+    # the left on a convex decreasing function Newton never overshoots, and the
+    # bisection fallback keeps rounding from escaping the bracket.
+    active = np.flatnonzero(reached & (E > 0))
+    t = lo[active]
+    lo_a, hi_a = lo[active], hi[active]
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        growth_t = np.exp(log_growth[active] * t)
+        f_t = E[active] * growth_t - R[active] * t
+        df_t = E[active] * log_growth[active] * growth_t - R[active]
+        lo_a = np.where(f_t > 0, t, lo_a)
+        hi_a = np.where(f_t > 0, hi_a, t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_next = t - f_t / df_t
+        outside = ~((t_next >= lo_a) & (t_next <= hi_a))
+        t_next = np.where(outside, 0.5 * (lo_a + hi_a), t_next)
+
+        done = (np.abs(t_next - t) <= tol) | (hi_a - lo_a <= tol)
+        crossing[active[done]] = t_next[done]
+        keep = ~done
+        active, t, lo_a, hi_a = active[keep], t_next[keep], lo_a[keep], hi_a[keep]
+    crossing[active] = t
+
+    if discrete:
+        # First whole year inside the crossing interval, never before year 1
+        year = np.maximum(1.0, np.ceil(crossing - tol))
+        with np.errstate(over="ignore", invalid="ignore"):
+            year = np.where(gap(year) > 0, year + 1, year)
+            reached &= (gap(year) <= 0) | (E <= 0)
+        crossing = year
+    reached &= crossing <= horizon
+
+    return np.where(reached, base_year + crossing, np.nan).reshape(shape)
+
+
+def constrained_reduction_rates(land_area, gdp, percent_land_available, gdp_percent_available,
+                                sequestration_rate=SEQUESTRATION_RATE,
+                                cost_planting_bamboo=COST_PLANTING_BAMBOO, available_land=None):
+    """Annual reduction rate allowed by the tighter of the land and budget constraints"""
+    if available_land is None:
+        available_land = land_area * (percent_land_available / 100)
+    land_reduction = available_land * sequestration_rate / REFERENCE_YEARS_OFFSET
+    budget_reduction = gdp * (gdp_percent_available / 100) / cost_planting_bamboo * sequestration_rate
+    return np.minimum(land_reduction, budget_reduction)
+
+
+def gdp_path(gdp, n_years, gdp_growth=0.0):
+    """(years, countries) GDP from year 0 on
+
+    gdp_growth is a yearly rate (one value or one per country) compounded in a
+    single broadcast, or a (years, countries) matrix of rates that vary by year.
+    """
+    gdp = np.asarray(gdp, dtype=float)
+    growth = np.asarray(gdp_growth, dtype=float)
+    if growth.ndim == 2:
+        if len(growth) != n_years:
+            raise ValueError("A GDP growth path must have one row per year.")
+        # Year 0 is the given GDP; each later year applies the previous year's rate
+        factors = np.cumprod(np.concatenate([np.ones((1,) + growth.shape[1:]), 1 + growth[:-1]]), axis=0)
+        return factors * gdp
+    return np.power(1 + growth, np.arange(n_years)[:, None]) * gdp
+
+
+def ramp_profile(n_years, ramp_years=0, start_share=0.0):
+    """(years,) share of the full budget spent each year, rising linearly over ramp_years
+
+    ramp_years=0 spends the full budget from the first year.
+    """
+    if ramp_years <= 0:
+        return np.ones(n_years)
+    reached = np.minimum(1.0, np.arange(1, n_years + 1) / ramp_years)
+    return start_share + (1 - start_share) * reached
+
+
+def budget_schedule(gdp, gdp_percent_available, n_years, gdp_growth=0.0, ramp_years=0,
+                    start_share=0.0, budget_cap=None):
+    """(years, countries) planting budget in USD/yr
+
+    The GDP share is taken from a growing GDP (gdp_path) and scaled by a
+    ramp-up profile (ramp_profile). budget_cap, if given, is a per-year
+    ceiling in USD/yr: one value, one per country, one per year (as a column)
+    or a full (years, countries) matrix.
+    """
+    budget = gdp_path(gdp, n_years, gdp_growth) * (gdp_percent_available / 100)
+    budget *= ramp_profile(n_years, ramp_years, start_share)[:, None]
+    if budget_cap is not None:
+        budget = np.minimum(budget, budget_cap)
+    return budget
+
+
+def plan_budget(land_area, emissions, budget,
+                percent_land_available=DEFAULT_PERCENT_LAND,
+                sequestration_rate=SEQUESTRATION_RATE,
+                cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                base_year=BASE_YEAR, kernel=None, available_land=None):
+    """Planting, reduction and equilibrium for a (years, countries) budget schedule
+
+    Each year plants what that year's budget buys, up to the same annual land
+    cap as compute_offsets, so a constant budget reproduces its reduction
+    rates. The budget's length is the horizon for the equilibrium search.
+    """
+    if available_land is None:
+        available_land = np.asarray(land_area, dtype=float) * (percent_land_available / 100)
+    budget = np.asarray(budget, dtype=float)
+    land_cap = np.asarray(available_land, dtype=float) / REFERENCE_YEARS_OFFSET
+    affordable = budget / cost_planting_bamboo
+    planted = np.minimum(land_cap, affordable)
+    reduction = planted * sequestration_rate
+    cumulative = convolve_years(reduction, kernel) if kernel is not None else np.cumsum(reduction, axis=0)
+    eq = schedule_equilibrium_years(emissions, reduction, annual_emission_increase, base_year, kernel)
+    return BudgetPlan(budget, planted, reduction, cumulative, land_cap < affordable, eq)
+
+
+def plan_offsets(result, plan, n_years=None, sequestration_rate=SEQUESTRATION_RATE,
+                 cost_planting_bamboo=COST_PLANTING_BAMBOO):
+    """OffsetResult with the budget-dependent fields taken from a plan
+
+    Affordable cost and area, the binding constraint and the reduction rate
+    become means over the plan's first n_years, and the equilibrium years
+    are the plan's. One row then describes the schedule throughout, not the
+    constant budget next to the schedule's equilibrium. The requirement
+    fields (area needed, cost, land % and GDP %) do not depend on the budget.
+    """
+    window = slice(None, n_years)
+    affordable_cost = plan.budget[window].mean(axis=0)
+    affordable_bamboo_area = affordable_cost / cost_planting_bamboo
+    return result._replace(
+        affordable_cost=affordable_cost,
+        affordable_bamboo_area=affordable_bamboo_area,
+        budget_constrained_reduction=affordable_bamboo_area * sequestration_rate * REFERENCE_YEARS_OFFSET,
+        actual_reduction_rates=plan.reduction_rates[window].mean(axis=0),
+        land_bound=result.available_land / REFERENCE_YEARS_OFFSET < affordable_bamboo_area,
+        equilibrium_years=plan.equilibrium_years,
+    )
+
+
+def time_series(emissions, reduction_rates, start_year, end_year,
+                annual_emission_increase=ANNUAL_EMISSION_INCREASE, projected_emissions=None,
+                kernel=None):
+    """Build the years x countries emission and reduction matrices in one broadcast
+
+    projected_emissions, if given, is a (years, countries) emission path (for
+    example a slice of a bamboo_panel archive) used instead of compound growth.
+    reduction_rates is the reduction added each year, either one rate per
+    country or a (years, countries) planting schedule. With an age kernel
+    (see age_kernel) each year's planting ramps up with stand age, and the
+    reduction is the convolution of the schedule with the kernel.
+    annual_emission_increase may carry leading scenario axes, e.g.
+    (scenarios, 1, countries), for (scenarios, years, countries) emissions.
+    """
+    emissions = np.asarray(emissions, dtype=float)
+    reduction_rates = np.asarray(reduction_rates, dtype=float)
+    years = np.arange(start_year, end_year + 1)
+    years_passed = (years - start_year)[:, None]
+    schedule = reduction_rates.ndim == 2
+
+    # Growth-factor column times emissions row; reduction grows by one rate per year
+    if projected_emissions is None:
+        grown = np.power(1 + np.asarray(annual_emission_increase, dtype=float), years_passed) * emissions
+    else:
+        grown = np.asarray(projected_emissions, dtype=float)
+        if grown.shape != (len(years),) + reduction_rates.shape[schedule:]:
+            raise ValueError("Projected emissions must be shaped (years, countries).")
+    if schedule:
+        if len(reduction_rates) != len(years):
+            raise ValueError("A reduction schedule must have one row per year.")
+        cumulative_reduction = (convolve_years(reduction_rates, kernel) if kernel is not None
+                                else np.cumsum(reduction_rates, axis=0))
+    else:
+        # Constant planting: the convolution reduces to the kernel's running sum
+        cumulative_reduction = cumulative_kernel(kernel, len(years))[:, None] * reduction_rates
+    net_emissions = np.maximum(0, grown - cumulative_reduction)
+
+    # First year (after the start) where net emissions drop to the reduction line
+    crossed = net_emissions <= cumulative_reduction
+    crossed[..., 0, :] = False
+    equilibrium_index = np.where(crossed.any(axis=-2), crossed.argmax(axis=-2), -1)
+
+    return TimeSeries(years, grown, cumulative_reduction, net_emissions, equilibrium_index)
+
+
+def emission_peaks(emissions, reduction_rates, annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                   base_year=BASE_YEAR, horizon=EQUILIBRIUM_HORIZON):
+    """Closed-form peak and rebound of the net emission path, for whole arrays at once
+
+    Net emissions k years after base_year (a time_series row) are
+    E * (1 + g)^k - R * (k + 1), so they change by E * g * (1 + g)^k - R from
+    one year to the next. With g <= 0 that step is negative whenever anything
+    is planted or emissions shrink: net emissions fall from the base year on
+    and never rebound. With g > 0 the step grows every year, so net
+    emissions fall until the first year with E * g * (1 + g)^k >= R,
+
+        k = ceil(log(R / (E * g)) / log(1 + g)),
+
+    and rise after it. If that is year 0 they never fall. Rebounds after
+    the horizon are NaN.
+    """
+    emissions, reduction_rates, growth = np.broadcast_arrays(
+        np.asarray(emissions, dtype=float),
+        np.asarray(reduction_rates, dtype=float),
+        np.asarray(annual_emission_increase, dtype=float))
+    E, R, g = emissions, reduction_rates, growth
+    grows = (g > 0) & (E > 0)
+
+    def step(k):
+        with np.errstate(over="ignore", invalid="ignore"):
+            return E * g * np.power(1 + g, k) - R
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.ceil(np.log(R / (E * g)) / np.log1p(g))
+    k = np.clip(np.nan_to_num(k, nan=0.0, posinf=horizon + 1.0, neginf=0.0), 0, horizon + 1)
+    # Rounding can put the closed form one year off; the step decides
+    k = np.where(grows & (step(k) < 0), k + 1, k)
+    k = np.where(grows & (k > 0) & (step(k - 1) >= 0), k - 1, k)
+
+    falls = (E > 0) & np.where(g > 0, k > 0, (R > 0) | (g < 0))
+    rebounds = grows & falls & (k <= horizon)
+    with np.errstate(over="ignore", invalid="ignore"):
+        trough = np.maximum(0, E * np.power(1 + g, k) - R * (k + 1))
+    return EmissionPeaks(
+        falls=falls,
+        trough_years=np.where(rebounds, base_year + k, np.nan),
+        trough_emissions=np.where(rebounds, trough, np.nan),
+    )
+
+
+def growth_scenarios(emissions, reduction_rates, start_year, end_year, scenarios=GROWTH_SCENARIOS,
+                     base_year=BASE_YEAR, kernel=None):
+    """Time series and equilibrium years for every named emission growth scenario at once
+
+    scenarios maps a name to an annual growth rate (one value or one per
+    country). The (scenarios, years, countries) emission tensor is a single
+    np.power broadcast in time_series. reduction_rates is one rate per country
+    or a (years, countries) planting schedule; a schedule longer than the
+    chart extends the equilibrium search.
+    """
+    names = list(scenarios)
+    if not names:
+        raise ValueError("At least one growth scenario is needed.")
+    emissions = np.asarray(emissions, dtype=float)
+    reduction_rates = np.asarray(reduction_rates, dtype=float)
+    rates = np.stack([np.broadcast_to(np.asarray(scenarios[name], dtype=float), emissions.shape)
+                      for name in names])
+    n_years = end_year - start_year + 1
+    schedule = reduction_rates.ndim == 2
+    series = time_series(emissions, reduction_rates[:n_years] if schedule else reduction_rates,
+                         start_year, end_year, rates[:, None], kernel=kernel)
+    if schedule:
+        eq = schedule_equilibrium_years(emissions, reduction_rates, rates[:, None], base_year, kernel)
+    else:
+        eq = equilibrium_years(emissions, reduction_rates, rates, base_year, kernel=kernel)
+    return ScenarioSeries(names, rates, series.years, series.emissions, series.cumulative_reduction,
+                          series.net_emissions, series.equilibrium_index, eq)
+
+
+def compute_offsets(land_area, emissions, gdp,
+                    percent_land_available=DEFAULT_PERCENT_LAND,
+                    gdp_percent_available=DEFAULT_GDP_PERCENTAGE,
+                    sequestration_rate=SEQUESTRATION_RATE,
+                    cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                    annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                    base_year=BASE_YEAR, with_equilibrium=True, kernel=None, available_land=None):
+    """Run the offset model for arrays of countries and return an OffsetResult
+
+    with_equilibrium=False leaves equilibrium_years as None, for callers that
+    solve it separately (or not at all). kernel is an optional age kernel for
+    the cohort model (see age_kernel). available_land (sq mi per country, for
+    example summed from bamboo_raster land-suitability grids) replaces
+    land_area * percent_land_available.
+    """
+    land_area = np.asarray(land_area, dtype=float)
+    emissions = np.asarray(emissions, dtype=float)
+    gdp = np.asarray(gdp, dtype=float)
+
+    if not (land_area.shape == emissions.shape == gdp.shape):
+        raise ValueError("All input lists must have the same length.")
+
+    # Calculations
+    bamboo_area_needed = emissions / sequestration_rate
+    # Use reference years (REFERENCE_YEARS_OFFSET) for bamboo area calculations
+    bamboo_area_needed_annually = bamboo_area_needed / REFERENCE_YEARS_OFFSET
+    percent_land = (bamboo_area_needed / land_area) * 100
+    planting_cost = bamboo_area_needed_annually * cost_planting_bamboo
+
+    # Calculate GDP Percentage
+    gdp_percentage = (planting_cost / gdp) * 100
+
+    # Calculate land availability and cost constraints
+    if available_land is None:
+        available_land = land_area * (percent_land_available / 100)
+    else:
+        available_land = np.broadcast_to(np.asarray(available_land, dtype=float), land_area.shape)
+    affordable_cost = gdp * (gdp_percent_available / 100)
+    affordable_bamboo_area = affordable_cost / cost_planting_bamboo
+
+    # Calculate reduction rates based on available land and budget
+    land_constrained_reduction = available_land * sequestration_rate
+    budget_constrained_reduction = affordable_bamboo_area * sequestration_rate * REFERENCE_YEARS_OFFSET
+
+    # Use the minimum constraint (either land or budget)
+    actual_reduction_rates = np.minimum(land_constrained_reduction, budget_constrained_reduction) / REFERENCE_YEARS_OFFSET
+    land_bound = available_land / REFERENCE_YEARS_OFFSET < affordable_bamboo_area
+
+    return OffsetResult(
+        bamboo_area_needed=bamboo_area_needed,
+        bamboo_area_needed_annually=bamboo_area_needed_annually,
+        percent_land=percent_land,
+        planting_cost=planting_cost,
+        gdp_percentage=gdp_percentage,
+        available_land=available_land,
+        affordable_cost=affordable_cost,
+        affordable_bamboo_area=affordable_bamboo_area,
+        land_constrained_reduction=land_constrained_reduction,
+        budget_constrained_reduction=budget_constrained_reduction,
+        actual_reduction_rates=actual_reduction_rates,
+        land_bound=land_bound,
+        equilibrium_years=equilibrium_years(emissions, actual_reduction_rates, annual_emission_increase,
+                                            base_year, kernel=kernel) if with_equilibrium else None,
+    )
+
+
+def slider_values(value_range):
+    """Every value a (from, to, resolution) slider can take"""
+    start, stop, step = value_range
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), 10)
+
+
+def sweep_constraints(land_area, emissions, gdp,
+                      land_percents=None, gdp_percents=None,
+                      sequestration_rate=SEQUESTRATION_RATE,
+                      cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                      annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                      base_year=BASE_YEAR, dtype=np.float32, kernel=None):
+    """Evaluate equilibrium years over the whole land % x GDP % slider domain"""
+    land_area = np.asarray(land_area, dtype=float)
+    emissions = np.asarray(emissions, dtype=float)
+    gdp = np.asarray(gdp, dtype=float)
+    if land_percents is None:
+        land_percents = slider_values(LAND_PERCENT_RANGE)
+    if gdp_percents is None:
+        gdp_percents = slider_values(GDP_PERCENT_RANGE)
+    land_percents = np.asarray(land_percents, dtype=float)
+    gdp_percents = np.asarray(gdp_percents, dtype=float)
+
+    growth = np.asarray(annual_emission_increase, dtype=float)
+    if growth.ndim:
+        growth = growth[:, None]
+
+    # Annual reduction each constraint allows on its own (countries x values)
+    land_reduction = land_area[:, None] * (land_percents / 100) * sequestration_rate / REFERENCE_YEARS_OFFSET
+    budget_reduction = gdp[:, None] * (gdp_percents / 100) / cost_planting_bamboo * sequestration_rate
+
+    # The equilibrium year only moves later as the reduction rate falls, so the
+    # year under min(land, budget) is the later of the two one-axis years. That
+    # needs one solve per slider value instead of one per cell.
+    land_years = equilibrium_years(emissions[:, None], land_reduction, growth, base_year, kernel=kernel)
+    budget_years = equilibrium_years(emissions[:, None], budget_reduction, growth, base_year, kernel=kernel)
+    years = np.maximum(land_years.astype(dtype)[:, :, None], budget_years.astype(dtype)[:, None, :])
+    land_bound = land_reduction[:, :, None] < budget_reduction[:, None, :]
+
+    return SweepResult(land_percents, gdp_percents, years, land_bound)
+
+
+def sweep_heatmap(sweep, country=None):
+    """Return (land, gdp) grids to draw: equilibrium years, binding constraint and countries reaching it
+
+    With country=None every cell shows the latest equilibrium year among the
+    countries that reach it (NaN only if none does), and the binding
+    constraint is the one holding back that slowest country (the first in
+    input order on ties). Where no country reaches equilibrium, land counts
+    as binding when it binds for at least half of the countries. The third
+    grid is the number of countries that reach equilibrium in each cell.
+    """
+    never = np.isnan(sweep.equilibrium_years)
+    if country is not None:
+        return sweep.equilibrium_years[country], sweep.land_bound[country], (~never[country]).astype(int)
+    reaching = (~never).sum(axis=0)
+    slowest = np.where(never, -np.inf, sweep.equilibrium_years).argmax(axis=0)[None]
+    years = np.take_along_axis(sweep.equilibrium_years, slowest, axis=0)[0]
+    land_bound = np.where(reaching > 0, np.take_along_axis(sweep.land_bound, slowest, axis=0)[0],
+                          2 * sweep.land_bound.sum(axis=0) >= len(sweep.land_bound))
+    return years, land_bound, reaching
+
+
+def distribution_centre(spec):
+    """Centre of a (kind, *params) distribution: the mean, median, midpoint or mode"""
+    kind, *params = spec
+    if kind == "uniform":
+        return (params[0] + params[1]) / 2
+    if kind == "triangular":
+        return params[1]
+    return params[0]
+
+
+def draw_samples(spec, n_samples, rng, centre=None):
+    """Draw n_samples values from a constant or a (kind, *params) distribution
+
+    Supported kinds: ("normal", mean, sd), ("lognormal", mean, sigma),
+    ("uniform", low, high) and ("triangular", low, mode, high). The lognormal
+    mean is the median of the drawn values, not of the underlying normal. A
+    list or array of numbers is a fixed per-country value and gives an
+    (n_samples, countries) array instead.
+
+    With centre (a number or per-country values), a distribution is moved so
+    that its centre (see distribution_centre) lands on centre. Every country
+    shares the same draws, shifted (or, for lognormal, scaled) onto its own
+    centre.
+    """
+    if np.isscalar(spec):
+        return np.full(n_samples, float(spec))
+    if not isinstance(spec, tuple):
+        values = np.asarray(spec, dtype=float)
+        return np.broadcast_to(values, (n_samples,) + values.shape)
+    if centre is not None:
+        draws = draw_samples(spec, n_samples, rng)
+        centre = np.asarray(centre, dtype=float)
+        if centre.ndim:
+            draws = draws[:, None]
+        if spec[0] == "lognormal":
+            return draws / distribution_centre(spec) * centre
+        return draws - distribution_centre(spec) + centre
+    kind, *params = spec
+    if kind == "normal":
+        return rng.normal(params[0], params[1], n_samples)
+    if kind == "lognormal":
+        return params[0] * rng.lognormal(0.0, params[1], n_samples)
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1], n_samples)
+    if kind == "triangular":
+        return rng.triangular(params[0], params[1], params[2], n_samples)
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+def sorted_percentiles(values, percentiles):
+    """np.percentile (linear method) along the last axis of already sorted values"""
+    n = values.shape[-1]
+    position = np.asarray(percentiles, dtype=float) / 100 * (n - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, n - 1)
+    fraction = (position - lower).reshape((-1,) + (1,) * (values.ndim - 1))
+    below, above = np.moveaxis(values[..., lower], -1, 0), np.moveaxis(values[..., upper], -1, 0)
+    return below + (above - below) * fraction
+
+
+def monte_carlo(land_area, emissions, gdp, start_year, end_year,
+                percent_land_available=DEFAULT_PERCENT_LAND,
+                gdp_percent_available=DEFAULT_GDP_PERCENTAGE,
+                sequestration_rate=SEQUESTRATION_RATE,
+                cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                n_samples=100_000, percentiles=(5, 50, 95),
+                chunk_elements=4_000_000, seed=None, base_year=BASE_YEAR, kernel=None, available_land=None,
+                growth_centre=None):
+    """Propagate uncertain model constants to percentile bands
+
+    sequestration_rate, cost_planting_bamboo and annual_emission_increase each
+    take a number or a distribution tuple (see draw_samples). Samples are drawn
+    once; countries and years are then processed in blocks so that no more
+    than chunk_elements sample values are held in memory at a time. kernel is
+    an optional age kernel for the cohort model (see age_kernel), and
+    available_land replaces land_area * percent_land_available as in
+    compute_offsets. growth_centre (for example a dataset's per-country
+    growth) moves a growth distribution onto each country's own rate.
+    """
+    land_area = np.asarray(land_area, dtype=float)
+    emissions = np.asarray(emissions, dtype=float)
+    gdp = np.asarray(gdp, dtype=float)
+    rng = np.random.default_rng(seed)
+    if available_land is None:
+        available_land = land_area * (percent_land_available / 100)
+    available_land = np.broadcast_to(np.asarray(available_land, dtype=float), land_area.shape)
+
+    def sample_columns(spec, centre=None):
+        # (n_samples, 1) for shared values, (n_samples, countries) for per-country ones
+        values = draw_samples(spec, n_samples, rng, centre)
+        return values[:, None] if values.ndim == 1 else values
+
+    def block_columns(values, block):
+        return values if values.shape[1] == 1 else values[:, block]
+
+    sequestration = sample_columns(sequestration_rate)
+    cost = sample_columns(cost_planting_bamboo)
+    growth = sample_columns(annual_emission_increase, growth_centre)
+
+    years = np.arange(start_year, end_year + 1)
+    n_countries, n_years, n_bands = len(emissions), len(years), len(percentiles)
+    capacity = cumulative_kernel(kernel, n_years)  # Reduction after each year per unit rate
+    equilibrium_bands = np.empty((n_bands, n_countries))
+    net_bands = np.empty((n_bands, n_years, n_countries))
+    reduction_bands = np.empty((n_bands, n_years, n_countries))
+
+    country_block = max(1, min(n_countries, chunk_elements // n_samples))
+    for c0 in range(0, n_countries, country_block):
+        block = slice(c0, c0 + country_block)
+        width = len(emissions[block])
+
+        # Same constraint logic as compute_offsets, one row per sample
+        reduction = constrained_reduction_rates(land_area[block], gdp[block], percent_land_available,
+                                                gdp_percent_available, block_columns(sequestration, block),
+                                                block_columns(cost, block), available_land[block])
+        block_growth = block_columns(growth, block)
+
+        # "Never" sorts last so the upper bands report it instead of a year
+        eq = equilibrium_years(emissions[block], reduction, block_growth, base_year, kernel=kernel)
+        eq = np.percentile(np.where(np.isnan(eq), np.inf, eq), percentiles, axis=0, method="nearest")
+        equilibrium_bands[:, block] = np.where(np.isinf(eq), np.nan, eq)
+
+        # Cumulative reduction is linear in the rate, so its bands come straight
+        # from the rate percentiles; net emissions need every sample per year
+        rate_bands = np.percentile(reduction, percentiles, axis=0)
+        reduction_bands[:, :, block] = capacity[None, :, None] * rate_bands[:, None, :]
+
+        # Samples on the last, contiguous axis: a row sort is several times
+        # faster than np.percentile's multi-rank partition down axis 0
+        sample_rates = np.ascontiguousarray(reduction.T)[:, None, :]
+        sample_growth = np.ascontiguousarray(1 + block_growth.T)[:, None, :]
+        year_block = max(1, chunk_elements // (n_samples * width))
+        # Two buffers reused for every year block instead of fresh temporaries
+        buffers = np.empty((2, width, min(year_block, n_years), n_samples))
+        for y0 in range(0, n_years, year_block):
+            t = np.arange(y0, min(n_years, y0 + year_block))
+            net, removed = buffers[:, :, :len(t)]  # (countries, years, samples)
+            # Shared growth samples are raised to each power once, not once per country
+            np.multiply(np.power(sample_growth, t[:, None]), emissions[block][:, None, None], out=net)
+            np.multiply(capacity[t][:, None], sample_rates, out=removed)
+            net -= removed
+            np.maximum(net, 0, out=net)
+            net.sort(axis=-1)
+            net_bands[:, t, block] = sorted_percentiles(net, percentiles).transpose(0, 2, 1)
+
+    return MonteCarloResult(np.asarray(percentiles), years, equilibrium_bands,
+                            net_bands, reduction_bands, n_samples)
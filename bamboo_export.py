@@ -0,0 +1,252 @@
+"""Batch chart export for the Bamboo CO2 offset calculator.
+
+Renders the bar, time series, growth scenario and constraint sweep charts for every scenario
+in a JSON file straight to PNG/SVG/PDF with the Agg backend, without Tk or a
+display. Scenarios are spread over a process pool, and each worker keeps one
+figure per chart type that it reuses for every scenario it renders.
+
+    python bamboo_export.py scenarios.json -o charts --format png svg --workers 8
+
+Scenario file layout (a bare list of scenarios is accepted too):
+
+    {
+      "defaults": {"years": [2025, 2099], "charts": ["bar", "time"]},
+      "scenarios": [
+        {"name": "caribbean", "countries": ["Jamaica"], "land_area": [4244],
+         "emissions": [6083040], "gdp": [15e9], "percent_land_available": 5},
+        {"name": "world", "dataset": "countries.csv", "gdp_percent_available": 1.0}
+      ]
+    }
+
+Each scenario gives its countries inline or as a "dataset" CSV/JSON path
+(relative to the scenario file). "land_rasters" (also relative) takes
+available land from land-suitability rasters instead of a percentage of
+land area. Any key may also be set in "defaults".
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")  # Before anything imports pyplot
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from bamboo_engine import (ANNUAL_EMISSION_INCREASE, DEFAULT_PERCENT_LAND, DEFAULT_GDP_PERCENTAGE,
+                           EQUILIBRIUM_HORIZON, compute_offsets, time_series, sweep_constraints, monte_carlo,
+                           budget_schedule, plan_budget, plan_offsets, growth_scenarios, emission_peaks,
+                           GROWTH_SCENARIOS)
+from bamboo_harvest import HARVEST_FRACTION, sequestration_kernel
+from bamboo_data import load_countries
+from bamboo_raster import open_rasters, available_land
+from bamboo_charts import BarChart, plot_time_series, plot_growth_scenarios, plot_constraint_sweep
+
+CHART_TYPES = ("bar", "time", "growth", "sweep")
+EXPORT_FORMATS = ("png", "svg", "pdf")
+FIGURE_SIZE = (10, 6)  # Same as the desktop app
+DEFAULT_YEARS = (2025, 2099)
+UNCERTAINTY_SAMPLES = 20_000  # Monte Carlo samples for time series bands
+
+# Per-worker figures, created on first use and reused for every scenario
+_figures = {}
+
+
+def load_scenarios(path):
+    """Read a scenario file and return its scenarios with defaults applied"""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, list):
+        data = {"scenarios": data}
+    defaults = data.get("defaults", {})
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    scenarios = []
+    for i, entry in enumerate(data.get("scenarios", [])):
+        scenario = {**defaults, **entry}
+        scenario.setdefault("name", f"scenario_{i + 1:03d}")
+        if "dataset" in scenario:
+            scenario["dataset"] = os.path.join(base_dir, scenario["dataset"])
+        if "land_rasters" in scenario:
+            scenario["land_rasters"] = os.path.join(base_dir, scenario["land_rasters"])
+        charts = scenario.setdefault("charts", ["bar", "time"])
+        unknown = set(charts) - set(CHART_TYPES)
+        if unknown:
+            raise ValueError(f"{scenario['name']}: unknown chart type(s) {', '.join(sorted(unknown))}")
+        scenarios.append(scenario)
+    if not scenarios:
+        raise ValueError(f"No scenarios in {path}")
+    return scenarios
+
+
+def file_stem(name):
+    """Filesystem-safe version of a scenario name"""
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "scenario"
+
+
+def _figure(kind):
+    """This worker's figure for one chart type, plus its chart state"""
+    if kind not in _figures:
+        fig = Figure(figsize=FIGURE_SIZE)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        _figures[kind] = {"fig": fig, "ax": ax, "bar": BarChart(ax), "colorbar": None}
+    return _figures[kind]
+
+
+def scenario_inputs(scenario):
+    """Country columns and constraints for one scenario"""
+    if "dataset" in scenario:
+        table = load_countries(scenario["dataset"])
+        countries = table.countries.tolist()
+        land_area, emissions, gdp = table.land_area, table.emissions, table.gdp
+        growth = scenario.get("growth", table.growth)
+    else:
+        countries = list(scenario["countries"])
+        land_area = np.asarray(scenario["land_area"], dtype=float)
+        emissions = np.asarray(scenario["emissions"], dtype=float)
+        gdp = np.asarray(scenario["gdp"], dtype=float)
+        growth = scenario.get("growth", ANNUAL_EMISSION_INCREASE)
+    start_year, end_year = scenario.get("years", DEFAULT_YEARS)
+    if end_year <= start_year:
+        raise ValueError("End year must be greater than start year.")
+    return (countries, land_area, emissions, gdp, np.asarray(growth, dtype=float),
+            int(start_year), int(end_year))
+
+
+def render_scenario(scenario, out_dir, formats, dpi):
+    """Compute one scenario and write each of its charts; return the written paths"""
+    countries, land_area, emissions, gdp, growth, start_year, end_year = scenario_inputs(scenario)
+    percent_land_available = float(scenario.get("percent_land_available", DEFAULT_PERCENT_LAND))
+    gdp_percent_available = float(scenario.get("gdp_percent_available", DEFAULT_GDP_PERCENTAGE))
+    # Optional cohort model: stand maturity in years, harvest rotation in years and harvested share
+    n_years = max(EQUILIBRIUM_HORIZON, end_year - start_year + 1)
+    kernel = sequestration_kernel(n_years, scenario.get("maturity_years", 0), scenario.get("rotation_years", 0),
+                                  scenario.get("harvest_fraction", HARVEST_FRACTION))
+    # Optional budget schedule: GDP growth (per year), linear ramp-up and a yearly cap in USD
+    schedule_keys = ("gdp_growth", "ramp_years", "ramp_start_share", "budget_cap")
+    scheduled = any(scenario.get(key) for key in schedule_keys)
+    # Optional land-suitability rasters: plantable_share of each country's plantable cells
+    land = None
+    if "land_rasters" in scenario:
+        land = available_land(open_rasters(scenario["land_rasters"]), countries,
+                              scenario.get("plantable_share", 1.0))
+    result = compute_offsets(land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+                             annual_emission_increase=growth, with_equilibrium=not scheduled, kernel=kernel,
+                             available_land=land)
+    rates = result.actual_reduction_rates
+    if scheduled:
+        budget = budget_schedule(gdp, gdp_percent_available, n_years, scenario.get("gdp_growth", 0.0),
+                                 scenario.get("ramp_years", 0), scenario.get("ramp_start_share", 0.0),
+                                 scenario.get("budget_cap"))
+        plan = plan_budget(land_area, emissions, budget, percent_land_available,
+                           annual_emission_increase=growth, kernel=kernel, available_land=land)
+        result = plan_offsets(result, plan, end_year - start_year + 1)
+        rates = plan.reduction_rates[:end_year - start_year + 1]
+
+    written = []
+    for kind in scenario["charts"]:
+        state = _figure(kind)
+        ax = state["ax"]
+        if kind == "bar":
+            # Rebuilds only when the country list differs from the last scenario
+            state["bar"].update(countries, land_area, result.bamboo_area_needed_annually,
+                                result.planting_cost, result.gdp_percentage, start_year, end_year,
+                                result.available_land, result.affordable_bamboo_area)
+        elif kind == "time":
+            ax.clear()
+            series = time_series(emissions, rates, start_year, end_year, growth, kernel=kernel)
+            bands = None
+            # JSON has no tuples: ["normal", mean, sd] is a distribution, not per-country values
+            uncertainty = {key: tuple(spec) if isinstance(spec, list) and isinstance(spec[0], str) else spec
+                           for key, spec in scenario.get("uncertainty", {}).items()}
+            if uncertainty and not scheduled:  # Bands assume a constant budget
+                # A growth distribution is centred on per-country growth (a dataset's column)
+                uncertainty.setdefault("annual_emission_increase", growth)
+                bands = monte_carlo(land_area, emissions, gdp, start_year, end_year,
+                                    percent_land_available, gdp_percent_available,
+                                    n_samples=scenario.get("samples", UNCERTAINTY_SAMPLES), available_land=land,
+                                    seed=scenario.get("seed"), kernel=kernel,
+                                    growth_centre=growth if growth.ndim else None, **uncertainty)
+            peaks = (emission_peaks(emissions, rates, growth, start_year, end_year - start_year - 1)
+                     if kernel is None and not scheduled else None)
+            plot_time_series(ax, countries, emissions, start_year, end_year, series, bands, peaks, growth,
+                             uncertainty.get("annual_emission_increase"))
+        elif kind == "growth":
+            ax.clear()
+            # {"name": annual rate} (a rate may be a per-country list); the chart's default scenarios otherwise
+            scenarios = growth_scenarios(emissions, plan.reduction_rates if scheduled else rates, start_year,
+                                         end_year, scenario.get("growth_scenarios", GROWTH_SCENARIOS),
+                                         kernel=kernel)
+            plot_growth_scenarios(ax, countries, emissions, start_year, end_year, scenarios)
+        else:
+            if state["colorbar"] is not None:
+                state["colorbar"].remove()
+            ax.clear()
+            heatmap_country = scenario.get("heatmap_country")
+            country = countries.index(heatmap_country) if heatmap_country in countries else None
+            sweep = sweep_constraints(land_area, emissions, gdp, annual_emission_increase=growth, kernel=kernel)
+            state["colorbar"] = plot_constraint_sweep(ax, countries, sweep, percent_land_available,
+                                                      gdp_percent_available, country)
+
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{file_stem(scenario['name'])}_{kind}.{fmt}")
+            state["fig"].savefig(path, dpi=dpi)
+            written.append(path)
+    return written
+
+
+def export_charts(scenarios, out_dir, formats=("png",), dpi=100, workers=None):
+    """Render every scenario, in parallel when workers > 1
+
+    Returns (written paths, {scenario name: error message}) so one bad
+    scenario does not stop the rest of the batch.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(scenarios))
+    written, failed = [], {}
+    if workers == 1:
+        for scenario in scenarios:
+            try:
+                written += render_scenario(scenario, out_dir, formats, dpi)
+            except Exception as e:
+                failed[scenario["name"]] = str(e)
+        return written, failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_scenario, scenario, out_dir, formats, dpi): scenario["name"]
+                   for scenario in scenarios}
+        for future in as_completed(futures):
+            try:
+                written += future.result()
+            except Exception as e:
+                failed[futures[future]] = str(e)
+    return sorted(written), failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Bamboo CO2 offset charts for a scenario file.")
+    parser.add_argument("scenarios", help="JSON scenario file")
+    parser.add_argument("-o", "--output", default="charts", help="output directory (default: charts)")
+    parser.add_argument("-f", "--format", nargs="+", choices=EXPORT_FORMATS, default=["png"],
+                        help="file formats to write (default: png)")
+    parser.add_argument("--dpi", type=int, default=100, help="resolution of raster output")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU, 1 renders in-process)")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    written, failed = export_charts(scenarios, args.output, args.format, args.dpi, args.workers)
+    print(f"Wrote {len(written)} file(s) for {len(scenarios) - len(failed)} scenario(s) to {args.output}")
+    for name, error in failed.items():
+        print(f"Failed: {name}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
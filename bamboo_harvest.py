@@ -0,0 +1,99 @@
+"""Harvest rotation and wood-product carbon pools for the Bamboo CO2 offset engine.
+
+Bamboo is cut on short rotations, so sequestered carbon does not all stay in
+the stand. Every rotation_years a stand gives up harvest_fraction of the
+growth since the last cut. The harvest is split into product pools (short
+and long lived), and each pool decays with its own half-life. The part of
+the harvest that no pool takes is released at once.
+
+Everything is expressed per cohort (one unit of planting, by stand age) as
+1-D kernels. Convolving a planting schedule with a kernel gives the stream
+or stock for every year and country at once. The net kernel, the yearly
+change in carbon held by the stand and the products, is a drop-in
+replacement for age_kernel wherever the engine takes a kernel.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from bamboo_engine import age_kernel, convolve_years
+
+ROTATION_YEARS = 5  # Years between harvests of a stand (bamboo culms are cut every 3-7 years)
+HARVEST_FRACTION = 0.6  # Share of the growth since the last harvest that is removed
+# (name, share of the harvest, half-life in years); the rest of the harvest is released immediately
+PRODUCT_POOLS = (
+    ("short-lived", 0.3, 2.0),   # Paper, packaging, fuel
+    ("long-lived", 0.5, 35.0),   # Construction, flooring, furniture
+)
+
+HarvestKernels = namedtuple("HarvestKernels", [
+    "uptake",    # (ages,) gross sequestration per unit of planting
+    "harvest",   # (ages,) carbon removed at harvest
+    "stand",     # (ages,) carbon left in the stand
+    "products",  # (pools, ages) carbon still held in each product pool
+    "net",       # (ages,) yearly change in stand + product carbon
+])
+
+CarbonPools = namedtuple("CarbonPools", [
+    "harvest",   # (years, countries) carbon harvested each year
+    "stand",     # (years, countries) carbon in standing bamboo
+    "products",  # (pools, years, countries) carbon in each product pool
+    "stored",    # (years, countries) stand + products
+])
+
+
+def decay_kernel(n_ages, half_life):
+    """Share of a product pool's input still held after each whole year"""
+    return np.exp(-np.log(2) * np.arange(n_ages) / half_life)
+
+
+def harvest_kernels(n_ages, rotation_years=ROTATION_YEARS, harvest_fraction=HARVEST_FRACTION,
+                    pools=PRODUCT_POOLS, kernel=None):
+    """Per-cohort uptake, harvest, stand, product and net kernels
+
+    kernel is the gross uptake by stand age (age_kernel); None means the full
+    rate from planting on. Harvests happen at the end of every
+    rotation_years-th year of a stand's life.
+    """
+    uptake = np.ones(n_ages) if kernel is None else np.asarray(kernel, dtype=float)[:n_ages]
+    if len(uptake) < n_ages:
+        uptake = np.concatenate([uptake, np.full(n_ages - len(uptake), uptake[-1])])
+    grown = np.cumsum(uptake)
+
+    # Each harvest takes its share of the growth since the previous one
+    harvest = np.zeros(n_ages)
+    cut = np.arange(rotation_years - 1, n_ages, rotation_years)
+    since_last = grown[cut] - np.concatenate([[0.0], grown[cut[:-1]]])
+    harvest[cut] = harvest_fraction * since_last
+    stand = grown - np.cumsum(harvest)
+
+    products = np.array([np.convolve(harvest * share, decay_kernel(n_ages, half_life))[:n_ages]
+                         for _, share, half_life in pools]).reshape(len(pools), n_ages)
+    stored = stand + products.sum(axis=0)
+    net = np.diff(stored, prepend=0.0)
+    return HarvestKernels(uptake, harvest, stand, products, net)
+
+
+def sequestration_kernel(n_ages, maturity_years=0, rotation_years=0, harvest_fraction=HARVEST_FRACTION,
+                         pools=PRODUCT_POOLS):
+    """The engine kernel for a stand maturity and harvest rotation, or None for the original model"""
+    kernel = age_kernel(n_ages, maturity_years) if maturity_years else None
+    if rotation_years:
+        kernel = harvest_kernels(n_ages, rotation_years, harvest_fraction, pools, kernel).net
+    return kernel
+
+
+def carbon_pools(reduction_rates, n_years, kernels):
+    """Harvest stream and carbon stocks for every year and country
+
+    reduction_rates is the yearly planting in sequestration-rate units, as in
+    time_series: one rate per country, or a (years, countries) schedule.
+    """
+    schedule = np.asarray(reduction_rates, dtype=float)
+    if schedule.ndim < 2:
+        schedule = np.broadcast_to(schedule, (n_years,) + schedule.shape)
+    harvest = convolve_years(schedule, kernels.harvest)
+    stand = convolve_years(schedule, kernels.stand)
+    # Pools on a trailing axis so one convolution covers them all
+    products = np.moveaxis(convolve_years(schedule[..., None], kernels.products.T[:, None, :]), -1, 0)
+    return CarbonPools(harvest, stand, products, stand + products.sum(axis=0))
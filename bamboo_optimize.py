@@ -0,0 +1,195 @@
+"""Donor budget allocation across countries for the Bamboo CO2 offset engine.
+
+Each country plants what its own GDP share pays for, up to the land it has
+available (compute_offsets). A donor budget buys extra planting where land
+is left over. allocate_budget splits that budget to maximize one of two
+objectives:
+
+    "tonnes"       CO2 removed over the planting period. Every dollar buys
+                   sequestration_rate / cost_planting_bamboo tons per year
+                   wherever it goes, so the linear program is a fractional
+                   knapsack in each year. The greedy fill by that ratio is
+                   exact, and it is vectorized over years and countries.
+                   method="lp" solves the same program with scipy's HiGHS
+                   instead (optional dependency).
+    "equilibrium"  Years of equilibrium pulled forward, summed over
+                   countries (never = the end of the search horizon). The
+                   budget is handed out in small increments, each to the
+                   country whose equilibrium moves earliest per dollar.
+
+    python bamboo_optimize.py countries.csv --budget 5e9 --objective equilibrium
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from bamboo_engine import (REFERENCE_YEARS_OFFSET, BASE_YEAR, EQUILIBRIUM_HORIZON, SEQUESTRATION_RATE,
+                           COST_PLANTING_BAMBOO, ANNUAL_EMISSION_INCREASE, DEFAULT_PERCENT_LAND,
+                           DEFAULT_GDP_PERCENTAGE, compute_offsets, equilibrium_years)
+
+OBJECTIVES = ("tonnes", "equilibrium")
+DEFAULT_STEPS = 500  # Budget increments for the equilibrium objective
+
+Allocation = namedtuple("Allocation", [
+    "donor_funding",      # (years, countries) USD/yr given to each country
+    "planted_area",       # (years, countries) sq mi planted from own and donor funds
+    "reduction_rates",    # (years, countries) tons CO2/yr added by that year's planting
+    "tonnes_offset",      # (countries,) tons CO2 removed over the period
+    "equilibrium_years",  # (countries,) with the period's mean donor funding, NaN if never
+    "unspent",            # (years,) USD/yr left once every country's land was full
+])
+
+
+def planting_headroom(land_area, gdp, percent_land_available, gdp_percent_available,
+                      cost_planting_bamboo=COST_PLANTING_BAMBOO):
+    """(own planting, extra planting the land still allows) in sq mi/yr per country"""
+    land_cap = np.asarray(land_area, dtype=float) * (percent_land_available / 100) / REFERENCE_YEARS_OFFSET
+    own = np.minimum(land_cap, np.asarray(gdp, dtype=float) * (gdp_percent_available / 100) / cost_planting_bamboo)
+    return own, land_cap - own
+
+
+def _greedy_tonnes(capacity, efficiency, budget):
+    """Fill countries in order of tons per dollar; returns (years, countries) funding"""
+    order = np.argsort(-efficiency, kind="stable")
+    sorted_capacity = capacity[order]
+    before = np.cumsum(sorted_capacity) - sorted_capacity  # Funding absorbed by better countries
+    funding = np.empty((len(budget), len(capacity)))
+    funding[:, order] = np.clip(budget[:, None] - before, 0, sorted_capacity)
+    return funding
+
+
+def _lp_tonnes(capacity, efficiency, budget):
+    """The same program as _greedy_tonnes, solved by scipy's HiGHS"""
+    try:
+        from scipy.optimize import linprog
+        from scipy.sparse import kron, identity, csr_matrix
+    except ImportError:
+        raise ImportError("method='lp' needs scipy; use method='greedy' (the same optimum)") from None
+    n_years, n_countries = len(budget), len(capacity)
+    weight = (n_years - np.arange(n_years))[:, None] * efficiency  # Planting in year t counts n_years - t times
+    budget_rows = kron(identity(n_years), csr_matrix(np.ones((1, n_countries))))
+    solution = linprog(-weight.ravel(), A_ub=budget_rows, b_ub=budget,
+                       bounds=np.column_stack([np.zeros(weight.size), np.tile(capacity, n_years)]),
+                       method="highs")
+    if not solution.success:
+        raise RuntimeError(f"Linear program failed: {solution.message}")
+    return solution.x.reshape(n_years, n_countries)
+
+
+def _greedy_equilibrium(emissions, own, headroom, budget, sequestration_rate, cost_planting_bamboo,
+                        growth, base_year, horizon, steps):
+    """Hand out budget in increments to the largest equilibrium gain per dollar; (countries,) funding"""
+    n = len(emissions)
+    never = float(base_year + horizon)
+    sequestration_rate = np.broadcast_to(sequestration_rate, n)
+    cost = np.broadcast_to(np.asarray(cost_planting_bamboo, dtype=float), n)
+    growth = np.broadcast_to(np.asarray(growth, dtype=float), n)
+    capacity = headroom * cost
+    funding = np.zeros(n)
+    step = budget / steps
+
+    def years(i, extra):
+        # Continuous years so that small increments register; never reached counts as the horizon
+        rate = sequestration_rate[i] * (own[i] + (funding[i] + extra) / cost[i])
+        found = equilibrium_years(emissions[i], rate, growth[i], base_year, horizon, discrete=False)
+        return np.where(np.isnan(found), never, found)
+
+    everyone = np.arange(n)
+    current = years(everyone, 0.0)
+    amount = np.minimum(step, capacity)
+    gain = (current - years(everyone, amount)) / np.maximum(amount, 1e-300)
+    remaining = budget
+    while remaining > 1e-9 * budget:
+        gain[capacity - funding <= 0] = -np.inf
+        best = int(np.argmax(gain))
+        if not gain[best] > 0:
+            break  # No country gets closer to equilibrium; the rest goes by tonnes below
+        funding[best] += min(amount[best], remaining)
+        remaining -= min(amount[best], remaining)
+        # Only the funded country's marginal gain changed
+        amount[best] = min(step, capacity[best] - funding[best])
+        current[best] = years(best, 0.0)
+        if amount[best] > 0:
+            gain[best] = (current[best] - years(best, amount[best])) / amount[best]
+    return funding, remaining
+
+
+def allocate_budget(land_area, emissions, gdp, donor_budget,
+                    percent_land_available=DEFAULT_PERCENT_LAND,
+                    gdp_percent_available=DEFAULT_GDP_PERCENTAGE,
+                    objective="tonnes", method="greedy", n_years=REFERENCE_YEARS_OFFSET,
+                    sequestration_rate=SEQUESTRATION_RATE,
+                    cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                    annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                    base_year=BASE_YEAR, horizon=EQUILIBRIUM_HORIZON, steps=DEFAULT_STEPS):
+    """Split a donor budget (USD/yr, or one value per year) across countries
+
+    sequestration_rate and cost_planting_bamboo may be per-country arrays;
+    with the scalar defaults every dollar removes the same tonnes, and the
+    tonnes objective only decides where the land runs out. The equilibrium
+    objective spreads a constant yearly budget (the mean of a schedule).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective!r} (choose from {', '.join(OBJECTIVES)})")
+    emissions = np.asarray(emissions, dtype=float)
+    budget = np.broadcast_to(np.asarray(donor_budget, dtype=float), (n_years,)).copy()
+    own, headroom = planting_headroom(land_area, gdp, percent_land_available, gdp_percent_available,
+                                      cost_planting_bamboo)
+    cost = np.broadcast_to(np.asarray(cost_planting_bamboo, dtype=float), own.shape)
+    sequestration = np.broadcast_to(np.asarray(sequestration_rate, dtype=float), own.shape)
+    capacity = headroom * cost  # USD/yr each country can still put to use
+    efficiency = sequestration / cost  # tons CO2/yr per USD/yr
+
+    if objective == "tonnes":
+        solve = _lp_tonnes if method == "lp" else _greedy_tonnes
+        funding = solve(capacity, efficiency, budget)
+    else:
+        yearly, left = _greedy_equilibrium(emissions, own, headroom, budget.mean(), sequestration, cost,
+                                           annual_emission_increase, base_year, horizon, steps)
+        # Whatever no longer moves an equilibrium year still removes CO2
+        yearly += _greedy_tonnes(capacity - yearly, efficiency, np.array([left]))[0]
+        funding = np.broadcast_to(yearly, (n_years, len(own))).copy()
+
+    planted = own + funding / cost
+    rates = planted * sequestration
+    tonnes = ((n_years - np.arange(n_years))[:, None] * rates).sum(axis=0)
+    mean_rate = rates.mean(axis=0)
+    eq = equilibrium_years(emissions, mean_rate, annual_emission_increase, base_year, horizon)
+    return Allocation(funding, planted, rates, tonnes, eq, budget - funding.sum(axis=1))
+
+
+def main(argv=None):
+    from bamboo_data import load_countries
+    from bamboo_summary import format_large_num, format_equilibrium_year
+
+    parser = argparse.ArgumentParser(description="Split a donor budget across countries.")
+    parser.add_argument("dataset", help="CSV or JSON country table")
+    parser.add_argument("--budget", type=float, required=True, help="donor budget in USD per year")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="tonnes")
+    parser.add_argument("--method", choices=("greedy", "lp"), default="greedy",
+                        help="solver for the tonnes objective (lp needs scipy)")
+    parser.add_argument("--land", type=float, default=DEFAULT_PERCENT_LAND, help="available land (%%)")
+    parser.add_argument("--gdp", type=float, default=DEFAULT_GDP_PERCENTAGE, help="available GDP (%%)")
+    parser.add_argument("--top", type=int, default=20, help="countries to list (largest funding first)")
+    args = parser.parse_args(argv)
+
+    table = load_countries(args.dataset)
+    base = compute_offsets(table.land_area, table.emissions, table.gdp, args.land, args.gdp,
+                           annual_emission_increase=table.growth)
+    allocation = allocate_budget(table.land_area, table.emissions, table.gdp, args.budget, args.land, args.gdp,
+                                 args.objective, args.method, annual_emission_increase=table.growth)
+    funding = allocation.donor_funding.mean(axis=0)
+    print(f"{'country':<24} {'funding $/yr':>14} {'equilibrium':>12} {'with funding':>13}")
+    for i in np.argsort(-funding, kind="stable")[:args.top]:
+        print(f"{table.countries[i]:<24} {format_large_num(funding[i]):>14} "
+              f"{format_equilibrium_year(base.equilibrium_years[i]):>12} "
+              f"{format_equilibrium_year(allocation.equilibrium_years[i]):>13}")
+    print(f"Unspent: ${format_large_num(allocation.unspent.mean())}/yr  "
+          f"CO2 removed over {len(allocation.unspent)} years: {format_large_num(allocation.tonnes_offset.sum())} tons")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Precomputed seaborn look for the Bamboo CO2 offset charts.
+
+The charts only ever used two things from seaborn: the "whitegrid" style and
+the "rocket" colormap. Both are stored here as plain data, so drawing a chart
+does not import seaborn (and with it pandas and scipy).
+"""
+import matplotlib
+import numpy as np
+from matplotlib.colors import ListedColormap
+
+# seaborn's "rocket" colormap, 256 entries from dark to light
+ROCKET_LUT = [
+    "#03051a", "#04051a", "#05061b", "#06071c", "#07071d", "#08081e", "#0a091f", "#0b0920",
+    "#0d0a21", "#0e0b22", "#100b23", "#110c24", "#130d25", "#140e26", "#160e27", "#170f28",
+    "#180f29", "#1a102a", "#1b112b", "#1d112c", "#1e122d", "#20122e", "#211330", "#221331",
+    "#241432", "#251433", "#271534", "#281535", "#2a1636", "#2b1637", "#2d1738", "#2e1739",
+    "#30173a", "#31183b", "#33183c", "#34193d", "#35193e", "#37193f", "#381a40", "#3a1a41",
+    "#3c1a42", "#3d1a42", "#3f1b43", "#401b44", "#421b45", "#431c46", "#451c47", "#461c48",
+    "#481c48", "#491d49", "#4b1d4a", "#4c1d4b", "#4e1d4b", "#501d4c", "#511e4d", "#531e4d",
+    "#541e4e", "#561e4f", "#581e4f", "#591e50", "#5b1e51", "#5c1e51", "#5e1f52", "#601f52",
+    "#611f53", "#631f53", "#641f54", "#661f54", "#681f55", "#691f55", "#6b1f56", "#6d1f56",
+    "#6e1f57", "#701f57", "#711f57", "#731f58", "#751f58", "#761f58", "#781f59", "#7a1f59",
+    "#7b1f59", "#7d1f5a", "#7f1e5a", "#811e5a", "#821e5a", "#841e5a", "#861e5b", "#871e5b",
+    "#891e5b", "#8b1d5b", "#8c1d5b", "#8e1d5b", "#901d5b", "#921c5b", "#931c5b", "#951c5b",
+    "#971c5b", "#981b5b", "#9a1b5b", "#9c1b5b", "#9e1a5b", "#9f1a5b", "#a11a5b", "#a3195b",
+    "#a4195b", "#a6195a", "#a8185a", "#aa185a", "#ab185a", "#ad1759", "#af1759", "#b01759",
+    "#b21758", "#b41658", "#b51657", "#b71657", "#b91657", "#ba1656", "#bc1656", "#bd1655",
+    "#bf1654", "#c11754", "#c21753", "#c41753", "#c51852", "#c71951", "#c81951", "#ca1a50",
+    "#cb1b4f", "#cd1c4e", "#ce1d4e", "#cf1e4d", "#d11f4c", "#d2204c", "#d3214b", "#d5224a",
+    "#d62449", "#d72549", "#d82748", "#d92847", "#db2946", "#dc2b46", "#dd2c45", "#de2e44",
+    "#df2f44", "#e03143", "#e13342", "#e23442", "#e33641", "#e43841", "#e53940", "#e63b40",
+    "#e73d3f", "#e83f3f", "#e8403e", "#e9423e", "#ea443e", "#eb463e", "#eb483e", "#ec4a3e",
+    "#ec4c3e", "#ed4e3e", "#ed503e", "#ee523f", "#ee543f", "#ef5640", "#ef5840", "#ef5a41",
+    "#f05c42", "#f05e42", "#f06043", "#f16244", "#f16445", "#f16646", "#f26747", "#f26948",
+    "#f26b49", "#f26d4b", "#f26f4c", "#f3714d", "#f3734e", "#f37450", "#f37651", "#f37852",
+    "#f47a54", "#f47c55", "#f47d57", "#f47f58", "#f4815a", "#f4835b", "#f4845d", "#f4865e",
+    "#f58860", "#f58a61", "#f58b63", "#f58d64", "#f58f66", "#f59067", "#f59269", "#f5946b",
+    "#f5966c", "#f5976e", "#f59970", "#f69b71", "#f69c73", "#f69e75", "#f6a077", "#f6a178",
+    "#f6a37a", "#f6a47c", "#f6a67e", "#f6a880", "#f6a981", "#f6ab83", "#f6ad85", "#f6ae87",
+    "#f6b089", "#f6b18b", "#f6b38d", "#f6b48f", "#f6b691", "#f6b893", "#f6b995", "#f6bb97",
+    "#f6bc99", "#f6be9b", "#f6bf9d", "#f6c19f", "#f7c2a2", "#f7c4a4", "#f7c6a6", "#f7c7a8",
+    "#f7c9aa", "#f7caac", "#f7ccaf", "#f7cdb1", "#f7cfb3", "#f7d0b5", "#f8d1b8", "#f8d3ba",
+    "#f8d4bc", "#f8d6be", "#f8d7c0", "#f8d9c3", "#f8dac5", "#f8dcc7", "#f9ddc9", "#f9dfcb",
+    "#f9e0cd", "#f9e2d0", "#f9e3d2", "#f9e5d4", "#fae6d6", "#fae8d8", "#fae9da", "#faebdd",
+]
+
+# rcParams set by seaborn.set_style("whitegrid")
+WHITEGRID_STYLE = {
+    "figure.facecolor": "white",
+    "axes.facecolor": "white",
+    "axes.edgecolor": ".8",
+    "axes.grid": True,
+    "axes.axisbelow": True,
+    "axes.labelcolor": ".15",
+    "axes.spines.left": True,
+    "axes.spines.bottom": True,
+    "axes.spines.right": True,
+    "axes.spines.top": True,
+    "grid.color": ".8",
+    "grid.linestyle": "-",
+    "text.color": ".15",
+    "xtick.color": ".15",
+    "ytick.color": ".15",
+    "xtick.direction": "out",
+    "ytick.direction": "out",
+    "xtick.bottom": False,
+    "ytick.left": False,
+    "xtick.top": False,
+    "ytick.right": False,
+    "font.family": ["sans-serif"],
+    "font.sans-serif": ["Arial", "DejaVu Sans", "Liberation Sans", "Bitstream Vera Sans", "sans-serif"],
+    "lines.solid_capstyle": "round",
+    "patch.edgecolor": "w",
+    "patch.force_edgecolor": True,
+    "image.cmap": "rocket",
+}
+
+
+def rocket_cmap(reverse=False):
+    """The rocket colormap (rocket_r when reverse is True)"""
+    name = "rocket_r" if reverse else "rocket"
+    if name not in matplotlib.colormaps:
+        matplotlib.colormaps.register(ListedColormap(ROCKET_LUT[::-1] if reverse else ROCKET_LUT, name))
+    return matplotlib.colormaps[name]
+
+
+def rocket_palette(n_colors):
+    """n colors sampled like seaborn.color_palette("rocket", n), skipping both ends"""
+    bins = np.linspace(0, 1, int(n_colors) + 2)[1:-1]
+    return [tuple(color) for color in rocket_cmap()(bins)[:, :3]]
+
+
+def set_whitegrid_style():
+    """Apply the whitegrid style, like seaborn.set_style("whitegrid")"""
+    rocket_cmap()  # image.cmap refers to it by name
+    matplotlib.rcParams.update(WHITEGRID_STYLE)
@@ -0,0 +1,112 @@
+"""Memory-mapped emissions panels for the Bamboo CO2 offset engine.
+
+A panel is a country x year float array of yearly emissions (history or
+projection) stored as two files:
+
+    <name>.npy   the values, opened with numpy.memmap so only touched pages load
+    <name>.json  the index: country names, first year and units
+
+Opening a panel only reads the small index and the .npy header, so multi-GB
+projection archives open instantly and rows are paged in on access.
+"""
+import json
+
+import numpy as np
+
+DATA_SUFFIX = ".npy"
+INDEX_SUFFIX = ".json"
+
+
+def _base_path(path, suffixes=(DATA_SUFFIX, INDEX_SUFFIX)):
+    # Accept "panel", "panel.npy" or "panel.json" for the same pair of files
+    for suffix in suffixes:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+
+class EmissionPanel:
+    """Country x year emissions backed by a memory-mapped .npy file"""
+
+    def __init__(self, data, countries, first_year, units="tons CO2/yr", path=None):
+        self.data = data
+        self.countries = list(countries)
+        self.first_year = int(first_year)
+        self.units = units
+        self.path = path
+        self._rows = {country: i for i, country in enumerate(self.countries)}
+        if data.shape[0] != len(self.countries):
+            raise ValueError("Panel index and data disagree on the number of countries.")
+
+    @property
+    def years(self):
+        return np.arange(self.first_year, self.first_year + self.data.shape[1])
+
+    def rows(self, countries=None):
+        """Row positions for country names (all rows when countries is None)"""
+        if countries is None:
+            return slice(None)
+        try:
+            return [self._rows[country] for country in countries]
+        except KeyError as e:
+            raise KeyError(f"Country not in panel: {e.args[0]}") from None
+
+    def columns(self, start_year=None, end_year=None):
+        """Column slice for an inclusive year range"""
+        start = 0 if start_year is None else start_year - self.first_year
+        stop = self.data.shape[1] if end_year is None else end_year - self.first_year + 1
+        if start < 0 or stop > self.data.shape[1] or start >= stop:
+            raise ValueError(f"Years {start_year}-{end_year} are outside the panel "
+                             f"({self.first_year}-{self.first_year + self.data.shape[1] - 1}).")
+        return slice(start, stop)
+
+    def series(self, country, start_year=None, end_year=None):
+        """One country's yearly values as a view into the mapped file"""
+        return self.data[self._rows[country], self.columns(start_year, end_year)]
+
+    def slice(self, countries=None, start_year=None, end_year=None):
+        """Return (years, values) with values shaped (countries, years)
+
+        Only the selected rows and columns are read from disk.
+        """
+        columns = self.columns(start_year, end_year)
+        return self.years[columns], np.asarray(self.data[self.rows(countries), columns])
+
+    def emissions_in(self, year, countries=None):
+        """Emissions of each country in one year, ready for compute_offsets"""
+        column = self.columns(year, year).start  # Raises for years outside the panel
+        return np.asarray(self.data[self.rows(countries), column])
+
+    def flush(self):
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+
+def create_panel(path, countries, first_year, n_years, dtype=np.float64, units="tons CO2/yr"):
+    """Create an empty on-disk panel to be filled row by row"""
+    base = _base_path(path)
+    data = np.lib.format.open_memmap(base + DATA_SUFFIX, mode="w+", dtype=dtype,
+                                     shape=(len(countries), n_years))
+    with open(base + INDEX_SUFFIX, "w", encoding="utf-8") as handle:
+        json.dump({"countries": list(countries), "first_year": int(first_year), "units": units}, handle)
+    return EmissionPanel(data, countries, first_year, units, base)
+
+
+def write_panel(path, countries, first_year, values, units="tons CO2/yr"):
+    """Write a (countries, years) array as a panel and return it opened read-only"""
+    values = np.asarray(values)
+    panel = create_panel(path, countries, first_year, values.shape[1], values.dtype, units)
+    panel.data[:] = values
+    panel.flush()
+    del panel
+    return open_panel(path)
+
+
+def open_panel(path, mode="r"):
+    """Open a panel without reading its values; mode "r+" allows in-place edits"""
+    base = _base_path(path)
+    with open(base + INDEX_SUFFIX, encoding="utf-8") as handle:
+        index = json.load(handle)
+    data = np.load(base + DATA_SUFFIX, mmap_mode=mode)
+    return EmissionPanel(data, index["countries"], index["first_year"],
+                         index.get("units", "tons CO2/yr"), base)
@@ -0,0 +1,123 @@
+"""Memory-mapped land-suitability rasters for the Bamboo CO2 offset engine.
+
+Instead of one uniform percentage of total land area, available land can come
+from gridded rasters where each cell holds the plantable area in that cell
+(sq mi, after terrain and existing land use). A raster set holds one grid per
+country, stored back to back as two files:
+
+    <name>.raster.npy   every country's cells, flattened, opened with numpy.memmap
+    <name>.raster.json  the index: country names, grid shapes and units
+
+The suffixes differ from bamboo_panel's, so a panel and a raster set may
+share a base name.
+
+Plantable area is summed a chunk of cells at a time, so national grids of
+tens of millions of cells never have to fit in RAM. Cells that are NaN or
+not positive (no-data values such as -9999) count as zero.
+"""
+import json
+
+import numpy as np
+
+from bamboo_panel import _base_path as _panel_base_path
+
+DATA_SUFFIX = ".raster.npy"
+INDEX_SUFFIX = ".raster.json"
+RASTER_CHUNK_CELLS = 4_000_000  # Cells summed per step (32 MB of float64, 16 MB of float32)
+
+
+def _base_path(path):
+    # Accept "land", "land.raster.npy" or "land.raster.json" for the same pair of files
+    return _panel_base_path(path, (DATA_SUFFIX, INDEX_SUFFIX))
+
+
+def chunked_sum(cells, chunk_cells=RASTER_CHUNK_CELLS):
+    """Sum of the positive cells of a 1-D (memory-mapped) array, one chunk at a time"""
+    total = 0.0
+    for start in range(0, len(cells), chunk_cells):
+        chunk = np.asarray(cells[start:start + chunk_cells])
+        total += np.sum(chunk, where=chunk > 0, dtype=np.float64)  # NaN > 0 is False
+    return total
+
+
+class LandRasters:
+    """Per-country plantable-area grids backed by one memory-mapped .npy file"""
+
+    def __init__(self, data, countries, shapes, units="sq mi", path=None):
+        self.data = data
+        self.countries = list(countries)
+        self.shapes = [tuple(int(n) for n in shape) for shape in shapes]
+        self.units = units
+        self.path = path
+        sizes = [int(np.prod(shape)) for shape in self.shapes]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        self._rows = {country: i for i, country in enumerate(self.countries)}
+        if len(self.shapes) != len(self.countries):
+            raise ValueError("Raster index lists a different number of countries and shapes.")
+        if self.offsets[-1] != data.shape[0]:
+            raise ValueError("Raster index and data disagree on the number of cells.")
+
+    def __contains__(self, country):
+        return country in self._rows
+
+    def _row(self, country):
+        try:
+            return self._rows[country]
+        except KeyError:
+            raise KeyError(f"Country not in rasters: {country}") from None
+
+    def cells(self, country):
+        """One country's cells, flattened, as a view into the mapped file"""
+        i = self._row(country)
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def grid(self, country):
+        """One country's (rows, cols) grid as a view into the mapped file"""
+        return self.cells(country).reshape(self.shapes[self._row(country)])
+
+    def plantable_area(self, countries=None, chunk_cells=RASTER_CHUNK_CELLS):
+        """Plantable area of each country (all countries when None), in the rasters' units"""
+        if countries is None:
+            countries = self.countries
+        return np.array([chunked_sum(self.cells(country), chunk_cells) for country in countries])
+
+    def flush(self):
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+
+def available_land(rasters, countries, plantable_share=1.0, chunk_cells=RASTER_CHUNK_CELLS):
+    """Available land per country for compute_offsets: plantable_share of each raster's plantable area"""
+    return rasters.plantable_area(countries, chunk_cells) * plantable_share
+
+
+def create_rasters(path, countries, shapes, dtype=np.float32, units="sq mi"):
+    """Create an empty on-disk raster set to be filled grid by grid"""
+    base = _base_path(path)
+    n_cells = sum(int(np.prod(shape)) for shape in shapes)
+    data = np.lib.format.open_memmap(base + DATA_SUFFIX, mode="w+", dtype=dtype, shape=(n_cells,))
+    with open(base + INDEX_SUFFIX, "w", encoding="utf-8") as handle:
+        json.dump({"countries": list(countries), "shapes": [list(shape) for shape in shapes],
+                   "units": units}, handle)
+    return LandRasters(data, countries, shapes, units, base)
+
+
+def write_rasters(path, grids, units="sq mi"):
+    """Write a {country: 2-D grid} mapping as a raster set and return it opened read-only"""
+    grids = {country: np.asarray(grid) for country, grid in grids.items()}
+    dtype = np.result_type(*grids.values())
+    rasters = create_rasters(path, list(grids), [grid.shape for grid in grids.values()], dtype, units)
+    for country, grid in grids.items():
+        rasters.grid(country)[:] = grid
+    rasters.flush()
+    del rasters
+    return open_rasters(path)
+
+
+def open_rasters(path, mode="r"):
+    """Open a raster set without reading its cells; mode "r+" allows in-place edits"""
+    base = _base_path(path)
+    with open(base + INDEX_SUFFIX, encoding="utf-8") as handle:
+        index = json.load(handle)
+    data = np.load(base + DATA_SUFFIX, mmap_mode=mode)
+    return LandRasters(data, index["countries"], index["shapes"], index.get("units", "sq mi"), base)
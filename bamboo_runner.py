@@ -0,0 +1,112 @@
+"""Parallel scenario runner for the Bamboo CO2 offset engine.
+
+Runs large batches of scenarios (country list x constraint settings x growth
+assumptions) across a process pool. Inputs are placed in shared memory once so
+they are never pickled to the workers, and every worker writes its shard of
+results straight into one preallocated shared output buffer.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bamboo_engine import (ANNUAL_EMISSION_INCREASE, SEQUESTRATION_RATE, COST_PLANTING_BAMBOO,
+                           BASE_YEAR, constrained_reduction_rates, equilibrium_years)
+
+ScenarioResults = namedtuple("ScenarioResults", [
+    "reduction_rates",    # (*scenario shape, countries) tons CO2/yr added each year
+    "equilibrium_years",  # (*scenario shape, countries) equilibrium year, NaN if never
+])
+
+# Per-worker views onto the shared blocks, set up once by _attach
+_worker = {}
+
+
+def _attach(input_name, output_name, n_countries, n_scenarios, constants):
+    """Map the shared input and output blocks into this worker process"""
+    inputs = shared_memory.SharedMemory(name=input_name)
+    output = shared_memory.SharedMemory(name=output_name)
+    flat = np.ndarray((3 * n_countries + 3 * n_scenarios,), dtype=np.float64, buffer=inputs.buf)
+    _worker.update(
+        blocks=(inputs, output),  # Keep the mappings alive for the life of the worker
+        countries=flat[:3 * n_countries].reshape(3, n_countries),
+        scenarios=flat[3 * n_countries:].reshape(3, n_scenarios),
+        output=np.ndarray((2, n_scenarios, n_countries), dtype=np.float64, buffer=output.buf),
+        constants=constants,
+    )
+
+
+def _run_shard(start, stop):
+    """Compute scenarios [start, stop) into the shared output buffer"""
+    land_area, emissions, gdp = _worker["countries"]
+    percent_land, gdp_percent, growth = _worker["scenarios"][:, start:stop, None]
+    sequestration_rate, cost_planting_bamboo, base_year = _worker["constants"]
+
+    rates = constrained_reduction_rates(land_area, gdp, percent_land, gdp_percent,
+                                        sequestration_rate, cost_planting_bamboo)
+    output = _worker["output"]
+    output[0, start:stop] = rates
+    output[1, start:stop] = equilibrium_years(emissions, rates, growth, base_year)
+    return stop - start
+
+
+def run_scenarios(land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+                  annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                  sequestration_rate=SEQUESTRATION_RATE,
+                  cost_planting_bamboo=COST_PLANTING_BAMBOO,
+                  base_year=BASE_YEAR, workers=None, shards_per_worker=4):
+    """Evaluate every scenario for every country and return ScenarioResults
+
+    percent_land_available, gdp_percent_available and annual_emission_increase
+    are broadcast against each other to give one scenario per element, so a
+    land % column and a GDP % row give the full grid; results keep that
+    broadcast shape with a trailing countries axis (all scalars give
+    (countries,), as compute_offsets does). workers=1 runs in this process
+    without starting a pool.
+    """
+    countries = np.ascontiguousarray([land_area, emissions, gdp], dtype=np.float64)
+    grids = np.broadcast_arrays(
+        np.asarray(percent_land_available, dtype=np.float64),
+        np.asarray(gdp_percent_available, dtype=np.float64),
+        np.asarray(annual_emission_increase, dtype=np.float64))
+    scenario_shape = grids[0].shape
+    scenarios = np.ascontiguousarray([grid.ravel() for grid in grids])  # (3, scenarios), row-major order
+    n_countries, n_scenarios = countries.shape[1], scenarios.shape[1]
+    constants = (float(sequestration_rate), float(cost_planting_bamboo), base_year)
+    workers = workers or os.cpu_count() or 1
+
+    inputs = shared_memory.SharedMemory(create=True, size=countries.nbytes + scenarios.nbytes)
+    output = shared_memory.SharedMemory(create=True, size=2 * n_scenarios * n_countries * 8)
+    try:
+        flat = np.ndarray((countries.size + scenarios.size,), dtype=np.float64, buffer=inputs.buf)
+        flat[:countries.size] = countries.ravel()
+        flat[countries.size:] = scenarios.ravel()
+        del flat
+        init_args = (inputs.name, output.name, n_countries, n_scenarios, constants)
+
+        # Contiguous scenario shards, a few per worker to even out the load
+        n_shards = max(1, min(n_scenarios, workers * shards_per_worker))
+        bounds = np.linspace(0, n_scenarios, n_shards + 1).astype(int)
+        if workers == 1:
+            _attach(*init_args)
+            try:
+                for start, stop in zip(bounds[:-1], bounds[1:]):
+                    _run_shard(start, stop)
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=init_args) as pool:
+                list(pool.map(_run_shard, bounds[:-1], bounds[1:]))
+
+        # Copy out of the shared block before it is released
+        results = np.ndarray((2, n_scenarios, n_countries), dtype=np.float64, buffer=output.buf).copy()
+    finally:
+        inputs.close()
+        inputs.unlink()
+        output.close()
+        output.unlink()
+    results = results.reshape((2,) + scenario_shape + (n_countries,))
+    return ScenarioResults(results[0], results[1])
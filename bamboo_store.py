@@ -0,0 +1,272 @@
+"""SQLite scenario store for the Bamboo CO2 offset engine.
+
+Each scenario (country columns, constraint settings and growth) is saved
+once under its input hash, with one row per country holding the inputs and
+every OffsetResult field. Reruns in a later session read the stored rows
+back instead of recomputing, and questions across runs are plain SQL over
+the results table:
+
+    python bamboo_store.py bamboo_scenarios.sqlite --country Vietnam --before 2080
+
+Equilibrium years that are never reached are stored as NULL.
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from bamboo_engine import (ANNUAL_EMISSION_INCREASE, DEFAULT_PERCENT_LAND, DEFAULT_GDP_PERCENTAGE,
+                           OffsetResult, compute_offsets)
+from bamboo_runner import ScenarioResults, run_scenarios
+from bamboo_cache import input_key
+
+DEFAULT_PATH = "bamboo_scenarios.sqlite"
+INPUT_COLUMNS = ("land_area", "emissions", "gdp", "growth")
+RESULT_COLUMNS = OffsetResult._fields  # Stored under the same names
+KEYS_PER_QUERY = 500  # Scenario hashes bound per IN (...) query, under SQLite's variable limit
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    hash TEXT PRIMARY KEY,
+    name TEXT,
+    created TEXT NOT NULL,
+    percent_land_available REAL NOT NULL,
+    gdp_percent_available REAL NOT NULL,
+    n_countries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    scenario_hash TEXT NOT NULL REFERENCES scenarios (hash) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    {", ".join(f"{column} REAL" for column in INPUT_COLUMNS + RESULT_COLUMNS)},
+    PRIMARY KEY (scenario_hash, position)
+);
+CREATE INDEX IF NOT EXISTS results_scenario_country ON results (scenario_hash, country);
+CREATE INDEX IF NOT EXISTS results_country_equilibrium ON results (country, equilibrium_years);
+"""
+
+
+def scenario_key(countries, land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+                 annual_emission_increase=ANNUAL_EMISSION_INCREASE):
+    """Hash identifying one scenario's inputs (model constants included)"""
+    columns = [np.asarray(values, dtype=float) for values in (land_area, emissions, gdp)]
+    growth = np.broadcast_to(np.asarray(annual_emission_increase, dtype=float), columns[0].shape)
+    return input_key("scenario", list(countries), *columns, growth,
+                     float(percent_land_available), float(gdp_percent_available))
+
+
+class ScenarioStore:
+    """Scenario inputs and results in one SQLite file
+
+    The connection may be shared with a worker thread; every call holds a
+    lock for the duration of its transaction.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")  # Readers are not blocked by a save
+        self.db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:  # Let a save on the worker thread finish first
+            self.db.close()
+
+    def __contains__(self, key):
+        with self._lock:
+            return self.db.execute("SELECT 1 FROM scenarios WHERE hash = ?", (key,)).fetchone() is not None
+
+    def save(self, countries, land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+             annual_emission_increase, result, name=None):
+        """Store one scenario and its OffsetResult; return the scenario hash"""
+        return self.save_many(countries, land_area, emissions, gdp,
+                              [(percent_land_available, gdp_percent_available, annual_emission_increase,
+                                result, name)])[0]
+
+    def save_many(self, countries, land_area, emissions, gdp, scenarios, keys=None):
+        """Store (% land, % GDP, growth, OffsetResult, name) scenarios in one transaction; return their hashes
+
+        keys are the scenarios' hashes when the caller already has them.
+        """
+        inputs = [np.asarray(values, dtype=float) for values in (land_area, emissions, gdp)]
+        placeholders = ", ".join("?" * (3 + len(INPUT_COLUMNS) + len(RESULT_COLUMNS)))
+        created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        scenarios = list(scenarios)
+        if keys is None:
+            keys = [scenario_key(countries, land_area, emissions, gdp, percent_land_available,
+                                 gdp_percent_available, annual_emission_increase)
+                    for percent_land_available, gdp_percent_available, annual_emission_increase, *_ in scenarios]
+        scenario_rows, result_rows = [], []
+        for key, (percent_land_available, gdp_percent_available, annual_emission_increase, result,
+                  name) in zip(keys, scenarios):
+            growth = np.broadcast_to(np.asarray(annual_emission_increase, dtype=float), inputs[0].shape)
+            # NaN binds as NULL, so "never reaches equilibrium" needs no sentinel
+            results = [np.broadcast_to(np.asarray(getattr(result, field), dtype=float), growth.shape)
+                       for field in RESULT_COLUMNS]
+            values = np.column_stack(inputs + [growth] + results)
+            scenario_rows.append((key, name, created, float(percent_land_available), float(gdp_percent_available),
+                                  len(values)))
+            result_rows += [(key, i, str(country), *row)
+                            for i, (country, row) in enumerate(zip(countries, values.tolist()))]
+
+        with self._lock, self.db:
+            self.db.executemany("DELETE FROM scenarios WHERE hash = ?", [(key,) for key in keys])
+            self.db.executemany("INSERT INTO scenarios VALUES (?, ?, ?, ?, ?, ?)", scenario_rows)
+            self.db.executemany(f"INSERT INTO results VALUES ({placeholders})", result_rows)
+        return keys
+
+    def load(self, key):
+        """(countries, OffsetResult) for a stored scenario hash, or None"""
+        return self.load_many([key]).get(key)
+
+    def load_many(self, keys):
+        """{hash: (countries, OffsetResult)} for the stored scenarios among keys"""
+        keys = list(dict.fromkeys(keys))
+        rows = []
+        with self._lock:
+            for start in range(0, len(keys), KEYS_PER_QUERY):
+                chunk = keys[start:start + KEYS_PER_QUERY]
+                rows += self.db.execute(
+                    f"SELECT scenario_hash, country, {', '.join(RESULT_COLUMNS)} FROM results "
+                    f"WHERE scenario_hash IN ({', '.join('?' * len(chunk))}) "
+                    "ORDER BY scenario_hash, position", chunk).fetchall()
+        stored = {}
+        start = 0
+        for end in range(1, len(rows) + 1):
+            if end == len(rows) or rows[end][0] != rows[start][0]:
+                scenario = rows[start:end]
+                countries = [row[1] for row in scenario]
+                # None (NULL) becomes NaN in a float array
+                values = np.array([row[2:] for row in scenario], dtype=float)
+                columns = dict(zip(RESULT_COLUMNS, values.T.copy()))
+                columns["land_bound"] = columns["land_bound"].astype(bool)
+                stored[rows[start][0]] = (countries, OffsetResult(**columns))
+                start = end
+        return stored
+
+    def compute_offsets(self, countries, land_area, emissions, gdp,
+                        percent_land_available=DEFAULT_PERCENT_LAND,
+                        gdp_percent_available=DEFAULT_GDP_PERCENTAGE,
+                        annual_emission_increase=ANNUAL_EMISSION_INCREASE, name=None):
+        """engine.compute_offsets, read from the store when this scenario was run before
+
+        Returns (OffsetResult, True if it came from the store).
+        """
+        key = scenario_key(countries, land_area, emissions, gdp, percent_land_available,
+                           gdp_percent_available, annual_emission_increase)
+        stored = self.load(key)
+        if stored is not None:
+            return stored[1], True
+        result = compute_offsets(land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+                                 annual_emission_increase=annual_emission_increase)
+        self.save(countries, land_area, emissions, gdp, percent_land_available, gdp_percent_available,
+                  annual_emission_increase, result, name)
+        return result, False
+
+    def run_scenarios(self, countries, land_area, emissions, gdp, percent_land_available,
+                      gdp_percent_available, annual_emission_increase=ANNUAL_EMISSION_INCREASE,
+                      names=None, workers=None):
+        """bamboo_runner.run_scenarios that only computes (and then stores) scenarios not yet in the store
+
+        Growth is one rate per scenario, as in run_scenarios.
+        """
+        percent_land, gdp_percent, growth = np.broadcast_arrays(
+            np.asarray(percent_land_available, dtype=float),
+            np.asarray(gdp_percent_available, dtype=float),
+            np.asarray(annual_emission_increase, dtype=float))
+        scenario_shape = percent_land.shape
+        percent_land, gdp_percent, growth = percent_land.ravel(), gdp_percent.ravel(), growth.ravel()
+        n_scenarios = len(percent_land)
+        rates = np.empty((n_scenarios, len(countries)))
+        years = np.empty((n_scenarios, len(countries)))
+
+        # One query per KEYS_PER_QUERY scenarios for everything already stored
+        keys = [scenario_key(countries, land_area, emissions, gdp, percent_land[s], gdp_percent[s], growth[s])
+                for s in range(n_scenarios)]
+        stored = self.load_many(keys)
+        missing = []
+        for s, key in enumerate(keys):
+            if key in stored:
+                rates[s], years[s] = stored[key][1].actual_reduction_rates, stored[key][1].equilibrium_years
+            else:
+                missing.append(s)
+
+        if missing:
+            computed = run_scenarios(land_area, emissions, gdp, percent_land[missing], gdp_percent[missing],
+                                     growth[missing], workers=workers)
+            rates[missing], years[missing] = computed.reduction_rates, computed.equilibrium_years
+            # The cheap closed-form fields for every missing scenario in one broadcast (one row each);
+            # the solved years come from the runner
+            offsets = compute_offsets(land_area, emissions, gdp, percent_land[missing][:, None],
+                                      gdp_percent[missing][:, None], with_equilibrium=False)
+            shape = (len(missing), len(countries))
+            fields = {field: np.broadcast_to(getattr(offsets, field), shape)
+                      for field in RESULT_COLUMNS if field != "equilibrium_years"}
+            self.save_many(countries, land_area, emissions, gdp, [
+                (percent_land[s], gdp_percent[s], growth[s],
+                 OffsetResult(**{field: values[row] for field, values in fields.items()},
+                              equilibrium_years=computed.equilibrium_years[row]),
+                 names[s] if names is not None else None)
+                for row, s in enumerate(missing)], [keys[s] for s in missing])
+        shape = scenario_shape + (len(countries),)
+        return ScenarioResults(rates.reshape(shape), years.reshape(shape))
+
+    def equilibrium_runs(self, country, before=None, after=None):
+        """Stored runs where country reaches equilibrium, optionally before/after a year
+
+        Returns (scenario hash, name, % land, % GDP, equilibrium year) rows,
+        earliest equilibrium first.
+        """
+        query = ("SELECT s.hash, s.name, s.percent_land_available, s.gdp_percent_available, r.equilibrium_years "
+                 "FROM results r JOIN scenarios s ON s.hash = r.scenario_hash "
+                 "WHERE r.country = ? AND r.equilibrium_years IS NOT NULL")
+        params = [country]
+        if before is not None:
+            query += " AND r.equilibrium_years < ?"
+            params.append(before)
+        if after is not None:
+            query += " AND r.equilibrium_years > ?"
+            params.append(after)
+        with self._lock:
+            return self.db.execute(query + " ORDER BY r.equilibrium_years", params).fetchall()
+
+    def query(self, sql, params=()):
+        """Run any read query against the scenarios and results tables"""
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query stored Bamboo CO2 offset scenarios.")
+    parser.add_argument("database", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--country", help="list runs where this country reaches equilibrium")
+    parser.add_argument("--before", type=float, help="equilibrium earlier than this year")
+    parser.add_argument("--after", type=float, help="equilibrium later than this year")
+    args = parser.parse_args(argv)
+
+    with ScenarioStore(args.database) as store:
+        if args.country is None:
+            count, rows = store.query("SELECT COUNT(*), COALESCE(SUM(n_countries), 0) FROM scenarios")[0]
+            print(f"{args.database}: {count} scenario(s), {rows} country row(s)")
+            return 0
+        runs = store.equilibrium_runs(args.country, args.before, args.after)
+        for key, name, percent_land, gdp_percent, year in runs:
+            print(f"{key[:12]}  {name or '-':<20} land {percent_land:5.1f}%  GDP {gdp_percent:5.2f}%  "
+                  f"equilibrium {year:.0f}")
+        print(f"{len(runs)} run(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
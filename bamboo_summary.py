@@ -0,0 +1,246 @@
+"""Text and table summaries of Bamboo CO2 offset results.
+
+Builds the "Calculation Steps" panel: the static formula legend, the short
+per-run header, and the per-country results table (column arrays, sort
+orders and row formatting). Also holds the number formats shared with the
+charts. Plain string and NumPy work with no tkinter or matplotlib imports, so
+it can be reused (and benchmarked) outside the desktop app.
+"""
+import numpy as np
+
+from bamboo_engine import (REFERENCE_YEARS_OFFSET, COST_PLANTING_BAMBOO, BASE_YEAR, EQUILIBRIUM_HORIZON,
+                           LAND_PERCENT_RANGE, GDP_PERCENT_RANGE, ANNUAL_EMISSION_INCREASE)
+
+
+def format_large_num(x):
+    """Convert large numbers to readable format (e.g., 1M, 1K)"""
+    if x >= 1e6:
+        return f"{x/1e6:,.1f}M"
+    elif x >= 1e3:
+        return f"{x/1e3:,.0f}K"
+    return f"{x:,.0f}"
+
+
+def format_equilibrium_year(year):
+    """Show an equilibrium year from the engine (NaN means not reached)"""
+    if np.isnan(year):
+        return f"Beyond {BASE_YEAR + EQUILIBRIUM_HORIZON}"
+    return f"{year:.0f}"
+
+
+def growth_text(growth=ANNUAL_EMISSION_INCREASE):
+    """Describe the emission growth used: one rate or a per-country range"""
+    rates = np.atleast_1d(np.asarray(growth, dtype=float))
+    if rates.min() == rates.max():
+        return f"{rates[0] * 100:g}%/yr"
+    return f"{rates.min() * 100:g}-{rates.max() * 100:g}%/yr by country"
+
+
+def sampled_growth_text(spec, growth=ANNUAL_EMISSION_INCREASE):
+    """Describe a growth distribution the bands sampled (empty when growth was not sampled)"""
+    if not isinstance(spec, tuple):
+        return ""
+    kind, *params = spec
+    rates = np.atleast_1d(np.asarray(growth, dtype=float))
+    centred = " around each country's rate" if rates.min() != rates.max() else ""
+    return f"Bands sample growth from {kind}({', '.join(f'{p:g}' for p in params)}){centred}"
+
+
+# Results table columns in display order: (key, heading)
+RESULT_COLUMNS = [
+    ("country", "Country"),
+    ("emissions", "CO2 (tons/yr)"),
+    ("needed", "Needed (sq mi/yr)"),
+    ("available", "Avail. Land (sq mi/yr)"),
+    ("affordable", "Affordable (sq mi/yr)"),
+    ("constrained", "Constrained by"),
+    ("cost", "Cost ($/yr)"),
+    ("land_pct", "Land %"),
+    ("gdp_pct", "GDP %"),
+    ("reduction", "Reduction (tons/yr)"),
+    ("equilibrium", "Equilibrium"),
+    ("equilibrium_bands", "Equilibrium Bands"),
+    ("equilibrium_scenarios", "Equilibrium by Growth"),
+]
+
+# How one cell of each column is shown
+RESULT_FORMATS = {
+    "country": str,
+    "emissions": lambda x: f"{x:,.0f}",
+    "needed": format_large_num,
+    "available": format_large_num,
+    "affordable": format_large_num,
+    "constrained": lambda x: "LAND" if x else "BUDGET",
+    "cost": lambda x: f"${format_large_num(x)}",
+    "land_pct": lambda x: f"{x:.2f}%",
+    "gdp_pct": lambda x: f"{x:.2f}%",
+    "reduction": format_large_num,
+    "equilibrium": format_equilibrium_year,
+    "equilibrium_bands": lambda years: " / ".join(format_equilibrium_year(year) for year in years),
+    "equilibrium_scenarios": lambda years: " / ".join(format_equilibrium_year(year) for year in years),
+}
+
+
+def constraints_text(percent_land_available, gdp_percent_available, maturity_years=0, rotation_years=0,
+                     gdp_growth=0.0, ramp_years=0):
+    text = f"Constraints:\n"
+    text += f"• Available Land: {percent_land_available:.1f}% of total land\n"
+    text += f"• Available GDP: {gdp_percent_available:.2f}% of GDP\n"
+    if maturity_years:
+        text += f"• New stands reach the full rate after {maturity_years} years\n"
+    if rotation_years:
+        text += f"• Harvested every {rotation_years} years; products decay, the rest is released\n"
+    if gdp_growth:
+        text += f"• Budget follows GDP growing {gdp_growth * 100:.1f}%/yr\n"
+    if ramp_years:
+        text += f"• Budget ramps up to the full share over {ramp_years} years\n"
+    if gdp_growth or ramp_years:
+        text += f"• Affordable area, binding constraint and reduction are means over the chart years\n"
+    return text
+
+
+def formula_legend(cost_planting_bamboo=COST_PLANTING_BAMBOO):
+    """Conversion and formula notes; they do not depend on the inputs"""
+    text = f"Conversion (Bamboo Absorption):\n"
+    text += f"• 25 tons CO2/acre/yr * 640 acres/sq mi = 16,000 tons CO2/sq mi/yr\n"
+    text += f"\nGeneral Formulas:\n"
+    text += f"• Bamboo Area = CO2 Emissions / 16,000 tons CO2/sq mi/yr\n"
+    text += f"• Bamboo Area Annually = Bamboo Area / {REFERENCE_YEARS_OFFSET} years (fixed reference period)\n"
+    text += f"• Land % = Bamboo Area / Land Area * 100\n"
+    text += f"• Annual Planting Cost = Bamboo Area Annually * ${cost_planting_bamboo:,.0f} per sq mi\n"
+    text += f"• GDP % = Annual Planting Cost / GDP * 100\n"
+    text += f"• Annual Emission Growth: compound, at each country's rate ({ANNUAL_EMISSION_INCREASE * 100:g}% unless the data gives one)\n"
+    return text
+
+
+def plot_details(shown_plot, start_year, end_year, bands=None, peaks=None, growth=ANNUAL_EMISSION_INCREASE,
+                 growth_spec=None):
+    """Notes on the chart on screen (empty for the bar chart)
+
+    growth is the rate (or per-country rates) behind the time series, and
+    growth_spec the distribution growth was sampled from for the bands.
+    """
+    text = ""
+    if shown_plot == "time":
+        text += f"Time Series Plot Details:\n"
+        text += f"• Shows emissions vs. reductions from {start_year} to {end_year}\n"
+        text += f"• Emissions grow at {growth_text(growth)}\n"
+        text += f"• Reductions are constrained by available land and GDP\n"
+        text += f"• Stars on plot indicate equilibrium points (when production = consumption)\n"
+        if bands is not None:
+            text += f"• Shaded bands: P{bands.percentiles[0]:g}-P{bands.percentiles[-1]:g} over {bands.n_samples:,} Monte Carlo samples\n"
+            if sampled_growth_text(growth_spec, growth):
+                text += f"• {sampled_growth_text(growth_spec, growth)}\n"
+        if peaks is not None:
+            text += f"• Triangles mark where emission growth overtakes planting and net emissions rebound\n"
+            rising = int(np.sum(~peaks.falls))
+            if rising:
+                text += f"• Net emissions never fall for {rising} of {peaks.falls.size} countries\n"
+    elif shown_plot == "growth":
+        text += f"Growth Scenario Details:\n"
+        text += f"• Net emissions from {start_year} to {end_year} under each emission growth scenario\n"
+        text += f"• Line style marks the scenario, color the country; dashed lines are the shared reduction\n"
+        text += f"• Stars mark each scenario's equilibrium points\n"
+    elif shown_plot == "sweep":
+        text += f"Constraint Sweep Details:\n"
+        text += f"• Every slider setting: {LAND_PERCENT_RANGE[0]}-{LAND_PERCENT_RANGE[1]}% land x {GDP_PERCENT_RANGE[0]}-{GDP_PERCENT_RANGE[1]}% GDP\n"
+        text += f"• Color shows the equilibrium year, gray cells never reach it\n"
+        text += f"• All Countries shows the slowest country that reaches it; a dashed line bounds where all do\n"
+        text += f"• Hatched cells are limited by land, the rest by budget\n"
+        text += f"• The star marks the current slider setting\n"
+    return text
+
+
+def band_heading(bands):
+    """Heading of the equilibrium bands column, e.g. Equilibrium P5/P50/P95"""
+    return "Equilibrium " + "/".join(f"P{p:g}" for p in bands.percentiles)
+
+
+def result_columns(countries, emissions, result, bands=None, scenarios=None):
+    """Raw per-country values of every results table column (unformatted)"""
+    columns = {
+        "country": np.asarray(countries, dtype=str),
+        "emissions": np.asarray(emissions, dtype=float),
+        "needed": result.bamboo_area_needed_annually,
+        "available": result.available_land / REFERENCE_YEARS_OFFSET,
+        "affordable": result.affordable_bamboo_area,
+        "constrained": result.land_bound,
+        "cost": result.planting_cost,
+        "land_pct": result.percent_land,
+        "gdp_pct": result.gdp_percentage,
+        "reduction": result.actual_reduction_rates,
+        "equilibrium": result.equilibrium_years,
+    }
+    if bands is not None:
+        columns["equilibrium_bands"] = bands.equilibrium_years.T  # (countries, bands)
+    if scenarios is not None:
+        columns["equilibrium_scenarios"] = scenarios.equilibrium_years.T  # (countries, scenarios)
+    return columns
+
+
+def sort_orders(columns):
+    """Stable ascending argsort of every column (NaN years sort last)
+
+    The bands and growth scenario columns sort by their middle entry.
+    """
+    orders = {}
+    for key, values in columns.items():
+        if key in ("equilibrium_bands", "equilibrium_scenarios"):
+            values = values[:, values.shape[1] // 2]
+        orders[key] = np.argsort(values, kind="stable")
+    return orders
+
+
+def format_result_row(columns, i):
+    """Display strings of row i, in RESULT_COLUMNS order (blank for missing columns)"""
+    return tuple(RESULT_FORMATS[key](columns[key][i]) if key in columns else ""
+                 for key, _ in RESULT_COLUMNS)
+
+
+def build_summary(countries, emissions, land_area, bamboo_area_needed_annually, 
+                  planting_cost, percent_land, gdp_percentage, start_year, end_year,
+                  percent_land_available, gdp_percent_available, available_land,
+                  affordable_bamboo_area, actual_reduction_rates, equilibrium_years, bands=None,
+                  shown_plot="bar", cost_planting_bamboo=COST_PLANTING_BAMBOO):
+    """Full plain-text summary with calculation details for every country"""
+    summary_text = f"Calculation Overview:\n\n"
+    summary_text += f"Initial Data:\n"
+    for i in range(len(countries)):
+        summary_text += f"• {countries[i]}: {emissions[i]:,.0f} tons CO2/yr\n"
+    
+    summary_text += "\n" + constraints_text(percent_land_available, gdp_percent_available)
+    summary_text += "\n" + formula_legend(cost_planting_bamboo)
+    details = plot_details(shown_plot, start_year, end_year, bands)
+    if details:
+        summary_text += "\n" + details
+    
+    summary_text += f"\nDetailed Calculations for Each Country:\n"
+
+    for i in range(len(countries)):
+        bamboo_area = bamboo_area_needed_annually[i]
+        cost = planting_cost[i]
+        percent_of_land = percent_land[i]
+        gdp_pct = gdp_percentage[i]
+        avail_land = available_land[i] / REFERENCE_YEARS_OFFSET
+        afford_area = affordable_bamboo_area[i]
+        reduction_rate = actual_reduction_rates[i]
+        eq_year = format_equilibrium_year(equilibrium_years[i])
+        
+        constrained_by = "land" if avail_land < afford_area else "budget"
+        
+        summary_text += f"\n{countries[i]}:\n"
+        summary_text += f"  • Annual Bamboo Area Needed (Ideal): {format_large_num(bamboo_area)} sq mi/yr\n"
+        summary_text += f"  • Available Annual Land: {format_large_num(avail_land)} sq mi/yr\n"
+        summary_text += f"  • Affordable Annual Area: {format_large_num(afford_area)} sq mi/yr\n"
+        summary_text += f"  • Constrained by: {constrained_by.upper()}\n"
+        summary_text += f"  • Annual Planting Cost: ${format_large_num(cost)}\n"
+        summary_text += f"  • Percent of Total Land Required: {percent_of_land:.2f}%\n"
+        summary_text += f"  • GDP Percentage Required: {gdp_pct:.2f}%\n"
+        summary_text += f"  • Actual CO2 Reduction Rate: {format_large_num(reduction_rate)} tons/yr\n"
+        summary_text += f"  • Equilibrium Year (consumption = production): {eq_year}\n"
+        if bands is not None:
+            band_years = " / ".join(format_equilibrium_year(year) for year in bands.equilibrium_years[:, i])
+            band_names = "/".join(f"P{p:g}" for p in bands.percentiles)
+            summary_text += f"  • Equilibrium Year {band_names}: {band_years}\n"
+
+    return summary_text
@@ -0,0 +1,65 @@
+"""Per-stage timing for Bamboo CO2 offset runs.
+
+A StageTimer follows one Analyze request from input parsing through the
+engine (on the worker thread) to the redrawn chart and summary. The desktop
+app shows the breakdown in its status bar and can append each run to a JSONL
+trace file for profiling real sessions.
+"""
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class StageTimer:
+    """Wall-clock seconds spent in each named stage of one run
+
+    Stages are timed either with the stage() context manager or with lap(),
+    which charges the time since the previous stage ended (used for waits
+    such as the worker queue). Only one thread uses a timer at a time: the
+    Tk thread hands it to the worker with the request and gets it back with
+    the result.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started  # End of the most recent stage
+        self.stages = {}  # name -> seconds, in the order the stages ran
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.last = time.perf_counter()
+            self.stages[name] = self.stages.get(name, 0.0) + self.last - t0
+
+    def lap(self, name):
+        """Charge the time since the previous stage ended to name"""
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + now - self.last
+        self.last = now
+
+    def total(self):
+        return self.last - self.started
+
+    def format(self):
+        """One-line breakdown for the status bar, in milliseconds"""
+        parts = [f"{name} {seconds * 1e3:.1f}" for name, seconds in self.stages.items()]
+        return " | ".join(parts) + f" | total {self.total() * 1e3:.1f} ms"
+
+    def record(self, **fields):
+        """JSON-ready dict of the stage times plus any extra fields"""
+        return {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            **fields,
+            "stages_ms": {name: round(seconds * 1e3, 3) for name, seconds in self.stages.items()},
+            "total_ms": round(self.total() * 1e3, 3),
+        }
+
+
+def append_trace(path, record):
+    """Append one record to a JSONL trace file"""
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
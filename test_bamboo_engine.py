@@ -0,0 +1,133 @@
+"""Regression tests for bamboo_engine against the original per-country loops
+
+Run with: python -m pytest -q
+"""
+import numpy as np
+
+from bamboo_engine import (ANNUAL_EMISSION_INCREASE, BASE_YEAR, REFERENCE_YEARS_OFFSET,
+                           DEFAULT_PERCENT_LAND, DEFAULT_GDP_PERCENTAGE, EQUILIBRIUM_HORIZON, compute_offsets,
+                           equilibrium_years, time_series, monte_carlo, sorted_percentiles, budget_schedule,
+                           plan_budget, plan_offsets)
+
+# Default data of the calculator plus edge cases: next to nothing planted, no emissions, never reached
+LAND_AREA = np.array([4244, 228531, 127932, 1000, 1000, 3_800_000])
+EMISSIONS = np.array([6083040, 4099000, 327905620, 0, 5e6, 5e9])
+GDP = np.array([15e9, 14e9, 700e9, 1e9, 1, 25e12])
+
+
+def loop_equilibrium_year(initial_emission, reduction_rate):
+    """calculate_equilibrium_year from the original calculator, NaN for "Beyond 2225"
+
+    Zero emissions never entered the loop and were reported as never reaching
+    equilibrium; the engine puts them in the first year, like the time series.
+    """
+    if initial_emission == 0:
+        return BASE_YEAR + 1
+    year = 0
+    current_emission = initial_emission
+    total_reduction = 0
+    while current_emission > total_reduction and year < 200:
+        year += 1
+        current_emission *= (1 + ANNUAL_EMISSION_INCREASE)
+        total_reduction += reduction_rate
+        if current_emission <= total_reduction:
+            return year + BASE_YEAR
+    return np.nan
+
+
+def loop_time_series(initial_emission, reduction_rate, start_year, end_year):
+    """Net emissions, cumulative reduction and equilibrium row of the original plot_time_series"""
+    years = np.arange(start_year, end_year + 1)
+    yearly_emissions = []
+    yearly_reductions = []
+    cumulative_reduction = 0
+    for year in years:
+        grown_emission = initial_emission * ((1 + ANNUAL_EMISSION_INCREASE) ** (year - start_year))
+        cumulative_reduction += reduction_rate
+        yearly_emissions.append(max(0, grown_emission - cumulative_reduction))
+        yearly_reductions.append(cumulative_reduction)
+    index = next((y for y in range(1, len(years)) if yearly_emissions[y] <= yearly_reductions[y]), -1)
+    return yearly_emissions, yearly_reductions, index
+
+
+def test_equilibrium_years_matches_loop():
+    rng = np.random.default_rng(0)
+    emissions = np.concatenate([EMISSIONS, rng.uniform(0, 1e9, 500)])
+    rates = np.concatenate([compute_offsets(LAND_AREA, EMISSIONS, GDP, with_equilibrium=False)
+                            .actual_reduction_rates, emissions[len(EMISSIONS):] * rng.uniform(0, 0.2, 500)])
+    expected = [loop_equilibrium_year(e, r) for e, r in zip(emissions, rates)]
+    np.testing.assert_array_equal(equilibrium_years(emissions, rates), expected)
+
+
+def test_compute_offsets_equilibrium_matches_loop():
+    result = compute_offsets(LAND_AREA, EMISSIONS, GDP)
+    expected = [loop_equilibrium_year(e, r) for e, r in zip(EMISSIONS, result.actual_reduction_rates)]
+    np.testing.assert_array_equal(result.equilibrium_years, expected)
+
+
+def test_time_series_matches_loop():
+    rates = compute_offsets(LAND_AREA, EMISSIONS, GDP, with_equilibrium=False).actual_reduction_rates
+    series = time_series(EMISSIONS, rates, 2025, 2099)
+    np.testing.assert_array_equal(series.years, np.arange(2025, 2100))
+    for i, (emission, rate) in enumerate(zip(EMISSIONS, rates)):
+        net, reduction, index = loop_time_series(emission, rate, 2025, 2099)
+        np.testing.assert_allclose(series.net_emissions[:, i], net, rtol=1e-12)
+        np.testing.assert_allclose(series.cumulative_reduction[:, i], reduction, rtol=1e-12)
+        assert series.equilibrium_index[i] == index
+
+
+def percentile_bands(land_area, emissions, gdp, start_year, end_year, sequestration, cost, growth, percentiles):
+    """Monte Carlo bands the way the first version computed them: np.percentile down the sample axis"""
+    sequestration, cost, growth = sequestration[:, None], cost[:, None], growth[:, None]
+    land_reduction = land_area * (DEFAULT_PERCENT_LAND / 100) * sequestration / REFERENCE_YEARS_OFFSET
+    budget_reduction = gdp * (DEFAULT_GDP_PERCENTAGE / 100) / cost * sequestration
+    reduction = np.minimum(land_reduction, budget_reduction)
+    eq = equilibrium_years(emissions, reduction, growth)
+    eq = np.percentile(np.where(np.isnan(eq), np.inf, eq), percentiles, axis=0, method="nearest")
+    t = np.arange(end_year - start_year + 1)
+    grown = np.power(1 + growth[:, :, None], t) * emissions[None, :, None]
+    net = np.maximum(0, grown - (t + 1) * reduction[:, :, None])
+    return (np.where(np.isinf(eq), np.nan, eq),
+            np.percentile(net, percentiles, axis=0).transpose(0, 2, 1),
+            (t + 1)[None, :, None] * np.percentile(reduction, percentiles, axis=0)[:, None, :])
+
+
+def test_sorted_percentiles_matches_numpy():
+    values = np.random.default_rng(1).normal(size=(4, 3, 1000))
+    percentiles = (0, 2.5, 5, 50, 95, 97.5, 100)
+    np.testing.assert_allclose(sorted_percentiles(np.sort(values, axis=-1), percentiles),
+                               np.percentile(values, percentiles, axis=-1), rtol=1e-12)
+
+
+def test_monte_carlo_matches_percentile_bands():
+    specs = {"sequestration_rate": ("normal", 16000, 1600),
+             "cost_planting_bamboo": ("triangular", 600000, 768000, 1000000),
+             "annual_emission_increase": ("uniform", 0.0, 0.02)}
+    n_samples, percentiles = 2000, (5, 50, 95)
+    # Draws come in argument order from one generator
+    rng = np.random.default_rng(7)
+    sequestration = rng.normal(16000, 1600, n_samples)
+    cost = rng.triangular(600000, 768000, 1000000, n_samples)
+    growth = rng.uniform(0.0, 0.02, n_samples)
+    expected = percentile_bands(LAND_AREA, EMISSIONS, GDP, 2025, 2099, sequestration, cost, growth, percentiles)
+    # A small chunk splits the run into several country and year blocks
+    for chunk_elements in (4_000_000, 3 * n_samples):
+        bands = monte_carlo(LAND_AREA, EMISSIONS, GDP, 2025, 2099, n_samples=n_samples,
+                            percentiles=percentiles, chunk_elements=chunk_elements, seed=7, **specs)
+        np.testing.assert_array_equal(bands.equilibrium_years, expected[0])
+        np.testing.assert_allclose(bands.net_emissions, expected[1], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(bands.cumulative_reduction, expected[2], rtol=1e-9)
+
+
+def test_plan_offsets_with_constant_budget_matches_compute_offsets():
+    result = compute_offsets(LAND_AREA, EMISSIONS, GDP)
+    budget = budget_schedule(GDP, DEFAULT_GDP_PERCENTAGE, EQUILIBRIUM_HORIZON)
+    plan = plan_budget(LAND_AREA, EMISSIONS, budget)
+    for n_years in (75, None):
+        planned = plan_offsets(compute_offsets(LAND_AREA, EMISSIONS, GDP, with_equilibrium=False), plan, n_years)
+        for field in result._fields:
+            if field == "equilibrium_years":
+                np.testing.assert_array_equal(planned.equilibrium_years, result.equilibrium_years)
+            else:
+                np.testing.assert_allclose(getattr(planned, field), getattr(result, field), rtol=1e-12,
+                                           err_msg=field)